@@ -16,6 +16,7 @@ if project_root not in sys.path:
 
 from dashboard import dashboard_utils
 from src.commission_models import COMMISSION_MODELS
+from src.trading_calendar import slice_dates
 
 
 # --- Signal Executor Factory ---
@@ -116,7 +117,7 @@ else:
 download_mode = st.sidebar.toggle(
     "Download New Data (Cache Only)",
     key="mode_selection",
-    help="Download data temporarily for backtesting without saving to disk.",
+    help="Download data for backtesting through the local bar cache (data/cache).",
 )
 
 # 1. Strategy Selection
@@ -160,25 +161,13 @@ if not download_mode:  # Corresponds to "Use Existing Data"
         )
 
         if len(selected_assets) == 2:
-            # Load and merge
-            dfs = []
-            for asset in selected_assets:
-                d = dashboard_utils.load_asset_data(asset, assets_map)
-                if d is not None:
-                    dfs.append(d)
-
-            if len(dfs) == 2:
-                # Merge logic similar to run_backtest.py
-                df1 = dfs[0].add_suffix("_1")
-                df2 = dfs[1].add_suffix("_2")
-                df = pd.merge(df1, df2, left_index=True, right_index=True, how="inner")
-
-                # Map Asset 1 back to standard OHLCV for Backtesting.py execution
-                df["Open"] = df["Open_1"]
-                df["High"] = df["High_1"]
-                df["Low"] = df["Low_1"]
-                df["Close"] = df["Close_1"]
-                df["Volume"] = df["Volume_1"]
+            # Align both assets in one panel, as run_backtest.py does
+            panel = dashboard_utils.load_asset_panel(selected_assets, assets_map)
+
+            if panel is not None:
+                # _1/_2 columns per asset; Asset 1 doubles as the OHLCV that
+                # Backtesting.py executes on
+                df = panel.pair_frame(selected_assets[0], selected_assets[1])
 
                 selected_asset = f"{selected_assets[0]}-{selected_assets[1]}"  # Construct a name
             else:
@@ -249,11 +238,7 @@ if not df.empty:
         end_date = end_date_download
         # Ensure df is sliced to this range (it should be already, but good to be safe)
         if isinstance(df.index, pd.DatetimeIndex):
-            dt_index = pd.DatetimeIndex(df.index)
-            start_ts = pd.Timestamp(start_date)
-            end_ts = pd.Timestamp(end_date) + pd.Timedelta(days=1)
-            mask = (dt_index >= start_ts) & (dt_index < end_ts)
-            df = df.loc[mask]
+            df = slice_dates(df, start_date, end_date)
         st.sidebar.info(f"Backtest Range: {start_date} to {end_date}")
     else:
         st.sidebar.subheader("Date Range Filter")
@@ -269,11 +254,7 @@ if not df.empty:
             )
 
             if start_date <= end_date:
-                dt_index = pd.DatetimeIndex(df.index)
-                start_ts = pd.Timestamp(start_date)
-                end_ts = pd.Timestamp(end_date) + pd.Timedelta(days=1)
-                mask = (dt_index >= start_ts) & (dt_index < end_ts)
-                df = df.loc[mask]
+                df = slice_dates(df, start_date, end_date)
 
 # 5. Run Backtest Button
 if st.sidebar.button("Run Backtest"):
@@ -1,4 +1,3 @@
-import glob
 import importlib
 import inspect
 import os
@@ -8,7 +7,6 @@ from typing import Any, cast
 
 import pandas as pd
 import streamlit as st
-import yfinance as yf
 from backtesting import Strategy
 
 # --- Add project root to path ---
@@ -17,10 +15,24 @@ project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
+from src import asset_catalog
+from src.bar_cache import BarCache
+from src.bar_store import (
+    NAT_NS,
+    PARQUET_EXTENSION,
+    from_epoch_ns,
+    parse_timestamps,
+    read_bars,
+    read_csv_bars,
+)
+from src.data_quality import ensure_quality
+from src.ingest import compact_bars, discover_data_files
+from src.panel import Panel
 from strategies.base_strategy import BaseStrategy
 
 # Default Data Path
 DEFAULT_DATA_PATH = os.path.join(project_root, "data", "benchmark")
+DEFAULT_CACHE_PATH = os.path.join(project_root, "data", "cache")
 
 
 def discover_strategies(private_mode: bool = False) -> dict:
@@ -87,7 +99,7 @@ def discover_strategies(private_mode: bool = False) -> dict:
 
 
 def get_data_files() -> list[str]:
-    """Scans all relevant data directories for CSV files."""
+    """Scans all relevant data directories for CSV and bar store files."""
 
     search_paths = [os.path.join(project_root, "data", "benchmark")]
 
@@ -105,56 +117,44 @@ def get_data_files() -> list[str]:
 
     for path in search_paths:
         if os.path.exists(path):
-            all_files.extend(glob.glob(os.path.join(path, "*.csv")))
+            all_files.extend(discover_data_files(path))
 
     return all_files
 
 
 def get_available_assets() -> dict[str, str]:
     """
-    Scans data files and builds a dictionary of available assets.
-    It reads headers to find all tickers in multi-asset files.
+    Builds a dictionary of available assets from the asset catalog, which
+    records the tickers and layout of every data file and only rescans files
+    whose mtime or size changed.
     Returns a dictionary mapping asset names to their source file.
     e.g., {'SPY': 'path/SPY.csv', 'AAPL': 'path/TECH.csv', 'PEP-KO': 'path/PEP_KO.csv'}
     """
     assets = {}
-    files = get_data_files()
-
-    for file_path in files:
-        filename = os.path.basename(file_path)
-        try:
-            # Check for MultiIndex (Price/Ticker structure) by reading first two lines
-            with open(file_path) as f:
-                header_line_1 = f.readline()
-                header_line_2 = f.readline()
-
-            is_multi_asset = "Ticker" in header_line_2 or "Price" in header_line_1
-
-            if is_multi_asset:
-                # For multi-asset files, get tickers from columns
-                df_peek = pd.read_csv(file_path, header=[0, 1], index_col=0, nrows=0)
-                tickers = df_peek.columns.get_level_values(1).unique().tolist()
-
-                # If it looks like a pair file by name, also add a pair entry
-                # e.g. PEP_KO.csv -> PEP-KO
-                parts = filename.replace(".csv", "").split("_")
-                if len(parts) == 2 and len(tickers) == 2:
-                    asset_name = f"{parts[0]}-{parts[1]}"
-                    assets[asset_name] = file_path
-
-                # Add each individual ticker
-                for ticker in tickers:
-                    assets[ticker] = file_path
-            else:
-                # For single asset files, infer from filename
-                asset_name = filename.replace(".csv", "").split("_")[0]
+    catalog = asset_catalog.catalog_files(get_data_files())
+
+    for file_path, entry in catalog.items():
+        tickers = entry["tickers"]
+        if entry["layout"] == asset_catalog.LAYOUT_MULTI:
+            # If it looks like a pair file by name, also add a pair entry
+            # e.g. PEP_KO.csv -> PEP-KO
+            parts = Path(file_path).stem.split("_")
+            if len(parts) == 2 and len(tickers) == 2:
+                asset_name = f"{parts[0]}-{parts[1]}"
                 assets[asset_name] = file_path
-        except Exception as e:
-            print(f"Could not parse {filename}: {e}")
+
+        # Add each individual ticker (single asset files are named by ticker)
+        for ticker in tickers:
+            assets[ticker] = file_path
 
     return assets
 
 
+def _quality_checked(file_path: str, asset_name: str, df: pd.DataFrame) -> pd.DataFrame:
+    """Runs one asset through the cached quality gate (raises DataQualityError if blocked)."""
+    return ensure_quality(file_path, {asset_name: df})[asset_name]
+
+
 def load_asset_data(asset_name: str, assets_map: dict[str, str]) -> pd.DataFrame | None:
     """
     Loads data for a specific asset (ticker or pair) using the assets map.
@@ -162,6 +162,9 @@ def load_asset_data(asset_name: str, assets_map: dict[str, str]) -> pd.DataFrame
     - For single tickers (e.g., 'AAPL') from a multi-asset file, it extracts
       just that ticker's data.
     - For single tickers from a single-asset file, it loads that file.
+    The file layout comes from the asset catalog. Single assets pass the
+    data quality gate (see `src.data_quality.ensure_quality`), and the result
+    is compacted to fixed dtypes (see `src.ingest.compact_bars`).
     """
     if asset_name not in assets_map:
         return None
@@ -169,20 +172,20 @@ def load_asset_data(asset_name: str, assets_map: dict[str, str]) -> pd.DataFrame
     file_path = assets_map[asset_name]
 
     try:
-        # First, determine if the source file is multi-asset by inspecting its headers
-        with open(file_path) as f:
-            header_line_1 = f.readline()
-            header_line_2 = f.readline()
-        is_multi_asset_file = "Ticker" in header_line_2 or "Price" in header_line_1
-
-        if is_multi_asset_file:
-            df_multi = pd.read_csv(file_path, header=[0, 1], index_col=0, parse_dates=True)
-            df_multi.index = pd.to_datetime(df_multi.index, utc=True).tz_localize(None)
+        entry = asset_catalog.lookup(file_path)
+
+        if entry["layout"] == asset_catalog.LAYOUT_MULTI:
+            df_multi = pd.read_csv(file_path, header=[0, 1], index_col=0)
+            # Timestamps are parsed once, straight to naive UTC; label rows are dropped.
+            timestamps = parse_timestamps(df_multi.index)
+            valid = timestamps != NAT_NS
+            df_multi = df_multi.loc[valid]
+            df_multi.index = from_epoch_ns(timestamps[valid])
             df_multi.columns.names = ["Price", "Ticker"]
 
             # If the asset is a pair (e.g., 'PEP-KO'), we're done. Return the whole thing.
             if "-" in asset_name:
-                return df_multi
+                return compact_bars(df_multi)
 
             # Otherwise, it's a single ticker from a multi-asset file. Extract it.
             extracted = df_multi.xs(asset_name, axis=1, level="Ticker").copy()
@@ -190,56 +193,68 @@ def load_asset_data(asset_name: str, assets_map: dict[str, str]) -> pd.DataFrame
                 extracted = extracted.to_frame()
             extracted.columns = [col.capitalize() for col in extracted.columns]
             extracted.index.name = "Date"
-            extracted.dropna(inplace=True)
-            return extracted
+            # All-empty rows only pad the ticker to the file's common date range.
+            extracted = extracted.dropna(how="all")
+            return compact_bars(_quality_checked(file_path, asset_name, extracted))
+        elif file_path.endswith(PARQUET_EXTENSION):
+            # Bar store files are already typed and indexed
+            return compact_bars(_quality_checked(file_path, asset_name, read_bars(file_path)))
         else:
             # It's a single-asset file
-            df_single = pd.read_csv(file_path, header=0, index_col=0, parse_dates=True)
-            df_single.index = pd.to_datetime(df_single.index, utc=True).tz_localize(None)
+            df_single = read_csv_bars(file_path)
             df_single.columns = [col.capitalize() for col in df_single.columns]
-            df_single.index.name = "Date"
-            df_single.dropna(inplace=True)
-            return df_single
+            return compact_bars(_quality_checked(file_path, asset_name, df_single))
 
     except Exception as e:
         print(f"Error loading data for {asset_name} from {file_path}: {e}")
         return None
 
 
+def load_asset_panel(
+    asset_names: list[str], assets_map: dict[str, str], how: str = "inner"
+) -> Panel | None:
+    """
+    Loads several single assets (see `load_asset_data`) into one aligned
+    `Panel`. Returns None if any of them fails to load.
+    """
+    frames = {}
+    for asset_name in asset_names:
+        df = load_asset_data(asset_name, assets_map)
+        if df is None:
+            return None
+        frames[asset_name] = df
+    return Panel.from_frames(frames, how=how)
+
+
 @st.cache_data
 def download_data_cached(tickers: list[str], start_date: Any, end_date: Any) -> pd.DataFrame | None:
     """
-    Downloads data from yfinance and caches it for the session.
-    Returns a pandas DataFrame.
+    Loads daily data through the range-aware bar cache (downloading only the
+    date ranges it does not already hold) and caches it for the session.
+    Returns a pandas DataFrame; multiple tickers use (Price, Ticker) columns.
     """
     try:
-        # yfinance expects a space-separated string for multiple tickers
-        ticker_str = " ".join(tickers)
-        data = yf.download(ticker_str, start=start_date, end=end_date, interval="1d")
-        if data.empty:
-            st.error(f"No data found for tickers: {ticker_str}")
+        start = pd.Timestamp(start_date).strftime("%Y-%m-%d")
+        end = pd.Timestamp(end_date).strftime("%Y-%m-%d")
+        frames = BarCache(DEFAULT_CACHE_PATH).get_many(tickers, start, end)
+        if not frames:
+            st.error(f"No data found for tickers: {' '.join(tickers)}")
             return None
 
-        # Clean and format data
-        # Flatten MultiIndex if present (yfinance often returns Price/Ticker levels)
-        if isinstance(data.columns, pd.MultiIndex):
-            # If we requested a single ticker, we might still get a MultiIndex.
-            # We need to drop the Ticker level if it exists and we only have one ticker.
-            if len(tickers) == 1:
-                data = data.xs(tickers[0], axis=1, level=1)
-
-        # Ensure columns are standard capitalized format for backtesting.py
-        # This handles both 'Open' and 'open', and ensures we have the right columns
-        data.columns = [str(col).capitalize() for col in data.columns]
-
-        # Filter for required columns
+        # Filter for required columns, standard capitalized format for backtesting.py
         required_cols = ["Open", "High", "Low", "Close", "Volume"]
-        available_cols = [col for col in required_cols if col in data.columns]
-        data = data[available_cols]
+        for ticker, frame in frames.items():
+            frame.columns = [str(col).capitalize() for col in frame.columns]
+            frames[ticker] = frame[[col for col in required_cols if col in frame.columns]]
+
+        if len(tickers) == 1:
+            data = frames[tickers[0]]
+        else:
+            # Match the yfinance multi-ticker layout: (Price, Ticker) columns
+            data = pd.concat(frames, axis=1, names=["Ticker", "Price"]).swaplevel(axis=1)
 
-        data.index = pd.to_datetime(data.index, utc=True).tz_localize(None)
         data.index.name = "Date"
-        data.dropna(how="all", inplace=True)  # Drop rows where all data is missing
+        data = data.dropna(how="all")  # Drop rows where all data is missing
         return data
 
     except Exception as e:
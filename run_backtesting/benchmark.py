@@ -16,7 +16,16 @@ project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
+from src.bar_store import load_bars
 from src.commission_models import ibkr_tiered_commission
+from src.ingest import (
+    DEFAULT_PRICE_DTYPE,
+    PRICE_DTYPES,
+    discover_data_files,
+    load_asset_file,
+    load_assets,
+)
+from src.vector_backtest import run_signals
 from strategies.base_strategy import BaseStrategy
 
 
@@ -153,8 +162,28 @@ def discover_strategies() -> tuple[list, list]:
     return cast(list, strategies["standalone"]), linked_meta_strategies
 
 
-def run_benchmark(scope: str, data_path: str | None = None) -> None:
-    """Runs a benchmark for the specified scope of strategies across provided data."""
+def run_benchmark(
+    scope: str,
+    data_path: str | None = None,
+    workers: int | None = None,
+    price_dtype: str = DEFAULT_PRICE_DTYPE,
+    event_driven: bool = False,
+) -> None:
+    """
+    Runs a benchmark for the specified scope of strategies across provided data.
+
+    Standalone strategies with a vectorised form (`BaseStrategy.generate_signals`)
+    run on the array-only backtester in `src/vector_backtest.py`, which fills
+    and charges commission like backtesting.py. All others run on the
+    event-driven engine.
+
+    Args:
+        scope: 'public', 'private' or 'all'.
+        data_path: A data file or a directory of data files.
+        workers: Parallel workers for loading a data directory (default: one per CPU).
+        price_dtype: Price precision of the loaded data ('float64' or 'float32').
+        event_driven: Run every strategy on the event-driven engine.
+    """
 
     # Use default data directory if no path provided
     if data_path is None:
@@ -179,128 +208,18 @@ def run_benchmark(scope: str, data_path: str | None = None) -> None:
     if data_path:
         # Check if data_path is a directory or file
         if os.path.isdir(data_path):
-            print(f"Loading all CSV files from directory: {data_path}...")
-            import glob
-
-            csv_files = glob.glob(os.path.join(data_path, "*.csv"))
-
-            for file_path in csv_files:
-                try:
-                    # Check for MultiIndex (Price/Ticker structure)
-                    with open(file_path) as f:
-                        header_line_1 = f.readline()
-                        header_line_2 = f.readline()
-
-                    if "Ticker" in header_line_2 or "Price" in header_line_1:
-                        print(f"Loading multi-asset data from {os.path.basename(file_path)}...")
-                        full_data = pd.read_csv(file_path, header=[0, 1], index_col=0)
-                        full_data.index.name = "date"
-
-                        tickers = full_data.columns.get_level_values(1).unique().tolist()
-
-                        for ticker in tickers:
-                            df = pd.DataFrame()
-                            # Handle cases where columns might be missing for some tickers
-                            try:
-                                df["Open"] = full_data[("Open", ticker)]
-                                df["High"] = full_data[("High", ticker)]
-                                df["Low"] = full_data[("Low", ticker)]
-                                df["Close"] = full_data[("Close", ticker)]
-                                df["Volume"] = full_data[("Volume", ticker)]
-                            except KeyError:
-                                continue
-
-                            df = df.apply(pd.to_numeric, errors="coerce")
-                            df.dropna(inplace=True)
-
-                            if not isinstance(df.index, pd.DatetimeIndex):
-                                df.index = pd.to_datetime(df.index, utc=True)
-                            if isinstance(df.index, pd.DatetimeIndex):
-                                df.index = df.index.tz_localize(None)
-
-                            assets_map[ticker] = {"data": df, "source": os.path.basename(file_path)}
-                            print(f"   Loaded {ticker}")
-                    else:
-                        # Single Asset File
-                        df = pd.read_csv(file_path)
-                        # Infer asset name from filename (e.g., TSLA_2024_2025.csv -> TSLA)
-                        asset_name = Path(file_path).stem.split("_")[0]
-
-                        # Standardize columns
-                        df.columns = [col.capitalize() for col in df.columns]
-
-                        # Standardize Index
-                        if "Date" in df.columns:
-                            df["Date"] = pd.to_datetime(df["Date"], utc=True)
-                            df.set_index("Date", inplace=True)
-                        elif "date" in df.columns:
-                            df["date"] = pd.to_datetime(df["date"], utc=True)
-                            df.set_index("date", inplace=True)
-                            df.index.name = "Date"
-
-                        if isinstance(df.index, pd.DatetimeIndex):
-                            df.index = df.index.tz_localize(None)
-
-                        # Clean data
-                        df.dropna(inplace=True)
-
-                        assets_map[asset_name] = {"data": df, "source": os.path.basename(file_path)}
-                        print(f"Loaded {asset_name} from {os.path.basename(file_path)}")
-                except Exception as e:
-                    print(f"Error loading {file_path}: {e}")
-
+            print(f"Loading all data files from directory: {data_path}...")
+            # Files are parsed and normalised in parallel (one worker per CPU by default).
+            assets_map = load_assets(
+                discover_data_files(data_path), workers=workers, price_dtype=price_dtype
+            )
         else:
-            # Single File Logic (Existing)
             try:
-                # Read first few lines to check for multi-header
-                with open(data_path) as f:
-                    header_line_1 = f.readline()
-                    header_line_2 = f.readline()
-
-                # Check for MultiIndex (Price/Ticker structure from yfinance)
-                if "Ticker" in header_line_2 or "Price" in header_line_1:
-                    print(f"Loading multi-asset data from {data_path}...")
-                    full_data = pd.read_csv(data_path, header=[0, 1], index_col=0)
-                    full_data.index.name = "date"
-
-                    tickers = full_data.columns.get_level_values(1).unique().tolist()
-
-                    for ticker in tickers:
-                        df = pd.DataFrame()
-                        df["Open"] = full_data[("Open", ticker)]
-                        df["High"] = full_data[("High", ticker)]
-                        df["Low"] = full_data[("Low", ticker)]
-                        df["Close"] = full_data[("Close", ticker)]
-                        df["Volume"] = full_data[("Volume", ticker)]
-
-                        df = df.apply(pd.to_numeric, errors="coerce")
-                        df.dropna(inplace=True)
-
-                        if not isinstance(df.index, pd.DatetimeIndex):
-                            df.index = pd.to_datetime(df.index, utc=True)
-                        if isinstance(df.index, pd.DatetimeIndex):
-                            df.index = df.index.tz_localize(None)
-
-                        assets_map[ticker] = {"data": df, "source": os.path.basename(data_path)}
-                else:
-                    # Single Asset File
-                    print(f"Loading single-asset data from {data_path}...")
-                    df = pd.read_csv(data_path)
-                    df.columns = [col.capitalize() for col in df.columns]
-
-                    if "Date" in df.columns:
-                        df["Date"] = pd.to_datetime(df["Date"], utc=True)
-                        df.set_index("Date", inplace=True)
-                    elif "date" in df.columns:
-                        df["date"] = pd.to_datetime(df["date"], utc=True)
-                        df.set_index("date", inplace=True)
-                        df.index.name = "Date"
-
-                    if isinstance(df.index, pd.DatetimeIndex):
-                        df.index = df.index.tz_localize(None)
-
-                    asset_name = Path(data_path).stem.split("_")[0]
-                    assets_map[asset_name] = {"data": df, "source": os.path.basename(data_path)}
+                assets_map = {
+                    asset_name: {"data": df, "source": os.path.basename(data_path)}
+                    for asset_name, df in load_asset_file(data_path, price_dtype).items()
+                }
+                print(f"Loaded {list(assets_map)} from {data_path}")
             except Exception as e:
                 print(f"Critical Error loading data {data_path}: {e}")
                 return
@@ -328,13 +247,8 @@ def run_benchmark(scope: str, data_path: str | None = None) -> None:
                 # Legacy/Default load
                 target_data = config["data"]
                 try:
-                    data = pd.read_csv(target_data)
-                    data.columns = [col.capitalize() for col in data.columns]
-                    data["Date"] = pd.to_datetime(
-                        data["Date"] if "Date" in data.columns else data["date"], utc=True
-                    )
-                    data.set_index("Date", inplace=True)
-                    data.index = pd.DatetimeIndex(data.index).tz_localize(None)
+                    # Timestamps are parsed once, straight to the naive (UTC) index.
+                    data = load_bars(target_data)
                 except (FileNotFoundError, KeyError, ValueError, pd.errors.ParserError) as e:
                     print(f"  Skipping {target_data}: {e}")
                     continue
@@ -357,22 +271,37 @@ def run_benchmark(scope: str, data_path: str | None = None) -> None:
                 for param, value in config.get("params", {}).items():
                     setattr(strategy_class, param, value)
 
-                # --- Wrapper for Signal-based Strategies ---
-                if config["name"] in ["SimpleMACrossover", "RSI2PeriodStrategy"]:
-                    SignalExecutor.underlying_strategy = strategy_class
-                    bt_strategy_class = SignalExecutor
+                # --- Array-only fast path for strategies with a vectorised form ---
+                start_time = time.time()
+                signals = None
+                if (
+                    not event_driven
+                    and "underlying" not in config
+                    and issubclass(strategy_class, BaseStrategy)
+                ):
+                    signals = strategy_class.generate_signals(data)
+
+                if signals is not None:
+                    stats = run_signals(
+                        data, signals, cash=10000, commission=ibkr_tiered_commission
+                    )
                 else:
-                    bt_strategy_class = strategy_class
+                    # --- Wrapper for Signal-based Strategies ---
+                    if config["name"] in ["SimpleMACrossover", "RSI2PeriodStrategy"]:
+                        SignalExecutor.underlying_strategy = strategy_class
+                        bt_strategy_class = SignalExecutor
+                    else:
+                        bt_strategy_class = strategy_class
 
-                bt = Backtest(
-                    data,
-                    bt_strategy_class,
-                    cash=10000,
-                    commission=ibkr_tiered_commission,  # type: ignore[arg-type]  # ty:ignore[invalid-argument-type]
-                )
+                    bt = Backtest(
+                        data,
+                        bt_strategy_class,
+                        cash=10000,
+                        commission=ibkr_tiered_commission,  # type: ignore[arg-type]  # ty:ignore[invalid-argument-type]
+                    )
 
-                start_time = time.time()
-                stats = bt.run()
+                    start_time = time.time()
+                    stats = bt.run()
                 end_time = time.time()
                 runtime = end_time - start_time
 
@@ -475,5 +404,28 @@ if __name__ == "__main__":
         default=None,
         help="Path to the data file to use for benchmarking (overrides config defaults).",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Parallel workers for loading a data directory (default: one per CPU).",
+    )
+    parser.add_argument(
+        "--price-dtype",
+        default=DEFAULT_PRICE_DTYPE,
+        choices=PRICE_DTYPES,
+        help="Price precision of the loaded data (float32 halves price memory).",
+    )
+    parser.add_argument(
+        "--event-driven",
+        action="store_true",
+        help="Run every strategy on the event-driven engine (no array-only fast path).",
+    )
     args = parser.parse_args()
-    run_benchmark(scope=args.scope, data_path=args.data)
+    run_benchmark(
+        scope=args.scope,
+        data_path=args.data,
+        workers=args.workers,
+        price_dtype=args.price_dtype,
+        event_driven=args.event_driven,
+    )
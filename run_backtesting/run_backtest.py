@@ -17,7 +17,11 @@ import inspect
 from pathlib import Path
 
 from src.backtesting_extensions import CustomBacktest
+from src.bar_store import PARQUET_EXTENSION, read_bars, timestamp_index
 from src.commission_models import COMMISSION_MODELS
+from src.data_quality import DataQualityError, ensure_quality
+from src.panel import Panel
+from src.strategy_state import DEFAULT_SNAPSHOT_DIR, SnapshotStore, with_snapshots
 from strategies.base_strategy import BaseStrategy
 
 
@@ -139,6 +143,18 @@ def main(argv: list[str] | None = None) -> None:
         default="2023-12-31",
         help="End date for fetching ticker data (YYYY-MM-DD).",
     )
+    parser.add_argument(
+        "--snapshot-every",
+        type=int,
+        default=0,
+        help="Write a warm-state snapshot of the strategy every N bars (0: off).",
+    )
+    parser.add_argument(
+        "--snapshot-dir",
+        type=str,
+        default=DEFAULT_SNAPSHOT_DIR,
+        help="Directory of the warm-state snapshots.",
+    )
     args = parser.parse_args(argv)
 
     # --- 1. Load Data ---
@@ -165,37 +181,35 @@ def main(argv: list[str] | None = None) -> None:
                     return
                 date_col = date_col_candidates[0]
 
-                df[date_col] = pd.to_datetime(df[date_col], utc=True)
-                df.set_index(date_col, inplace=True)
-                df.index.name = "Date"
+                # Parsed once, straight to the naive (UTC) index used downstream.
+                df.index = timestamp_index(df.pop(date_col))
+                df.columns = [col.capitalize() for col in df.columns]
+
+            # Case A2: Bar store file (already typed and indexed)
+            elif input_val.endswith(PARQUET_EXTENSION) and os.path.exists(input_val):
+                print(f"Loading local file: {input_val}")
+                df = read_bars(input_val)
 
             # Case B: Ticker Symbol (via SmartLoader)
             else:
                 print(f"Requesting data for ticker: {input_val} ({args.start} to {args.end})")
                 try:
+                    # SmartLoader returns a naive (UTC) `Date` index.
                     df = loader.load_data(input_val, args.start, args.end)
-                    # SmartLoader returns index as Date, but might be timezone aware or not.
-                    # Ensure consistency.
-                    df.index.name = "Date"
                 except Exception as e:
                     print(f"Error loading {input_val}: {e}")
                     return
 
+            # Local files pass the (cached) data quality gate before use.
+            if df is not None and os.path.exists(input_val):
+                try:
+                    df = ensure_quality(input_val, {Path(input_val).stem: df})[Path(input_val).stem]
+                except DataQualityError as e:
+                    print(f"Error: {e}")
+                    return
+
             # Common Post-Processing
             if df is not None:
-                # Explicitly ensure index is DatetimeIndex
-                if not isinstance(df.index, pd.DatetimeIndex):
-                    try:
-                        df.index = pd.to_datetime(df.index, utc=True)
-                    except Exception as e:
-                        print(f"Error converting index to datetime: {e}")
-                        return
-
-                # Ensure timezone-naive
-                idx = pd.DatetimeIndex(df.index)
-                if idx.tz is not None:
-                    df.index = idx.tz_localize(None)
-
                 # Standardize column names
                 df.columns = [col.capitalize() for col in df.columns]
 
@@ -214,33 +228,24 @@ def main(argv: list[str] | None = None) -> None:
     if len(loaded_dfs) == 1:
         data = loaded_dfs[0]
     else:
-        # Multi-file merge
-        data = loaded_dfs[0].copy()
+        # Align every input once in a panel on the timestamps they share,
+        # keyed by position (the same ticker may be passed twice).
+        frames = {str(i): df for i, df in enumerate(loaded_dfs, start=1)}
+        fields = [
+            col for col in loaded_dfs[0].columns if all(col in df.columns for df in loaded_dfs)
+        ]
+        panel = Panel.from_frames(frames, fields=fields, how="inner")
 
-        # If PairsTradingStrategy, map specifically to _1 and _2
         if args.strategy == "PairsTradingStrategy":
-            # Asset 1 (Primary) -> Suffix _1
-            data = data.add_suffix("_1")
-
-            # Asset 2 -> Suffix _2
-            if len(loaded_dfs) > 1:
-                df2 = loaded_dfs[1].add_suffix("_2")
-                data = pd.merge(data, df2, left_index=True, right_index=True, how="inner")
-
-            # Map Asset 1 back to standard OHLCV for Backtesting.py execution
-            # But keep the _1 columns for the strategy logic
-            data["Open"] = data["Open_1"]
-            data["High"] = data["High_1"]
-            data["Low"] = data["Low_1"]
-            data["Close"] = data["Close_1"]
-            data["Volume"] = data["Volume_1"]
-
+            # Asset 1 (Primary) -> Suffix _1, Asset 2 -> Suffix _2. Asset 1 is
+            # also mapped back to standard OHLCV for Backtesting.py execution,
+            # while the strategy logic uses the _1/_2 columns.
+            data = panel.pair_frame("1", "2")
         else:
-            # Generic merge; `data` already seeded from loaded_dfs[0] above.
-            for i, df in enumerate(loaded_dfs[1:], start=2):
-                data = pd.merge(
-                    data, df, left_index=True, right_index=True, how="inner", suffixes=("", f"_{i}")
-                )
+            # Generic merge: the first input keeps its column names, later
+            # inputs are suffixed with their position.
+            suffixes = [""] + [f"_{i}" for i in range(2, len(loaded_dfs) + 1)]
+            data = panel.wide_frame(list(frames), suffixes)
 
     data.dropna(inplace=True)
 
@@ -277,6 +282,12 @@ def main(argv: list[str] | None = None) -> None:
         SignalExecutor.underlying_strategy = StrategyClass
         bt_strategy_class = SignalExecutor
 
+    if args.snapshot_every > 0:
+        name = "-".join([args.strategy, *(Path(d).stem for d in args.data)])
+        store = SnapshotStore(args.snapshot_dir, name, every_bars=args.snapshot_every)
+        bt_strategy_class = with_snapshots(bt_strategy_class, store)
+        print(f"Writing a snapshot every {args.snapshot_every} bars to {args.snapshot_dir}")
+
     bt = CustomBacktest(
         data, bt_strategy_class, cash=args.cash, commission=COMMISSION_MODELS[args.commission]
     )
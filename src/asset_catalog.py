@@ -0,0 +1,198 @@
+"""
+Persistent catalog of the data files in a directory.
+
+For each file the catalog records its tickers, layout (single or multi-asset),
+row count, date range and column schema. Each data directory has its own
+catalog file under `data/cache/catalog/`, and entries are invalidated by the
+file's mtime and size, so files are only opened when they are new or have
+changed. Catalogs are also
+kept in memory per process, which makes repeated lookups (e.g. on every
+Streamlit rerun) dictionary lookups.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from src.bar_store import DATA_DIR, INDEX_COLUMN, NAT_NS, PARQUET_EXTENSION, parse_timestamps
+from src.ingest import is_multi_asset_csv
+
+DEFAULT_CATALOG_DIR = os.path.join(DATA_DIR, "cache", "catalog")
+LAYOUT_SINGLE = "single"
+LAYOUT_MULTI = "multi"
+
+# { catalog_path: (catalog mtime, entries) }
+_loaded_catalogs: dict[str, tuple[float, dict[str, dict[str, Any]]]] = {}
+
+
+def _date_range(timestamps: np.ndarray) -> tuple[str | None, str | None]:
+    """First and last valid epoch-ns timestamp as UTC ISO strings."""
+    valid = timestamps[timestamps != NAT_NS]
+    if valid.size == 0:
+        return None, None
+    return (
+        pd.Timestamp(valid.min(), tz="UTC").isoformat(),
+        pd.Timestamp(valid.max(), tz="UTC").isoformat(),
+    )
+
+
+def describe_file(file_path: str) -> dict[str, Any]:
+    """
+    Scans a data file and returns its catalog entry (without the
+    invalidation fields).
+    """
+    stem_ticker = Path(file_path).stem.split("_")[0]
+
+    if file_path.endswith(PARQUET_EXTENSION):
+        parquet = pq.ParquetFile(file_path)
+        columns = [name for name in parquet.schema_arrow.names if name != INDEX_COLUMN]
+        start, end = _date_range(parquet.read(columns=[INDEX_COLUMN]).column(0).to_numpy())
+        return {
+            "layout": LAYOUT_SINGLE,
+            "tickers": [stem_ticker],
+            "rows": parquet.metadata.num_rows,
+            "start": start,
+            "end": end,
+            "columns": columns,
+        }
+
+    if is_multi_asset_csv(file_path):
+        df = pd.read_csv(file_path, header=[0, 1], index_col=0)
+        # Rows whose index is not a date (the yfinance 'Date' label row) are not bars.
+        timestamps = parse_timestamps(df.index)
+        start, end = _date_range(timestamps)
+        valid_rows = int((timestamps != NAT_NS).sum())
+        return {
+            "layout": LAYOUT_MULTI,
+            "tickers": df.columns.get_level_values(1).unique().tolist(),
+            "rows": valid_rows,
+            "start": start,
+            "end": end,
+            "columns": df.columns.get_level_values(0).unique().tolist(),
+        }
+
+    df = pd.read_csv(file_path, index_col=0)
+    start, end = _date_range(parse_timestamps(df.index))
+    return {
+        "layout": LAYOUT_SINGLE,
+        "tickers": [stem_ticker],
+        "rows": len(df),
+        "start": start,
+        "end": end,
+        "columns": [str(col).capitalize() for col in df.columns],
+    }
+
+
+def catalog_path(directory: str, catalog_dir: str = DEFAULT_CATALOG_DIR) -> str:
+    """Returns the catalog file of the data files in `directory`."""
+    directory = os.path.abspath(directory)
+    directory_hash = hashlib.sha1(directory.encode()).hexdigest()[:10]
+    return os.path.join(catalog_dir, f"{os.path.basename(directory)}_{directory_hash}.json")
+
+
+def _load_catalog(path: str) -> dict[str, dict[str, Any]]:
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return {}
+    cached = _loaded_catalogs.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    try:
+        with open(path) as f:
+            entries = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    _loaded_catalogs[path] = (mtime, entries)
+    return entries
+
+
+def _save_catalog(path: str, entries: dict[str, dict[str, Any]]) -> None:
+    tmp_path = f"{path}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "w") as f:
+            json.dump(entries, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+        _loaded_catalogs[path] = (os.path.getmtime(path), entries)
+    except OSError as e:
+        # A read-only cache directory only loses the persistence, not correctness.
+        print(f"Could not write asset catalog {path}: {e}")
+
+
+def catalog_files(
+    file_paths: list[str], catalog_dir: str = DEFAULT_CATALOG_DIR
+) -> dict[str, dict[str, Any]]:
+    """
+    Returns the catalog entry for each file, rescanning only files whose
+    mtime or size changed since they were cataloged.
+
+    Files that cannot be scanned are left out (and not cataloged, so they are
+    retried on the next call). Files that cannot be stat'ed are scanned but
+    not cataloged.
+    """
+    by_directory: dict[str, list[str]] = {}
+    for file_path in file_paths:
+        by_directory.setdefault(os.path.dirname(file_path), []).append(file_path)
+
+    result = {}
+    for directory, paths in by_directory.items():
+        path = catalog_path(directory, catalog_dir)
+        entries = _load_catalog(path)
+        changed = False
+        for file_path in paths:
+            filename = os.path.basename(file_path)
+            try:
+                stat = os.stat(file_path)
+                signature = {"mtime": stat.st_mtime, "size": stat.st_size}
+            except OSError:
+                signature = None
+
+            entry = entries.get(filename)
+            if signature is not None and entry is not None:
+                if entry["mtime"] == signature["mtime"] and entry["size"] == signature["size"]:
+                    result[file_path] = entry
+                    continue
+
+            try:
+                entry = describe_file(file_path)
+            except Exception as e:
+                print(f"Could not parse {filename}: {e}")
+                # Drop any entry from before the file broke
+                changed = entries.pop(filename, None) is not None or changed
+                continue
+
+            if signature is not None:
+                entry.update(signature)
+                entries[filename] = entry
+                changed = True
+            result[file_path] = entry
+
+        # Drop entries for files that no longer exist
+        if os.path.isdir(directory):
+            stale = [name for name in entries if not os.path.exists(os.path.join(directory, name))]
+            for name in stale:
+                del entries[name]
+            changed = changed or bool(stale)
+            if changed:
+                _save_catalog(path, entries)
+    return result
+
+
+def lookup(file_path: str, catalog_dir: str = DEFAULT_CATALOG_DIR) -> dict[str, Any]:
+    """
+    Returns the catalog entry for a single file (scanning it if needed).
+
+    Raises:
+        ValueError: If the file cannot be scanned.
+    """
+    entry = catalog_files([file_path], catalog_dir).get(file_path)
+    if entry is None:
+        raise ValueError(f"Could not parse {file_path}")
+    return entry
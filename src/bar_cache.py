@@ -0,0 +1,272 @@
+"""
+Range-aware, per-ticker bar cache.
+
+Each ticker is stored once in the bar store (`{cache_dir}/{ticker}.parquet`)
+together with the list of date ranges it covers. A request for any
+`[start, end)` range only downloads the gaps that are not yet covered, merges
+them into the stored series and serves the request by slicing. Asking for
+2020-01-01..2024-01-02 after 2020-01-01..2024-01-01 therefore downloads one
+day instead of four years.
+
+Every access is recorded in the directory's `CacheManifest`, so the cache can
+be held to a byte budget with `evict` instead of being wiped after each run.
+The quality reports of the cached series live next to them in
+`{cache_dir}/quality`.
+"""
+
+import json
+import os
+from collections.abc import Callable
+
+import pandas as pd
+import yfinance as yf
+
+from src.bar_store import (
+    DATA_DIR,
+    PARQUET_EXTENSION,
+    from_epoch_ns,
+    read_bar_metadata,
+    read_bars,
+    to_epoch_ns,
+    write_bars,
+)
+from src.cache_manifest import CacheManifest
+from src.data_quality import DataQualityError, ensure_quality
+from src.trading_calendar import slice_range
+
+DEFAULT_CACHE_DIR = os.path.join(DATA_DIR, "cache")
+DEFAULT_CACHE_BUDGET_BYTES = 512 * 1024 * 1024
+COVERAGE_KEY = "quant_core.coverage"
+
+# A gap that comes back empty is still recorded as covered when it is this
+# short (weekends, exchange holidays). Longer empty gaps are more likely a
+# provider failure, so they are retried on the next request instead.
+EMPTY_GAP_TOLERANCE = pd.Timedelta(days=7)
+
+DateRange = tuple[pd.Timestamp, pd.Timestamp]
+Fetcher = Callable[[list[str], str, str], dict[str, pd.DataFrame]]
+
+
+def fetch_yfinance(tickers: list[str], start: str, end: str) -> dict[str, pd.DataFrame]:
+    """
+    Downloads daily bars for `tickers` over `[start, end)` from Yahoo Finance.
+    Returns one flat-column DataFrame per ticker that returned data.
+    """
+    data = yf.download(tickers, start=start, end=end, progress=False)
+    if data is None or data.empty:
+        return {}
+
+    frames = {}
+    for ticker in tickers:
+        if not isinstance(data.columns, pd.MultiIndex):
+            # Flat columns only happen for single-ticker downloads.
+            ticker_data = data
+        else:
+            try:
+                ticker_data = data.xs(ticker, axis=1, level=1)
+            except KeyError:
+                # Fallback if level 1 is not the ticker level (yfinance version
+                # / structure can vary). Be robust to either layout.
+                try:
+                    ticker_data = data.loc[:, (slice(None), ticker)]
+                    if isinstance(ticker_data.columns, pd.MultiIndex):
+                        ticker_data.columns = ticker_data.columns.droplevel(1)
+                except KeyError:
+                    continue
+
+        # Ensure columns are flat (drop 'Price' level if exists or generic MultiIndex)
+        if isinstance(ticker_data.columns, pd.MultiIndex):
+            ticker_data.columns = ticker_data.columns.get_level_values(0)
+
+        ticker_data = ticker_data.dropna(how="all")
+        if not ticker_data.empty:
+            frames[ticker] = ticker_data
+    return frames
+
+
+def _normalize_ranges(ranges: list[DateRange]) -> list[DateRange]:
+    """Sorts ranges and merges any that overlap or touch."""
+    merged: list[DateRange] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def missing_ranges(
+    covered: list[DateRange], start: pd.Timestamp, end: pd.Timestamp
+) -> list[DateRange]:
+    """Returns the parts of `[start, end)` that are not in the (normalized) `covered` ranges."""
+    gaps = []
+    cursor = start
+    for cov_start, cov_end in covered:
+        if cov_end <= cursor:
+            continue
+        if cov_start >= end:
+            break
+        if cov_start > cursor:
+            gaps.append((cursor, cov_start))
+        cursor = max(cursor, cov_end)
+        if cursor >= end:
+            break
+    if cursor < end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+class BarCache:
+    """
+    A per-ticker bar cache that records which date ranges it covers and
+    only downloads what is missing.
+
+    Why this exists:
+    - The old cache only hit when a file for exactly the same
+      `{ticker}_{start}_{end}` range existed, so any new range re-downloaded
+      the full history.
+    - One series per ticker lets every consumer (`download_data`,
+      `SmartLoader`, the dashboard) share the same downloaded bars.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, fetcher: Fetcher | None = None):
+        self.cache_dir = cache_dir
+        self.quality_dir = os.path.join(cache_dir, "quality")
+        self.fetcher = fetcher if fetcher is not None else fetch_yfinance
+        self.manifest = CacheManifest(cache_dir)
+
+    def path_for(self, ticker: str) -> str:
+        """Returns the bar store path holding the cached series for `ticker`."""
+        return os.path.join(self.cache_dir, f"{ticker}{PARQUET_EXTENSION}")
+
+    def coverage(self, ticker: str) -> list[DateRange]:
+        """Returns the normalized list of `[start, end)` ranges cached for `ticker`."""
+        path = self.path_for(ticker)
+        if not os.path.exists(path):
+            return []
+        raw = json.loads(read_bar_metadata(path).get(COVERAGE_KEY, "[]"))
+        return _normalize_ranges([(pd.Timestamp(s), pd.Timestamp(e)) for s, e in raw])
+
+    def _store(self, ticker: str, df: pd.DataFrame, coverage: list[DateRange]) -> None:
+        encoded = json.dumps(
+            [[s.strftime("%Y-%m-%d"), e.strftime("%Y-%m-%d")] for s, e in coverage]
+        )
+        write_bars(df, self.path_for(ticker), metadata={COVERAGE_KEY: encoded})
+
+    def _load(self, ticker: str) -> pd.DataFrame | None:
+        path = self.path_for(ticker)
+        return read_bars(path) if os.path.exists(path) else None
+
+    @staticmethod
+    def _slice(df: pd.DataFrame, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        """Serves `[start, end)` from a sorted series by binary search."""
+        return slice_range(df, start, end)
+
+    def get_many(
+        self, tickers: list[str], start: str, end: str, refresh: bool = False
+    ) -> dict[str, pd.DataFrame]:
+        """
+        Returns bars over `[start, end)` for each ticker, downloading only the
+        uncovered gaps. Tickers that share the same gaps are fetched in a
+        single provider call.
+
+        Args:
+            tickers: The ticker symbols to load.
+            start: Start date in YYYY-MM-DD format (inclusive).
+            end: End date in YYYY-MM-DD format (exclusive, as in yfinance).
+            refresh: If True, re-download the full range even if it is cached.
+
+        Returns:
+            A dictionary mapping each ticker with data to its DataFrame.
+        """
+        start_ts = pd.Timestamp(start).normalize()
+        end_ts = pd.Timestamp(end).normalize()
+        # Today's bar is still forming, so never record coverage past today.
+        coverage_end = min(end_ts, pd.Timestamp.today().normalize())
+
+        # Group tickers by their missing ranges so identical gaps share one download.
+        gaps_by_ticker = {}
+        for ticker in tickers:
+            covered = [] if refresh else self.coverage(ticker)
+            gaps_by_ticker[ticker] = missing_ranges(covered, start_ts, end_ts)
+
+        requests: dict[DateRange, list[str]] = {}
+        for ticker, gaps in gaps_by_ticker.items():
+            for gap in gaps:
+                requests.setdefault(gap, []).append(ticker)
+
+        fetched: dict[str, list[pd.DataFrame]] = {}
+        newly_covered: dict[str, list[DateRange]] = {}
+        for (gap_start, gap_end), gap_tickers in requests.items():
+            print(
+                f"Downloading {gap_tickers} from {gap_start.date()} to {gap_end.date()} "
+                f"(missing from cache)..."
+            )
+            try:
+                frames = self.fetcher(
+                    gap_tickers, gap_start.strftime("%Y-%m-%d"), gap_end.strftime("%Y-%m-%d")
+                )
+            except Exception as e:
+                print(f"Failed to download data: {e}")
+                continue
+
+            for ticker in gap_tickers:
+                frame = frames.get(ticker)
+                has_data = frame is not None and not frame.empty
+                if has_data:
+                    fetched.setdefault(ticker, []).append(frame)
+                if gap_start < coverage_end and (
+                    has_data or gap_end - gap_start <= EMPTY_GAP_TOLERANCE
+                ):
+                    newly_covered.setdefault(ticker, []).append(
+                        (gap_start, min(gap_end, coverage_end))
+                    )
+
+        results = {}
+        for ticker in tickers:
+            stored = self._load(ticker)
+            if ticker in fetched or ticker in newly_covered:
+                # Fresh bars come last so they win over stored ones on refresh.
+                parts = [stored] if stored is not None else []
+                parts.extend(fetched.get(ticker, []))
+                if parts:
+                    merged = pd.concat(parts)
+                    merged.index = from_epoch_ns(to_epoch_ns(merged.index))
+                    merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+                    self._store(
+                        ticker,
+                        merged,
+                        _normalize_ranges(self.coverage(ticker) + newly_covered.get(ticker, [])),
+                    )
+                    stored = merged
+
+            if stored is not None:
+                self.manifest.touch(ticker, os.path.basename(self.path_for(ticker)))
+                # Validated once per version of the cached file.
+                try:
+                    stored = ensure_quality(
+                        self.path_for(ticker), {ticker: stored}, cache_dir=self.quality_dir
+                    )[ticker]
+                except DataQualityError as e:
+                    print(e)
+                    continue
+                sliced = self._slice(stored, start_ts, end_ts)
+                if not sliced.empty:
+                    results[ticker] = sliced
+        return results
+
+    def get(self, ticker: str, start: str, end: str, refresh: bool = False) -> pd.DataFrame | None:
+        """Returns bars for a single ticker over `[start, end)`, or None if no data exists."""
+        return self.get_many([ticker], start, end, refresh=refresh).get(ticker)
+
+    def evict(
+        self,
+        max_bytes: int = DEFAULT_CACHE_BUDGET_BYTES,
+        pinned: set[str] | None = None,
+        policy: str = "lru",
+    ) -> list[str]:
+        """
+        Evicts cached tickers until the cache fits in `max_bytes`.
+        Pinned tickers are never evicted. Returns the evicted tickers.
+        """
+        return self.manifest.evict(max_bytes, PARQUET_EXTENSION, pinned=pinned, policy=policy)
@@ -0,0 +1,430 @@
+"""
+Columnar on-disk storage for OHLCV bars.
+
+Bars are stored as Parquet files with typed OHLCV columns and an int64 epoch
+index (nanoseconds since 1970-01-01 UTC, column ``timestamp``), plus the
+exchange timezone as file metadata. Loading a file is therefore a columnar
+memory copy instead of a CSV text and date parse. `parse_timestamps` is the
+single timezone-aware step that turns raw timestamps into that representation.
+CSV remains supported as an import/export format, and `main` provides a
+one-shot migration of existing CSV trees into the store.
+"""
+
+import argparse
+import glob
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# --- Storage Layout ---
+# The project's data directory, whatever the working directory (as the dashboard resolves it).
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+PARQUET_EXTENSION = ".parquet"
+CSV_EXTENSION = ".csv"
+STORAGE_FORMATS = {"parquet": PARQUET_EXTENSION, "csv": CSV_EXTENSION}
+DEFAULT_STORAGE = "parquet"
+
+INDEX_COLUMN = "timestamp"
+PRICE_COLUMNS = ["Open", "High", "Low", "Close"]
+OHLCV_COLUMNS = [*PRICE_COLUMNS, "Volume"]
+
+# Written into the Parquet schema metadata so readers can tell store files
+# apart from arbitrary Parquet files.
+STORE_METADATA = {b"quant_core.index": b"epoch_ns_utc"}
+
+# Exchange timezone of the bars: stored in the file metadata and carried on
+# loaded frames as `df.attrs["timezone"]`. Timestamps themselves are always UTC.
+TIMEZONE_KEY = "quant_core.timezone"
+TIMEZONE_ATTR = "timezone"
+
+# int64 value of NaT (unparseable timestamps) in epoch arrays.
+NAT_NS = np.iinfo(np.int64).min
+
+# Rows per Parquet row group. Each row group carries min/max statistics for the
+# timestamp column, which lets date-range readers skip groups without reading them.
+ROW_GROUP_ROWS = 65_536
+
+DEFAULT_MIGRATION_DIRS = [os.path.join("data", "benchmark"), os.path.join("data", "training")]
+
+
+def bar_file_path(
+    output_dir: str, ticker: str, start: str, end: str, storage: str = DEFAULT_STORAGE
+) -> str:
+    """Returns the canonical `{ticker}_{start}_{end}` path for the given storage format."""
+    if storage not in STORAGE_FORMATS:
+        raise ValueError(
+            f"Unknown storage format '{storage}'. Expected one of: {', '.join(STORAGE_FORMATS)}"
+        )
+    return os.path.join(output_dir, f"{ticker}_{start}_{end}{STORAGE_FORMATS[storage]}")
+
+
+# Byte layout of 'YYYY-MM-DD HH:MM:SS+HH:MM' (IB / yfinance intraday timestamps).
+_ISO_OFFSET_WIDTH = 25
+_ISO_DIGITS = [0, 1, 2, 3, 5, 6, 8, 9, 11, 12, 14, 15, 17, 18, 20, 21, 23, 24]
+
+
+def _parse_iso_offsets(values: np.ndarray) -> tuple[np.ndarray, np.ndarray] | None:
+    """
+    Vectorized parse of fixed-width ISO timestamps with a UTC offset.
+
+    `pd.to_datetime` handles offset strings one element at a time, which
+    dominates the load time of intraday CSVs. Here the strings are viewed as a
+    byte matrix: numpy parses the wall-clock part and the offset is applied
+    with integer arithmetic.
+
+    Returns:
+        `(epoch_ns, matched)`, where `matched` marks the rows in this layout,
+        or None if no row matches.
+    """
+    try:
+        raw = np.asarray(values, dtype=f"S{_ISO_OFFSET_WIDTH + 1}")
+    except (UnicodeEncodeError, ValueError, TypeError):
+        return None
+    chars = raw.view(np.uint8).reshape(len(raw), _ISO_OFFSET_WIDTH + 1)
+    digits = chars[:, _ISO_DIGITS]
+    matched = (
+        ((digits >= ord("0")) & (digits <= ord("9"))).all(axis=1)
+        & (chars[:, 4] == ord("-"))
+        & (chars[:, 7] == ord("-"))
+        & ((chars[:, 10] == ord(" ")) | (chars[:, 10] == ord("T")))
+        & (chars[:, 13] == ord(":"))
+        & (chars[:, 16] == ord(":"))
+        & ((chars[:, 19] == ord("+")) | (chars[:, 19] == ord("-")))
+        & (chars[:, 22] == ord(":"))
+        & (chars[:, _ISO_OFFSET_WIDTH] == 0)
+    )
+    if not matched.any():
+        return None
+
+    rows = chars[matched]
+    rows[:, 10] = ord("T")
+    try:
+        wall = np.ascontiguousarray(rows[:, :19]).view("S19").ravel().astype("datetime64[ns]")
+    except ValueError:  # Well-formed but impossible dates, e.g. month 13
+        return None
+    offset_digits = rows[:, [20, 21, 23, 24]].astype(np.int64) - ord("0")
+    offset_s = (offset_digits[:, 0] * 10 + offset_digits[:, 1]) * 3600 + (
+        offset_digits[:, 2] * 10 + offset_digits[:, 3]
+    ) * 60
+    sign = np.where(rows[:, 19] == ord("-"), -1, 1)
+
+    result = np.full(len(raw), NAT_NS, dtype=np.int64)
+    result[matched] = wall.view(np.int64) - sign * offset_s * 1_000_000_000
+    return result, matched
+
+
+def parse_timestamps(values: pd.Index | np.ndarray | list, tz: str | None = None) -> np.ndarray:
+    """
+    The canonical, timezone-aware timestamp ingest step.
+
+    Converts date-like values (strings, datetimes or a DatetimeIndex) to int64
+    nanoseconds since the UTC epoch. Values carrying a UTC offset or timezone
+    are converted to UTC. Naive values are wall-clock times in `tz` (the
+    exchange timezone), or UTC when `tz` is None. Values that are not dates
+    become `NAT_NS`.
+    """
+    if isinstance(values, pd.DatetimeIndex):
+        index = values
+    else:
+        values = pd.Index(values)
+        result = None
+        if values.dtype == object:
+            parsed = _parse_iso_offsets(values.to_numpy())
+            if parsed is not None:
+                result, matched = parsed
+                if matched.all():
+                    return result
+                values = values[~matched]
+        with warnings.catch_warnings():
+            # Mixed UTC offsets need an explicit conversion to UTC (below).
+            warnings.simplefilter("error", FutureWarning)
+            # Label rows such as yfinance's 'Date' defeat format inference; they become NaT.
+            warnings.simplefilter("ignore", UserWarning)
+            try:
+                index = pd.DatetimeIndex(pd.to_datetime(values, errors="coerce"))
+            except (ValueError, TypeError, FutureWarning):
+                index = pd.DatetimeIndex(pd.to_datetime(values, utc=True, errors="coerce"))
+        if result is not None:
+            result[~matched] = _index_to_epoch_ns(index, tz)
+            return result
+    return _index_to_epoch_ns(index, tz)
+
+
+def _index_to_epoch_ns(index: pd.DatetimeIndex, tz: str | None) -> np.ndarray:
+    if index.tz is None:
+        if tz is None:
+            return index.as_unit("ns").asi8
+        # Wall-clock times that do not exist / are ambiguous at DST changes become NaT.
+        index = index.tz_localize(tz, ambiguous="NaT", nonexistent="NaT")
+    return index.tz_convert("UTC").as_unit("ns").asi8
+
+
+def to_epoch_ns(index: pd.Index) -> np.ndarray:
+    """
+    Converts a date-like index to int64 nanoseconds since the UTC epoch.
+    Naive timestamps are interpreted as UTC; aware ones are converted to UTC.
+    A DatetimeIndex is converted without re-parsing.
+    """
+    return parse_timestamps(index)
+
+
+def from_epoch_ns(values: np.ndarray) -> pd.DatetimeIndex:
+    """Builds the naive (UTC) `Date` index used throughout the framework from epoch nanoseconds."""
+    return pd.DatetimeIndex(np.asarray(values, dtype="int64").view("datetime64[ns]"), name="Date")
+
+
+def timestamp_index(
+    values: pd.Index | np.ndarray | list, tz: str | None = None
+) -> pd.DatetimeIndex:
+    """`parse_timestamps` straight to the naive (UTC) `Date` index."""
+    return from_epoch_ns(parse_timestamps(values, tz))
+
+
+def _standardize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Capitalizes OHLCV column names (e.g. 'close' -> 'Close'), leaving other columns as-is."""
+    renamed = {
+        col: str(col).capitalize()
+        for col in df.columns
+        if str(col).capitalize() in OHLCV_COLUMNS and col != str(col).capitalize()
+    }
+    return df.rename(columns=renamed) if renamed else df
+
+
+def _typed_column(name: str, series: pd.Series) -> pa.Array:
+    """Converts a column to its store type: float64 prices, int64 volume where integral."""
+    values = pd.to_numeric(series, errors="coerce").to_numpy(dtype="float64")
+    if name == "Volume":
+        finite = np.isfinite(values)
+        if finite.all() and np.array_equal(values, np.floor(values)):
+            return pa.array(values.astype("int64"), type=pa.int64())
+    return pa.array(values, type=pa.float64())
+
+
+def write_bars(
+    df: pd.DataFrame,
+    path: str,
+    metadata: dict[str, str] | None = None,
+    row_group_size: int = ROW_GROUP_ROWS,
+    timezone: str | None = None,
+) -> str:
+    """
+    Writes a bar DataFrame to the columnar store.
+
+    The index must be date-like; it is stored as an int64 epoch column. OHLCV
+    columns are written with fixed types, any additional numeric columns are
+    kept as float64. The file is written to a temporary path and moved into
+    place so readers never observe a partially written file.
+
+    Args:
+        df: The bars to write.
+        path: Destination `.parquet` path.
+        metadata: Optional string key/value pairs stored in the file schema
+                  (see `read_bar_metadata`).
+        row_group_size: Rows per Parquet row group (the unit date-range
+                        readers can skip).
+        timezone: Exchange timezone recorded with the bars. Defaults to the
+                  frame's `attrs["timezone"]`, if any.
+
+    Returns:
+        The path that was written.
+    """
+    timezone = timezone or df.attrs.get(TIMEZONE_ATTR)
+    df = _standardize_columns(df)
+    if isinstance(df.columns, pd.MultiIndex):
+        raise ValueError("write_bars expects flat columns; split multi-asset frames per ticker.")
+
+    arrays = [pa.array(to_epoch_ns(df.index), type=pa.int64())]
+    names = [INDEX_COLUMN]
+    for col in df.columns:
+        arrays.append(_typed_column(str(col), df[col]))
+        names.append(str(col))
+
+    schema_metadata = dict(STORE_METADATA)
+    if timezone:
+        schema_metadata[TIMEZONE_KEY.encode()] = timezone.encode()
+    for key, value in (metadata or {}).items():
+        schema_metadata[key.encode()] = value.encode()
+    table = pa.Table.from_arrays(arrays, names=names).replace_schema_metadata(schema_metadata)
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    pq.write_table(table, tmp_path, row_group_size=row_group_size)
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_bars(path: str, columns: list[str] | None = None) -> pd.DataFrame:
+    """
+    Reads a bar file from the columnar store.
+
+    Args:
+        path: Path to a `.parquet` bar file.
+        columns: Optional subset of data columns to load.
+
+    Returns:
+        pd.DataFrame indexed by a naive (UTC) DatetimeIndex named 'Date', with
+        the exchange timezone (if recorded) in `attrs["timezone"]`.
+    """
+    read_columns = [INDEX_COLUMN, *columns] if columns is not None else None
+    table = pq.read_table(path, columns=read_columns)
+    index = from_epoch_ns(table.column(INDEX_COLUMN).to_numpy())
+    timezone = (table.schema.metadata or {}).get(TIMEZONE_KEY.encode())
+    df = table.drop_columns([INDEX_COLUMN]).to_pandas()
+    df.index = index
+    if timezone:
+        df.attrs[TIMEZONE_ATTR] = timezone.decode()
+    return df
+
+
+def read_bar_metadata(path: str) -> dict[str, str]:
+    """Reads the key/value metadata of a bar file without loading any bars."""
+    raw = pq.read_schema(path).metadata or {}
+    return {
+        key.decode(): value.decode()
+        for key, value in raw.items()
+        if key not in STORE_METADATA and not key.startswith(b"ARROW:")
+    }
+
+
+def is_multi_header_csv(path: str) -> bool:
+    """Checks the header rows for the yfinance (Price/Ticker) multi-header layout."""
+    with open(path) as f:
+        header_line_1 = f.readline()
+        header_line_2 = f.readline()
+    return "Ticker" in header_line_2 or "Price" in header_line_1
+
+
+def normalize_csv_frame(df: pd.DataFrame, path: str, tz: str | None = None) -> pd.DataFrame:
+    """
+    Brings a raw `read_csv(..., index_col=0)` frame (or chunk) into the
+    standard layout: flat, capitalized OHLCV columns and a naive (UTC) `Date`
+    index. Rows whose index is not a date are dropped. Timestamps without a
+    UTC offset are read as wall-clock times in `tz` (UTC when None).
+    """
+    if isinstance(df.columns, pd.MultiIndex):
+        tickers = df.columns.get_level_values(1).unique().tolist()
+        if len(tickers) != 1:
+            raise ValueError(
+                f"{path} holds {len(tickers)} tickers; only single-asset files can be imported."
+            )
+        df.columns = df.columns.get_level_values(0)
+
+    # Parse dates once, dropping the stray 'Date' label row of the yfinance layout.
+    timestamps = parse_timestamps(df.index, tz)
+    valid = timestamps != NAT_NS
+    df = df.loc[valid] if not valid.all() else df
+    df.index = from_epoch_ns(timestamps[valid])
+    df = _standardize_columns(df)
+    if tz:
+        df.attrs[TIMEZONE_ATTR] = tz
+    return df
+
+
+def read_csv_bars(path: str, tz: str | None = None) -> pd.DataFrame:
+    """
+    Parses a single-asset bar CSV into the standard layout.
+
+    Handles both flat files (`Date,Open,High,...`) and the yfinance
+    multi-header layout (`Price`/`Ticker`/`Date` header rows) as long as the
+    latter contains a single ticker. `tz` is the exchange timezone (see
+    `normalize_csv_frame`).
+    """
+    header = [0, 1] if is_multi_header_csv(path) else 0
+    return normalize_csv_frame(pd.read_csv(path, header=header, index_col=0), path, tz)
+
+
+def import_csv(csv_path: str, output_path: str | None = None, tz: str | None = None) -> str:
+    """
+    Converts a bar CSV to the columnar store (defaults to a `.parquet` sibling
+    of the CSV), recording `tz` as the exchange timezone.
+    """
+    if output_path is None:
+        output_path = os.path.splitext(csv_path)[0] + PARQUET_EXTENSION
+    return write_bars(read_csv_bars(csv_path, tz), output_path)
+
+
+def export_csv(store_path: str, csv_path: str | None = None) -> str:
+    """Writes a stored bar file back out as CSV. Defaults to a `.csv` sibling of the file."""
+    if csv_path is None:
+        csv_path = os.path.splitext(store_path)[0] + CSV_EXTENSION
+    read_bars(store_path).to_csv(csv_path, index_label="Date")
+    return csv_path
+
+
+def load_bars(path: str) -> pd.DataFrame:
+    """Loads a bar file from either storage format, dispatching on the file extension."""
+    if path.endswith(PARQUET_EXTENSION):
+        return read_bars(path)
+    return read_csv_bars(path)
+
+
+def migrate_directory(directory: str, remove_csv: bool = False, tz: str | None = None) -> list[str]:
+    """
+    One-shot migration of every CSV in `directory` into the columnar store.
+
+    Files whose `.parquet` sibling is already newer than the CSV are skipped,
+    so the migration can safely be re-run. Multi-ticker CSVs are left in
+    place and reported. `tz` is recorded as the exchange timezone.
+
+    Returns:
+        A list of the store files written.
+    """
+    written = []
+    for csv_path in sorted(glob.glob(os.path.join(directory, f"*{CSV_EXTENSION}"))):
+        store_path = os.path.splitext(csv_path)[0] + PARQUET_EXTENSION
+        if os.path.exists(store_path) and os.path.getmtime(store_path) >= os.path.getmtime(
+            csv_path
+        ):
+            print(f"Up to date: {store_path}")
+            continue
+        try:
+            import_csv(csv_path, store_path, tz)
+        except (ValueError, KeyError, pd.errors.ParserError) as e:
+            print(f"Skipping {csv_path}: {e}")
+            continue
+
+        written.append(store_path)
+        print(f"Migrated {csv_path} -> {store_path}")
+        if remove_csv:
+            os.remove(csv_path)
+    return written
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Main entry point for the bar store migration script."""
+    parser = argparse.ArgumentParser(
+        description="Migrate CSV bar files into the columnar (Parquet) bar store."
+    )
+    parser.add_argument(
+        "directories",
+        nargs="*",
+        default=DEFAULT_MIGRATION_DIRS,
+        help="Directories whose CSV files should be migrated.",
+    )
+    parser.add_argument(
+        "--remove-csv", action="store_true", help="Delete each CSV after a successful migration."
+    )
+    parser.add_argument(
+        "--tz",
+        help="Exchange timezone of the bars. Timestamps without a UTC offset are read in it.",
+    )
+    args = parser.parse_args(argv)
+
+    total = 0
+    for directory in args.directories:
+        if not os.path.isdir(directory):
+            print(f"Directory not found: {directory}")
+            continue
+        total += len(migrate_directory(directory, remove_csv=args.remove_csv, tz=args.tz))
+    print(f"Migration complete: {total} file(s) written.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Out-of-core readers for bar files that do not fit comfortably in memory.
+
+`iter_bars` yields a bar file as a sequence of bounded DataFrame chunks and
+pushes a `[start, end)` date predicate down to the storage layer: Parquet row
+groups whose timestamp statistics fall outside the range are never read, and
+CSV parsing stops at the first chunk past `end`. `iter_windows` turns a chunk
+stream into overlapping windows carrying a fixed number of warm-up rows, so
+rolling computations (indicators, features) can run a window at a time while
+memory stays proportional to `lookback + chunk_rows`, not to history length.
+"""
+
+from collections.abc import Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.bar_store import (
+    INDEX_COLUMN,
+    PARQUET_EXTENSION,
+    from_epoch_ns,
+    is_multi_header_csv,
+    normalize_csv_frame,
+    to_epoch_ns,
+)
+
+DEFAULT_CHUNK_ROWS = 50_000
+
+
+def _bound_ns(value: str | pd.Timestamp | None) -> int | None:
+    """Converts an optional date bound to epoch nanoseconds (naive dates are UTC)."""
+    if value is None:
+        return None
+    return int(to_epoch_ns(pd.DatetimeIndex([pd.Timestamp(value)]))[0])
+
+
+def _row_group_overlaps(
+    metadata: pq.FileMetaData, row_group: int, column: int, start: int | None, end: int | None
+) -> bool:
+    """Uses the row group's min/max statistics to decide whether it can hold rows in range."""
+    stats = metadata.row_group(row_group).column(column).statistics
+    if stats is None or not stats.has_min_max:
+        return True
+    if start is not None and stats.max < start:
+        return False
+    if end is not None and stats.min >= end:
+        return False
+    return True
+
+
+def _iter_parquet(
+    path: str, start: int | None, end: int | None, chunk_rows: int, columns: list[str] | None
+) -> Iterator[pd.DataFrame]:
+    parquet = pq.ParquetFile(path)
+    index_position = parquet.schema_arrow.get_field_index(INDEX_COLUMN)
+    row_groups = [
+        i
+        for i in range(parquet.metadata.num_row_groups)
+        if _row_group_overlaps(parquet.metadata, i, index_position, start, end)
+    ]
+    if not row_groups:
+        return
+
+    read_columns = [INDEX_COLUMN, *columns] if columns is not None else None
+    for batch in parquet.iter_batches(
+        batch_size=chunk_rows, row_groups=row_groups, columns=read_columns
+    ):
+        timestamps = batch.column(INDEX_COLUMN).to_numpy()
+        mask = np.ones(len(timestamps), dtype=bool)
+        if start is not None:
+            mask &= timestamps >= start
+        if end is not None:
+            mask &= timestamps < end
+        if not mask.any():
+            continue
+        if not mask.all():
+            batch = batch.filter(pa.array(mask))
+            timestamps = timestamps[mask]
+
+        df = batch.drop_columns([INDEX_COLUMN]).to_pandas()
+        df.index = from_epoch_ns(timestamps)
+        yield df
+
+
+def _iter_csv(
+    path: str, start: int | None, end: int | None, chunk_rows: int, columns: list[str] | None
+) -> Iterator[pd.DataFrame]:
+    header = [0, 1] if is_multi_header_csv(path) else 0
+    with pd.read_csv(path, header=header, index_col=0, chunksize=chunk_rows) as reader:
+        for raw in reader:
+            df = normalize_csv_frame(raw, path)
+            if df.empty:
+                continue
+            timestamps = df.index.asi8
+            # Bar files are sorted, so nothing after this chunk can be in range.
+            if end is not None and timestamps[0] >= end:
+                break
+            mask = np.ones(len(timestamps), dtype=bool)
+            if start is not None:
+                mask &= timestamps >= start
+            if end is not None:
+                mask &= timestamps < end
+            if not mask.any():
+                continue
+            df = df.loc[mask] if not mask.all() else df
+            yield df[columns] if columns is not None else df
+
+
+def iter_bars(
+    path: str,
+    start: str | pd.Timestamp | None = None,
+    end: str | pd.Timestamp | None = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    columns: list[str] | None = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Reads a bar file as a stream of chunks, restricted to `[start, end)`.
+
+    Args:
+        path: A `.parquet` bar store file or a single-asset bar CSV.
+        start: Inclusive lower date bound (None for the beginning of the file).
+        end: Exclusive upper date bound (None for the end of the file).
+        chunk_rows: Maximum rows per yielded chunk.
+        columns: Optional subset of data columns to load.
+
+    Yields:
+        DataFrames in the standard layout (naive UTC `Date` index), in file order.
+    """
+    start_ns, end_ns = _bound_ns(start), _bound_ns(end)
+    if path.endswith(PARQUET_EXTENSION):
+        yield from _iter_parquet(path, start_ns, end_ns, chunk_rows, columns)
+    else:
+        yield from _iter_csv(path, start_ns, end_ns, chunk_rows, columns)
+
+
+def iter_windows(
+    chunks: Iterable[pd.DataFrame], lookback: int
+) -> Iterator[tuple[pd.DataFrame, int]]:
+    """
+    Prefixes every chunk with the last `lookback` rows seen before it.
+
+    Yields:
+        `(window, warmup)` tuples, where the first `warmup` rows of `window`
+        are context from earlier chunks and the remaining rows are new.
+    """
+    tail: pd.DataFrame | None = None
+    for chunk in chunks:
+        if chunk.empty:
+            continue
+        window = chunk if tail is None else pd.concat([tail, chunk])
+        warmup = 0 if tail is None else len(tail)
+        yield window, warmup
+        tail = window.iloc[-lookback:] if lookback > 0 else None
@@ -0,0 +1,145 @@
+"""
+Access-tracking manifest for on-disk caches.
+
+A small JSON file (`manifest.json`) next to the cached files records, for
+every cache entry, the file it lives in, its size, when it was last used and
+how often. Caches use it to enforce a byte budget with LRU or LFU eviction
+while never evicting pinned entries.
+"""
+
+import json
+import os
+import time
+from typing import Any
+
+MANIFEST_FILENAME = "manifest.json"
+EVICTION_POLICIES = ("lru", "lfu")
+
+
+class CacheManifest:
+    """
+    Records size and access statistics for the files in a cache directory and
+    decides which entries to evict when the directory exceeds its budget.
+    """
+
+    def __init__(self, cache_dir: str, filename: str = MANIFEST_FILENAME) -> None:
+        self.cache_dir = cache_dir
+        self.path = os.path.join(cache_dir, filename)
+
+    def load(self) -> dict[str, dict[str, Any]]:
+        """Returns the manifest entries, keyed by cache key."""
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            # A corrupt manifest only costs us access history; rebuild it.
+            return {}
+
+    def save(self, entries: dict[str, dict[str, Any]]) -> None:
+        """Writes the manifest atomically."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entries, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def touch(self, key: str, filename: str) -> None:
+        """Records an access to `key` (stored in `filename`) and refreshes its size."""
+        entries = self.load()
+        entry = entries.get(key, {"hits": 0})
+        file_path = os.path.join(self.cache_dir, filename)
+        entry.update(
+            {
+                "file": filename,
+                "size": os.path.getsize(file_path) if os.path.exists(file_path) else 0,
+                "last_access": time.time(),
+                "hits": entry.get("hits", 0) + 1,
+            }
+        )
+        entries[key] = entry
+        self.save(entries)
+
+    def reconcile(self, extension: str) -> dict[str, dict[str, Any]]:
+        """
+        Brings the manifest in line with the files on disk: entries whose file
+        is gone are dropped, and files written without going through the
+        manifest are added using their size and modification time.
+        """
+        entries = {
+            key: entry
+            for key, entry in self.load().items()
+            if os.path.exists(os.path.join(self.cache_dir, entry.get("file", "")))
+        }
+        known_files = {entry["file"] for entry in entries.values()}
+        if os.path.isdir(self.cache_dir):
+            for filename in os.listdir(self.cache_dir):
+                if not filename.endswith(extension) or filename in known_files:
+                    continue
+                file_path = os.path.join(self.cache_dir, filename)
+                entries[filename[: -len(extension)]] = {
+                    "file": filename,
+                    "size": os.path.getsize(file_path),
+                    "last_access": os.path.getmtime(file_path),
+                    "hits": 0,
+                }
+        for entry in entries.values():
+            entry["size"] = os.path.getsize(os.path.join(self.cache_dir, entry["file"]))
+        self.save(entries)
+        return entries
+
+    def evict(
+        self,
+        max_bytes: int,
+        extension: str,
+        pinned: set[str] | None = None,
+        policy: str = "lru",
+    ) -> list[str]:
+        """
+        Deletes unpinned entries until the cache fits in `max_bytes`.
+
+        Args:
+            max_bytes: The byte budget for all cached files.
+            extension: File extension of the cached files (used by `reconcile`).
+            pinned: Keys that must never be evicted.
+            policy: "lru" evicts the least recently used entry first, "lfu" the
+                    least frequently used (ties broken by recency).
+
+        Returns:
+            The keys that were evicted.
+        """
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(
+                f"Unknown eviction policy '{policy}'. Expected one of: "
+                f"{', '.join(EVICTION_POLICIES)}"
+            )
+        pinned = pinned or set()
+        entries = self.reconcile(extension)
+        total = sum(entry["size"] for entry in entries.values())
+        if total <= max_bytes:
+            return []
+
+        if policy == "lru":
+            order = sorted(entries, key=lambda k: entries[k]["last_access"])
+        else:
+            order = sorted(entries, key=lambda k: (entries[k]["hits"], entries[k]["last_access"]))
+
+        evicted = []
+        for key in order:
+            if total <= max_bytes:
+                break
+            if key in pinned:
+                continue
+            file_path = os.path.join(self.cache_dir, entries[key]["file"])
+            try:
+                os.remove(file_path)
+            except OSError as e:
+                print(f"Error evicting {file_path}: {e}")
+                continue
+            total -= entries.pop(key)["size"]
+            evicted.append(key)
+            print(f"Evicted cached data: {file_path}")
+
+        self.save(entries)
+        return evicted
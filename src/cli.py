@@ -1,7 +1,14 @@
 import argparse
 
 from run_backtesting import benchmark, run_backtest
-from src import data_downloader
+from src import (
+    bar_store,
+    corporate_actions,
+    data_downloader,
+    ingest,
+    resampling,
+    strategy_state,
+)
 from strategies_private.research import train_ensemble_models, train_regime_model
 
 
@@ -24,6 +31,9 @@ def handle_backtest(args):
         "--end",
         args.end,
     ]
+    if args.snapshot_every:
+        argv.extend(["--snapshot-every", str(args.snapshot_every)])
+        argv.extend(["--snapshot-dir", args.snapshot_dir])
 
     run_backtest.main(argv)
 
@@ -31,7 +41,13 @@ def handle_backtest(args):
 def handle_benchmark(args):
     """Handler for the 'benchmark' command."""
     print("Running a benchmark...")
-    benchmark.run_benchmark(scope=args.scope, data_path=args.data)
+    benchmark.run_benchmark(
+        scope=args.scope,
+        data_path=args.data,
+        workers=args.workers,
+        price_dtype=args.price_dtype,
+        event_driven=args.event_driven,
+    )
 
 
 def handle_download(args):
@@ -49,9 +65,45 @@ def handle_download(args):
     ]
     if args.force:
         argv.append("--force")
+    argv.extend(["--format", args.format])
     data_downloader.main(argv)
 
 
+def handle_migrate_data(args):
+    """Handler for the 'migrate-data' command."""
+    print("Migrating CSV data into the bar store...")
+    argv = list(args.directories)
+    if args.remove_csv:
+        argv.append("--remove-csv")
+    if args.tz:
+        argv.extend(["--tz", args.tz])
+    bar_store.main(argv)
+
+
+def handle_resample(args):
+    """Handler for the 'resample' command."""
+    print("Resampling bars...")
+    argv = ["--data", args.data, "--rule", args.rule, "--tz", args.tz, "--anchor", args.anchor]
+    if args.regular_hours:
+        argv.append("--regular-hours")
+    if args.output:
+        argv.extend(["--output", args.output])
+    resampling.main(argv)
+
+
+def handle_adjust(args):
+    """Handler for the 'adjust' command."""
+    print("Adjusting bars for corporate actions...")
+    argv = ["--data", args.data, "--actions", args.actions]
+    if args.ticker:
+        argv.extend(["--ticker", args.ticker])
+    if args.fetch:
+        argv.append("--fetch")
+    if args.output:
+        argv.extend(["--output", args.output])
+    corporate_actions.main(argv)
+
+
 def handle_train_regime(args):
     """Handler for the 'train-regime' command."""
     print("Training regime model...")
@@ -107,6 +159,17 @@ def main():
     parser_backtest.add_argument(
         "--end", type=str, default="2023-12-31", help="End date for ticker data (YYYY-MM-DD)."
     )
+    parser_backtest.add_argument(
+        "--snapshot-every",
+        type=int,
+        default=0,
+        help="Write a warm-state snapshot of the strategy every N bars (0: off).",
+    )
+    parser_backtest.add_argument(
+        "--snapshot-dir",
+        default=strategy_state.DEFAULT_SNAPSHOT_DIR,
+        help="Directory of the warm-state snapshots.",
+    )
     parser_backtest.set_defaults(func=handle_backtest)
 
     # --- Benchmark Command ---
@@ -122,6 +185,23 @@ def main():
     parser_benchmark.add_argument(
         "--data", help="Path to the data file or directory to use for benchmarking."
     )
+    parser_benchmark.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Parallel workers for loading a data directory (default: one per CPU).",
+    )
+    parser_benchmark.add_argument(
+        "--price-dtype",
+        default=ingest.DEFAULT_PRICE_DTYPE,
+        choices=ingest.PRICE_DTYPES,
+        help="Price precision of the loaded data (float32 halves price memory).",
+    )
+    parser_benchmark.add_argument(
+        "--event-driven",
+        action="store_true",
+        help="Run every strategy on the event-driven engine (no array-only fast path).",
+    )
     parser_benchmark.set_defaults(func=handle_benchmark)
 
     # --- Download Command ---
@@ -141,8 +221,83 @@ def main():
     parser_download.add_argument(
         "--force", action="store_true", help="Force download even if local file exists."
     )
+    parser_download.add_argument(
+        "--format",
+        default=bar_store.DEFAULT_STORAGE,
+        choices=list(bar_store.STORAGE_FORMATS),
+        help="Storage format for the downloaded bars.",
+    )
     parser_download.set_defaults(func=handle_download)
 
+    # --- Migrate Data Command ---
+    parser_migrate = subparsers.add_parser(
+        "migrate-data", help="Convert existing CSV data directories into the bar store."
+    )
+    parser_migrate.add_argument(
+        "directories",
+        nargs="*",
+        default=bar_store.DEFAULT_MIGRATION_DIRS,
+        help="Directories whose CSV files should be migrated.",
+    )
+    parser_migrate.add_argument(
+        "--remove-csv", action="store_true", help="Delete each CSV after a successful migration."
+    )
+    parser_migrate.add_argument(
+        "--tz",
+        help="Exchange timezone of the bars. Timestamps without a UTC offset are read in it.",
+    )
+    parser_migrate.set_defaults(func=handle_migrate_data)
+
+    # --- Resample Command ---
+    parser_resample = subparsers.add_parser(
+        "resample", help="Derive a coarser timeframe (e.g. 5min, 1h, 1D) from a bar file."
+    )
+    parser_resample.add_argument(
+        "--data", required=True, help="Source bar file (.csv or .parquet)."
+    )
+    parser_resample.add_argument(
+        "--rule", required=True, help="Target bar size, e.g. '5min', '1h', '1D', '7min'."
+    )
+    parser_resample.add_argument(
+        "--tz",
+        default=resampling.DEFAULT_TIMEZONE,
+        help="Exchange timezone that defines sessions.",
+    )
+    parser_resample.add_argument(
+        "--anchor",
+        choices=resampling.ANCHORS,
+        default="clock",
+        help="Align bins to the clock or to each session's open.",
+    )
+    parser_resample.add_argument(
+        "--regular-hours",
+        action="store_true",
+        help="Drop pre- and post-market bars (NYSE calendar) before aggregating.",
+    )
+    parser_resample.add_argument("--output", help="Optional CSV path to export the bars to.")
+    parser_resample.set_defaults(func=handle_resample)
+
+    # --- Adjust Command ---
+    parser_adjust = subparsers.add_parser(
+        "adjust", help="Back-adjust a raw bar file for splits and dividends."
+    )
+    parser_adjust.add_argument("--data", required=True, help="Raw bar file (.csv or .parquet).")
+    parser_adjust.add_argument(
+        "--ticker", help="Ticker whose corporate actions apply (default: from the filename)."
+    )
+    parser_adjust.add_argument(
+        "--actions",
+        default=corporate_actions.DEFAULT_ACTIONS_PATH,
+        help="Corporate action table (CSV).",
+    )
+    parser_adjust.add_argument(
+        "--fetch",
+        action="store_true",
+        help="Record the ticker's split/dividend history from Yahoo Finance first.",
+    )
+    parser_adjust.add_argument("--output", help="Optional CSV path to export the bars to.")
+    parser_adjust.set_defaults(func=handle_adjust)
+
     # --- Train Regime Command ---
     parser_train_regime = subparsers.add_parser(
         "train-regime", help="Train the XGBoost regime classifier."
@@ -0,0 +1,306 @@
+"""
+Split and dividend back-adjustment with cached adjusted series.
+
+Corporate actions live in one local table (`data/corporate_actions.csv`,
+columns `ticker, date, action, value`): `split` rows hold the split ratio
+(4.0 for a 4-for-1 split) and `dividend` rows the cash amount per share as
+declared (not adjusted for later splits). Dates are ex-dates.
+
+`adjustment_factors` turns a ticker's actions into per-bar price and volume
+factors in one vectorized pass (a reverse cumulative product looked up with
+`searchsorted`), so every bar before an ex-date is scaled onto the price
+basis of the latest bar. `load_adjusted` caches the adjusted series in the
+bar store next to the raw file it was derived from and rebuilds it only when
+the raw file or the ticker's actions change; `load_series` switches between
+the two without recomputing anything.
+
+Yahoo Finance downloads (`download_data`, `SmartLoader`) are already
+adjusted by the provider; the layer is meant for raw sources such as IBKR
+`TRADES` bars or raw CSV exports.
+"""
+
+import argparse
+import hashlib
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.bar_store import (
+    PRICE_COLUMNS,
+    load_bars,
+    read_bar_metadata,
+    read_bars,
+    to_epoch_ns,
+    write_bars,
+)
+
+DEFAULT_ACTIONS_PATH = os.path.join("data", "corporate_actions.csv")
+DEFAULT_ADJUSTED_DIR = os.path.join("data", "cache", "adjusted")
+
+ACTION_COLUMNS = ["ticker", "date", "action", "value"]
+SPLIT = "split"
+DIVIDEND = "dividend"
+ACTIONS = (SPLIT, DIVIDEND)
+
+# Bumped whenever the adjustment logic changes, invalidating cached files.
+ADJUST_VERSION = "1"
+ADJUSTED_KEY = "quant_core.adjusted"
+
+
+def _empty_actions() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "ticker": pd.Series(dtype=object),
+            "date": pd.Series(dtype="datetime64[ns]"),
+            "action": pd.Series(dtype=object),
+            "value": pd.Series(dtype="float64"),
+        }
+    )
+
+
+def _normalize_actions(actions: pd.DataFrame) -> pd.DataFrame:
+    missing = [col for col in ACTION_COLUMNS if col not in actions.columns]
+    if missing:
+        raise ValueError(f"Corporate action table is missing column(s): {', '.join(missing)}")
+    actions = actions[ACTION_COLUMNS].copy()
+    actions["ticker"] = actions["ticker"].astype(str).str.upper()
+    actions["action"] = actions["action"].astype(str).str.lower()
+    unknown = sorted(set(actions["action"]) - set(ACTIONS))
+    if unknown:
+        raise ValueError(f"Unknown corporate action(s): {', '.join(unknown)}")
+    actions["date"] = pd.to_datetime(actions["date"]).dt.normalize().astype("datetime64[ns]")
+    actions["value"] = actions["value"].astype("float64")
+    return actions.sort_values(["ticker", "date", "action"], kind="stable").reset_index(drop=True)
+
+
+def load_actions(path: str = DEFAULT_ACTIONS_PATH) -> pd.DataFrame:
+    """Loads the corporate action table (empty if the file does not exist)."""
+    if not os.path.exists(path):
+        return _empty_actions()
+    return _normalize_actions(pd.read_csv(path))
+
+
+def save_actions(actions: pd.DataFrame, path: str = DEFAULT_ACTIONS_PATH) -> None:
+    """Writes the corporate action table atomically."""
+    actions = _normalize_actions(actions)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    actions.to_csv(tmp_path, index=False, date_format="%Y-%m-%d")
+    os.replace(tmp_path, path)
+
+
+def record_actions(new_actions: pd.DataFrame, path: str = DEFAULT_ACTIONS_PATH) -> pd.DataFrame:
+    """
+    Adds `new_actions` to the table at `path`. A row for the same ticker,
+    date and action replaces the stored one. Returns the updated table.
+    """
+    combined = pd.concat([load_actions(path), _normalize_actions(new_actions)])
+    combined = combined.drop_duplicates(["ticker", "date", "action"], keep="last")
+    save_actions(combined, path)
+    return load_actions(path)
+
+
+def actions_for(ticker: str, actions: pd.DataFrame) -> pd.DataFrame:
+    """The rows of `actions` for one ticker, in ex-date order."""
+    return actions[actions["ticker"] == ticker.upper()]
+
+
+def adjustment_factors(
+    index: pd.Index, close: np.ndarray, actions: pd.DataFrame
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Back-adjustment factors for one ticker's bars.
+
+    A split with ratio r divides earlier prices by r and multiplies earlier
+    volume by r. A dividend D scales earlier prices by `1 - D / C`, where C is
+    the raw close of the last bar before the ex-date. Bars on or after an
+    ex-date are not affected by it.
+
+    Args:
+        index: The bars' sorted, date-like index.
+        close: Raw closing prices, aligned with `index`.
+        actions: The ticker's corporate actions (see `actions_for`).
+
+    Returns:
+        `(price_factor, volume_factor)` arrays aligned with `index`.
+    """
+    timestamps = to_epoch_ns(index)
+    close = np.asarray(close, dtype="float64")
+    action_ns = to_epoch_ns(pd.DatetimeIndex(actions["date"]))
+    order = np.argsort(action_ns, kind="stable")
+    action_ns = action_ns[order]
+    kinds = actions["action"].to_numpy()[order]
+    values = actions["value"].to_numpy(dtype="float64")[order]
+
+    is_split = kinds == SPLIT
+    price_mult = np.ones(len(values))
+    volume_mult = np.ones(len(values))
+    price_mult[is_split] = 1.0 / values[is_split]
+    volume_mult[is_split] = values[is_split]
+
+    # Dividends are sized against the last raw close before the ex-date.
+    prev_bar = np.searchsorted(timestamps, action_ns, side="left") - 1
+    dividends = ~is_split & (prev_bar >= 0)
+    price_mult[dividends] = 1.0 - values[dividends] / close[prev_bar[dividends]]
+    if (price_mult <= 0).any():
+        raise ValueError("A dividend is not smaller than the close before its ex-date")
+
+    # suffix[k] = product of the multipliers of actions k..end; a bar is
+    # affected by every action dated after it.
+    price_suffix = np.r_[np.cumprod(price_mult[::-1])[::-1], 1.0]
+    volume_suffix = np.r_[np.cumprod(volume_mult[::-1])[::-1], 1.0]
+    later = np.searchsorted(action_ns, timestamps, side="right")
+    return price_suffix[later], volume_suffix[later]
+
+
+def adjust_bars(df: pd.DataFrame, actions: pd.DataFrame) -> pd.DataFrame:
+    """Returns a copy of raw bars with prices and volume back-adjusted for `actions`."""
+    if actions.empty:
+        return df.copy()
+    price_factor, volume_factor = adjustment_factors(df.index, df["Close"].to_numpy(), actions)
+    adjusted = df.copy()
+    for col in PRICE_COLUMNS:
+        if col in adjusted.columns:
+            adjusted[col] = adjusted[col].to_numpy(dtype="float64") * price_factor
+    if "Volume" in adjusted.columns:
+        adjusted["Volume"] = adjusted["Volume"].to_numpy(dtype="float64") * volume_factor
+    return adjusted
+
+
+def _raw_dividends(dividends: pd.Series, splits: pd.Series) -> pd.Series:
+    """
+    Undoes the split adjustment of provider dividends (Yahoo reports past
+    dividends on the current share basis) so they match raw closes.
+    """
+    if dividends.empty or splits.empty:
+        return dividends
+    split_ns = to_epoch_ns(splits.index)
+    order = np.argsort(split_ns)
+    ratios = splits.to_numpy(dtype="float64")[order]
+    suffix = np.r_[np.cumprod(ratios[::-1])[::-1], 1.0]
+    later = np.searchsorted(split_ns[order], to_epoch_ns(dividends.index), side="right")
+    return dividends * suffix[later]
+
+
+def fetch_yfinance_actions(tickers: list[str]) -> pd.DataFrame:
+    """Downloads the split and dividend history of `tickers` from Yahoo Finance."""
+    import yfinance as yf
+
+    rows = []
+    for ticker in tickers:
+        history = yf.Ticker(ticker)
+        splits = history.splits
+        dividends = _raw_dividends(history.dividends, splits)
+        for action, series in ((SPLIT, splits), (DIVIDEND, dividends)):
+            for date, value in series.items():
+                if value:
+                    rows.append((ticker, pd.Timestamp(date).tz_localize(None), action, value))
+    if not rows:
+        return _empty_actions()
+    return _normalize_actions(pd.DataFrame(rows, columns=ACTION_COLUMNS))
+
+
+# --- Cached adjusted series ---
+
+
+def _ticker_for(path: str) -> str:
+    return Path(path).stem.split("_")[0]
+
+
+def adjusted_path(source_path: str, cache_dir: str = DEFAULT_ADJUSTED_DIR) -> str:
+    """Returns the cache file holding the adjusted series of `source_path`."""
+    source_hash = hashlib.sha1(os.path.abspath(source_path).encode()).hexdigest()[:10]
+    return os.path.join(cache_dir, f"{Path(source_path).stem}_{source_hash}.parquet")
+
+
+def _signature(source_path: str, ticker_actions: pd.DataFrame) -> str:
+    stat = os.stat(source_path)
+    actions_hash = hashlib.sha1(ticker_actions.to_csv(index=False).encode()).hexdigest()
+    return (
+        f"{os.path.abspath(source_path)}|{stat.st_mtime_ns}|{stat.st_size}|"
+        f"{actions_hash}|v{ADJUST_VERSION}"
+    )
+
+
+def load_adjusted(
+    source_path: str,
+    ticker: str | None = None,
+    actions_path: str = DEFAULT_ACTIONS_PATH,
+    cache_dir: str = DEFAULT_ADJUSTED_DIR,
+) -> pd.DataFrame:
+    """
+    Returns the adjusted series of a raw bar file, from the cache when it was
+    built from the same raw file and the same corporate actions.
+
+    Args:
+        source_path: Raw bar file (`.csv` or `.parquet`).
+        ticker: Ticker whose actions apply; inferred from the filename
+                (`SPY_1hour.csv` -> `SPY`) when omitted.
+        actions_path: Corporate action table.
+        cache_dir: Directory of the cached adjusted files.
+    """
+    ticker_actions = actions_for(ticker or _ticker_for(source_path), load_actions(actions_path))
+    path = adjusted_path(source_path, cache_dir)
+    signature = _signature(source_path, ticker_actions)
+    if os.path.exists(path) and read_bar_metadata(path).get(ADJUSTED_KEY) == signature:
+        return read_bars(path)
+
+    adjusted = adjust_bars(load_bars(source_path), ticker_actions)
+    write_bars(adjusted, path, metadata={ADJUSTED_KEY: signature})
+    # Read back so a fresh build and a cache hit return identical dtypes.
+    return read_bars(path)
+
+
+def load_series(
+    source_path: str,
+    adjusted: bool = False,
+    ticker: str | None = None,
+    actions_path: str = DEFAULT_ACTIONS_PATH,
+    cache_dir: str = DEFAULT_ADJUSTED_DIR,
+) -> pd.DataFrame:
+    """Loads the raw or the (cached) adjusted series of a bar file."""
+    if not adjusted:
+        return load_bars(source_path)
+    return load_adjusted(source_path, ticker, actions_path, cache_dir)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Main entry point for the adjustment script."""
+    parser = argparse.ArgumentParser(
+        description="Back-adjust a raw bar file for splits and dividends."
+    )
+    parser.add_argument("--data", required=True, help="Raw bar file (.csv or .parquet).")
+    parser.add_argument("--ticker", help="Ticker whose actions apply (default: from filename).")
+    parser.add_argument(
+        "--actions", default=DEFAULT_ACTIONS_PATH, help="Corporate action table (CSV)."
+    )
+    parser.add_argument(
+        "--fetch",
+        action="store_true",
+        help="Record the ticker's split/dividend history from Yahoo Finance first.",
+    )
+    parser.add_argument("--output", help="Optional CSV path to export the adjusted bars to.")
+    args = parser.parse_args(argv)
+
+    ticker = args.ticker or _ticker_for(args.data)
+    if args.fetch:
+        fetched = fetch_yfinance_actions([ticker])
+        record_actions(fetched, args.actions)
+        print(f"Recorded {len(fetched)} corporate action(s) for {ticker} in {args.actions}")
+
+    adjusted = load_adjusted(args.data, ticker, args.actions)
+    count = len(actions_for(ticker, load_actions(args.actions)))
+    print(f"Adjusted {len(adjusted)} {ticker} bars for {count} corporate action(s)")
+    if args.output:
+        adjusted.to_csv(args.output, index_label="Date")
+        print(f"Saved to {args.output}")
+    else:
+        print(adjusted.head())
+
+
+if __name__ == "__main__":
+    main()
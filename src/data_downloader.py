@@ -2,7 +2,23 @@ import argparse
 import os
 
 import pandas as pd
-import yfinance as yf
+
+from src.bar_cache import BarCache
+from src.bar_store import (
+    DEFAULT_STORAGE,
+    STORAGE_FORMATS,
+    bar_file_path,
+    import_csv,
+    write_bars,
+)
+
+
+def _save_bars(data: pd.DataFrame, output_path: str, storage: str) -> None:
+    """Saves a single-ticker frame in the requested storage format."""
+    if storage == "csv":
+        data.to_csv(output_path, index_label="Date")
+    else:
+        write_bars(data, output_path)
 
 
 def download_data(
@@ -11,12 +27,19 @@ def download_data(
     end_date: str,
     output_dir: str,
     force_download: bool = False,
+    storage: str = DEFAULT_STORAGE,
+    cache_dir: str | None = None,
 ) -> list[str]:
     """
-    Downloads historical market data from Yahoo Finance and saves it to CSV.
+    Downloads historical market data from Yahoo Finance and saves it to the
+    bar store (Parquet by default, or CSV when storage="csv").
     Checks for existing files to avoid redundant downloads unless
-    force_download is True. Returns a list of paths to the data files
-    (including those found in cache if force_download=False).
+    force_download is True. A legacy CSV with the expected name is imported
+    into the store instead of being re-downloaded. Anything else is served by
+    the range-aware `BarCache` (default: `{output_dir}/cache`), which only
+    downloads the date ranges it does not already hold. Returns a list of
+    paths to the data files (including those found in cache if
+    force_download=False).
     """
     # Create the output directory if it doesn't exist
     os.makedirs(output_dir, exist_ok=True)
@@ -27,10 +50,14 @@ def download_data(
     # Check cache for each ticker
     if not force_download:
         for ticker in tickers:
-            expected_path = os.path.join(output_dir, f"{ticker}_{start_date}_{end_date}.csv")
+            expected_path = bar_file_path(output_dir, ticker, start_date, end_date, storage)
+            legacy_csv = bar_file_path(output_dir, ticker, start_date, end_date, "csv")
             if os.path.exists(expected_path):
                 print(f"Cache hit for {ticker}: {expected_path}")
                 cached_files.append(expected_path)
+            elif storage != "csv" and os.path.exists(legacy_csv):
+                print(f"Cache hit for {ticker}: importing {legacy_csv} into the bar store")
+                cached_files.append(import_csv(legacy_csv, expected_path))
             else:
                 tickers_to_download.append(ticker)
     else:
@@ -40,51 +67,24 @@ def download_data(
         print("All requested data found in cache.")
         return cached_files
 
-    print(f"Downloading data for {tickers_to_download} from {start_date} to {end_date}...")
-    try:
-        data = yf.download(tickers_to_download, start=start_date, end=end_date)
-    except Exception as e:
-        print(f"Failed to download data: {e}")
-        return cached_files
+    # Fetch through the range-aware cache so only uncovered date ranges hit the network.
+    cache = BarCache(cache_dir if cache_dir is not None else os.path.join(output_dir, "cache"))
+    frames = cache.get_many(tickers_to_download, start_date, end_date, refresh=force_download)
 
-    if data is None or data.empty:
+    if not frames:
         print("No data downloaded. Please check the tickers and date range.")
         return cached_files
 
-    # Save each ticker to a separate CSV file
+    # Save each ticker to a separate file
     created_files = []
-    if len(tickers_to_download) == 1:
-        ticker = tickers_to_download[0]
-        output_path = os.path.join(output_dir, f"{ticker}_{start_date}_{end_date}.csv")
-        data.to_csv(output_path)
-        print(f"Data saved to {output_path}")
+    for ticker in tickers_to_download:
+        if ticker not in frames:
+            print(f"No data available for {ticker}.")
+            continue
+        output_path = bar_file_path(output_dir, ticker, start_date, end_date, storage)
+        _save_bars(frames[ticker], output_path, storage)
+        print(f"Data for {ticker} saved to {output_path}")
         created_files.append(output_path)
-    else:
-        for ticker in tickers_to_download:
-            output_path = os.path.join(output_dir, f"{ticker}_{start_date}_{end_date}.csv")
-            # Handle MultiIndex columns if multiple tickers returned
-            try:
-                ticker_data = data.xs(ticker, axis=1, level=1)
-            except KeyError:
-                # Fallback if level 1 is not the ticker level (yfinance version
-                # / structure can vary). Be robust to either layout.
-                try:
-                    ticker_data = data.loc[:, (slice(None), ticker)]
-                    # If columns are still MultiIndex (e.g. Price, Ticker),
-                    # drop the Ticker level.
-                    if isinstance(ticker_data.columns, pd.MultiIndex):
-                        ticker_data.columns = ticker_data.columns.droplevel(1)
-                except KeyError:
-                    # Last resort fallback, maybe columns are flat already?
-                    ticker_data = data
-
-            # Ensure columns are flat (drop 'Price' level if exists or generic MultiIndex)
-            if isinstance(ticker_data.columns, pd.MultiIndex):
-                ticker_data.columns = ticker_data.columns.get_level_values(0)
-
-            ticker_data.to_csv(output_path)
-            print(f"Data for {ticker} saved to {output_path}")
-            created_files.append(output_path)
 
     return cached_files + created_files
 
@@ -107,9 +107,22 @@ def main(argv: list[str] | None = None):
         "--output", default="data", help="The directory to save the downloaded data."
     )
     parser.add_argument("--force", action="store_true", help="Force download even if file exists.")
+    parser.add_argument(
+        "--format",
+        default=DEFAULT_STORAGE,
+        choices=list(STORAGE_FORMATS),
+        help="Storage format for the downloaded bars.",
+    )
     args = parser.parse_args(argv)
 
-    download_data(args.tickers, args.start, args.end, args.output, getattr(args, "force", False))
+    download_data(
+        args.tickers,
+        args.start,
+        args.end,
+        args.output,
+        getattr(args, "force", False),
+        storage=getattr(args, "format", DEFAULT_STORAGE),
+    )
 
 
 if __name__ == "__main__":
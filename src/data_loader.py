@@ -2,52 +2,55 @@ import os
 
 import pandas as pd
 
-from src.data_downloader import download_data
+from src.bar_cache import DEFAULT_CACHE_BUDGET_BYTES, BarCache
+from src.ingest import DEFAULT_PRICE_DTYPE, compact_bars
 
 DEFAULT_PERMANENT_TICKERS = {"SPY", "QQQ", "IWM", "GLD", "TLT"}
 
 
 class SmartLoader:
-    def __init__(self, data_dir: str = "data", permanent_tickers: set[str] | None = None):
+    """
+    Loads ticker data through a persistent, size-bounded bar cache.
+
+    Data stays in `{data_dir}/cache` across sessions, so repeat backtests hit
+    local disk instead of the network. On exit the cache is trimmed back to
+    `max_cache_bytes` using LRU (or LFU) eviction; `permanent_tickers` are
+    pinned and never evicted. Loaded frames are compacted to `price_dtype`
+    prices and int64 volume (see `src.ingest.compact_bars`).
+    """
+
+    def __init__(
+        self,
+        data_dir: str = "data",
+        permanent_tickers: set[str] | None = None,
+        max_cache_bytes: int = DEFAULT_CACHE_BUDGET_BYTES,
+        eviction_policy: str = "lru",
+        price_dtype: str = DEFAULT_PRICE_DTYPE,
+    ):
         self.data_dir = data_dir
         self.permanent_tickers = (
             permanent_tickers if permanent_tickers is not None else DEFAULT_PERMANENT_TICKERS
         )
-        self.created_files = []  # Track files created during this session
+        self.max_cache_bytes = max_cache_bytes
+        self.eviction_policy = eviction_policy
+        self.price_dtype = price_dtype
+        self.cache = BarCache(os.path.join(data_dir, "cache"))
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Cleanup ephemeral files on exit."""
+        """Enforce the cache budget on exit."""
         self.cleanup()
 
-    def cleanup(self):
-        """Deletes files for non-permanent tickers created during this session."""
-        for file_path in self.created_files:
-            if not os.path.exists(file_path):
-                continue
-
-            # Extract ticker from filename to check permanence
-            # Filename format: {ticker}_{start}_{end}.csv
-            filename = os.path.basename(file_path)
-            # Simple heuristic: split by first underscore. Assumes ticker
-            # contains no underscores, which is standard for Yahoo
-            # (e.g. BRK-B). Relies on the download_data naming convention:
-            # f"{ticker}_{start}_{end}.csv"
-
-            parts = filename.split("_")
-            if not parts:
-                continue
-
-            ticker = parts[0]
-
-            if ticker not in self.permanent_tickers:
-                try:
-                    os.remove(file_path)
-                    print(f"Cleaned up ephemeral data: {file_path}")
-                except OSError as e:
-                    print(f"Error cleaning up {file_path}: {e}")
+    def cleanup(self) -> list[str]:
+        """
+        Evicts unpinned tickers until the cache fits in its byte budget.
+        Returns the evicted tickers.
+        """
+        return self.cache.evict(
+            self.max_cache_bytes, pinned=self.permanent_tickers, policy=self.eviction_policy
+        )
 
     def load_data(
         self, ticker: str, start: str, end: str, force_download: bool = False
@@ -64,34 +67,17 @@ class SmartLoader:
         Returns:
             pd.DataFrame: The loaded market data.
         """
-        # Ensure data exists (download_data handles caching checks). We pass
-        # force_download through; the downloader handles existence checks
-        # when force is False.
-        new_files = download_data(
-            tickers=[ticker],
-            start_date=start,
-            end_date=end,
-            output_dir=self.data_dir,
-            force_download=force_download,
-        )
-
-        # Register new files for potential cleanup
-        if new_files:
-            self.created_files.extend(new_files)
-
-        # Construct path (matching the format in data_downloader)
-        file_path = os.path.join(self.data_dir, f"{ticker}_{start}_{end}.csv")
+        # The range-aware cache only downloads the parts of [start, end) it
+        # does not already hold and serves the request by slicing.
+        try:
+            df = self.cache.get(ticker, start, end, refresh=force_download)
+        except Exception as e:
+            raise OSError(f"Failed to read cached data for {ticker}: {e}")
 
-        if not os.path.exists(file_path):
+        if df is None:
             # This might happen if yfinance failed silent or data empty
             raise FileNotFoundError(
-                f"Data file not found after download attempt: {file_path}. "
+                f"No data available for {ticker} between {start} and {end}. "
                 f"Check if ticker is valid."
             )
-
-        # Load and return
-        try:
-            df = pd.read_csv(file_path, index_col=0, parse_dates=True)
-            return df
-        except Exception as e:
-            raise OSError(f"Failed to read CSV file {file_path}: {e}")
+        return compact_bars(df, self.price_dtype)
@@ -0,0 +1,337 @@
+"""
+Vectorized data quality checks for bar data, with a cached quality report.
+
+`validate_bars` runs every check over the whole frame as array operations:
+
+- Errors, which `clean_bars` repairs by dropping or reordering rows:
+  out-of-order and duplicate timestamps, missing values, zero or negative
+  prices, OHLC bars whose high/low do not bound the open and close, and
+  negative volume.
+- Warnings, which are reported but left in place: volume spikes and
+  calendar gaps.
+
+`ensure_quality` is the loaders' entry point. Each frame is validated once and
+its report cached under `data/cache/quality/` (one file per data file, so
+parallel loaders never rewrite each other's reports), keyed by the file's
+mtime and size and by a fingerprint of the frame as the loader passed it, so
+loaders that preprocess a file differently each get their frame checked.
+Unchanged clean frames skip validation entirely. Frames with errors are
+repaired, and assets with too many bad rows are blocked so they never reach a
+backtest.
+"""
+
+import dataclasses
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from src.bar_store import DATA_DIR, PRICE_COLUMNS, to_epoch_ns
+from src.trading_calendar import nyse_calendar
+
+DEFAULT_QUALITY_DIR = os.path.join(DATA_DIR, "cache", "quality")
+
+# Bumped whenever the checks change, invalidating cached reports.
+QUALITY_VERSION = "3"
+
+# Assets whose share of bad (dropped) rows exceeds this are blocked.
+MAX_BAD_FRACTION = 0.05
+
+# A bar is inconsistent when its high/low miss the open/close by more than
+# this relative tolerance (allows for float rounding in adjusted prices).
+OHLC_TOLERANCE = 1e-6
+
+# Volume above VOLUME_SPIKE_FACTOR x the median of the previous
+# VOLUME_SPIKE_WINDOW bars is flagged as a spike.
+VOLUME_SPIKE_FACTOR = 10.0
+VOLUME_SPIKE_WINDOW = 20
+
+# Daily bars: more missing NYSE sessions than this between two bars is a
+# gap (holidays are not sessions, so they never count). Intraday bars: a
+# same-day jump of more than INTRADAY_GAP_BARS typical bar spacings is a gap.
+MAX_MISSING_SESSIONS = 3
+INTRADAY_GAP_BARS = 3
+
+DAY_NS = 24 * 60 * 60 * 1_000_000_000
+
+# { report file path: (mtime, entry) }
+_loaded_reports: dict[str, tuple[float, dict[str, Any]]] = {}
+
+
+class DataQualityError(ValueError):
+    """Raised when a file holds no asset that passes the quality checks."""
+
+
+@dataclass(frozen=True)
+class QualityReport:
+    """Issue counts for one asset's bars. Row-level counts may overlap."""
+
+    rows: int
+    unsorted: int = 0
+    duplicates: int = 0
+    missing: int = 0
+    non_positive: int = 0
+    ohlc_inconsistent: int = 0
+    negative_volume: int = 0
+    bad_rows: int = 0
+    volume_spikes: int = 0
+    gaps: int = 0
+
+    @property
+    def needs_repair(self) -> bool:
+        """True if `clean_bars` would change the frame."""
+        return bool(self.unsorted or self.duplicates or self.bad_rows)
+
+    @property
+    def bad_fraction(self) -> float:
+        """Share of rows that `clean_bars` drops."""
+        return (self.duplicates + self.bad_rows) / self.rows if self.rows else 0.0
+
+    def is_blocked(self, max_bad_fraction: float = MAX_BAD_FRACTION) -> bool:
+        return self.rows == 0 or self.bad_fraction > max_bad_fraction
+
+    def issues(self) -> dict[str, int]:
+        """Non-zero issue counts by check."""
+        counts = dataclasses.asdict(self)
+        return {
+            name: count
+            for name, count in counts.items()
+            if name not in ("rows", "bad_rows") and count
+        }
+
+    def summary(self) -> str:
+        issues = self.issues()
+        if not issues:
+            return "clean"
+        return ", ".join(f"{name}={count}" for name, count in issues.items())
+
+
+def _row_errors(df: pd.DataFrame) -> dict[str, np.ndarray]:
+    """Per-row error masks (missing, non-positive, OHLC, negative volume)."""
+    price_cols = [col for col in PRICE_COLUMNS if col in df.columns]
+    prices = np.empty((len(df), len(price_cols)))
+    for j, col in enumerate(price_cols):
+        prices[:, j] = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype="float64")
+    other_cols = [col for col in df.columns if col not in price_cols]
+    missing = np.isnan(prices).any(axis=1)
+    if other_cols:
+        missing |= df[other_cols].isna().to_numpy().any(axis=1)
+
+    with np.errstate(invalid="ignore"):
+        non_positive = (prices <= 0).any(axis=1)
+        ohlc = np.zeros(len(df), dtype=bool)
+        if len(price_cols) == len(PRICE_COLUMNS):
+            open_, high, low, close = prices.T
+            tol = OHLC_TOLERANCE * np.abs(high)
+            ohlc = (high < np.maximum(np.maximum(open_, close), low) - tol) | (
+                low > np.minimum(np.minimum(open_, close), high) + tol
+            )
+        negative_volume = np.zeros(len(df), dtype=bool)
+        if "Volume" in df.columns:
+            volume = pd.to_numeric(df["Volume"], errors="coerce").to_numpy(dtype="float64")
+            negative_volume = volume < 0
+    return {
+        "missing": missing,
+        "non_positive": non_positive,
+        "ohlc_inconsistent": ohlc,
+        "negative_volume": negative_volume,
+    }
+
+
+def _any(masks: dict[str, np.ndarray], rows: int) -> np.ndarray:
+    combined = np.zeros(rows, dtype=bool)
+    for mask in masks.values():
+        combined |= mask
+    return combined
+
+
+def _volume_spikes(df: pd.DataFrame) -> int:
+    if "Volume" not in df.columns:
+        return 0
+    volume = pd.to_numeric(df["Volume"], errors="coerce").astype("float64")
+    baseline = volume.rolling(VOLUME_SPIKE_WINDOW, min_periods=VOLUME_SPIKE_WINDOW).median()
+    baseline = baseline.shift(1).to_numpy()
+    with np.errstate(invalid="ignore"):
+        spikes = (baseline > 0) & (volume.to_numpy() > VOLUME_SPIKE_FACTOR * baseline)
+    return int(spikes.sum())
+
+
+def _calendar_gaps(timestamps: np.ndarray) -> int:
+    """Counts gaps between consecutive (sorted, unique) bars."""
+    if len(timestamps) < 2:
+        return 0
+    diffs = np.diff(timestamps)
+    if (timestamps % DAY_NS == 0).all():
+        missing = nyse_calendar().count_sessions(timestamps[:-1] + DAY_NS, timestamps[1:])
+        return int((missing > MAX_MISSING_SESSIONS).sum())
+    spacing = np.median(diffs)
+    same_day = timestamps[1:] // DAY_NS == timestamps[:-1] // DAY_NS
+    return int((same_day & (diffs > INTRADAY_GAP_BARS * spacing)).sum())
+
+
+def validate_bars(df: pd.DataFrame) -> QualityReport:
+    """Runs every quality check on a bar frame (standard layout, any row order)."""
+    timestamps = to_epoch_ns(df.index)
+    unique_sorted = np.unique(timestamps)
+    errors = _row_errors(df)
+    bad = _any(errors, len(df))
+    return QualityReport(
+        rows=len(df),
+        unsorted=int((np.diff(timestamps) < 0).sum()),
+        duplicates=len(timestamps) - len(unique_sorted),
+        bad_rows=int(bad.sum()),
+        volume_spikes=_volume_spikes(df),
+        gaps=_calendar_gaps(unique_sorted),
+        **{name: int(mask.sum()) for name, mask in errors.items()},
+    )
+
+
+def clean_bars(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Repairs the errors `validate_bars` detects: sorts by time, keeps the last
+    bar of each duplicated timestamp and drops rows with missing values,
+    non-positive prices, inconsistent OHLC or negative volume.
+    """
+    timestamps = to_epoch_ns(df.index)
+    if (np.diff(timestamps) < 0).any():
+        order = np.argsort(timestamps, kind="stable")
+        df, timestamps = df.iloc[order], timestamps[order]
+    duplicated = np.r_[timestamps[1:] == timestamps[:-1], False]
+    if duplicated.any():
+        df = df.iloc[~duplicated]
+    bad = _any(_row_errors(df), len(df))
+    if bad.any():
+        df = df.iloc[~bad]
+    return df
+
+
+# --- Cached reports ---
+
+
+def quality_path(file_path: str, cache_dir: str = DEFAULT_QUALITY_DIR) -> str:
+    """
+    Returns the report file of the data file at `file_path`. Reports are
+    grouped in one folder per data directory.
+    """
+    directory, filename = os.path.split(os.path.abspath(file_path))
+    directory_hash = hashlib.sha1(directory.encode()).hexdigest()[:10]
+    folder = f"{os.path.basename(directory)}_{directory_hash}"
+    return os.path.join(cache_dir, folder, f"{filename}.json")
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """Hash of a frame's index, columns, dtypes and values."""
+    digest = hashlib.sha1(repr([(str(c), str(t)) for c, t in df.dtypes.items()]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _load_report(path: str) -> dict[str, Any]:
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return {}
+    cached = _loaded_reports.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    try:
+        with open(path) as f:
+            entry = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    _loaded_reports[path] = (mtime, entry)
+    return entry
+
+
+def _save_report(path: str, entry: dict[str, Any]) -> None:
+    tmp_path = f"{path}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "w") as f:
+            json.dump(entry, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+        _loaded_reports[path] = (os.path.getmtime(path), entry)
+    except OSError as e:
+        # A read-only cache directory only loses the cache, not the checks.
+        print(f"Could not write quality report {path}: {e}")
+
+
+def quality_reports(
+    file_path: str, frames: dict[str, pd.DataFrame], cache_dir: str = DEFAULT_QUALITY_DIR
+) -> dict[str, QualityReport]:
+    """
+    Returns the quality report of each asset loaded from `file_path`,
+    validating only frames that have no report for the file's current mtime
+    and size and the frame's fingerprint. New reports are printed and saved.
+    """
+    filename = os.path.basename(file_path)
+    path = quality_path(file_path, cache_dir)
+    try:
+        stat = os.stat(file_path)
+        signature = {"mtime": stat.st_mtime, "size": stat.st_size, "version": QUALITY_VERSION}
+    except OSError:
+        signature = None
+
+    entry = _load_report(path) if signature is not None else {}
+    if not entry or any(entry.get(key) != value for key, value in (signature or {}).items()):
+        entry = {**(signature or {}), "assets": {}}
+
+    reports = {}
+    changed = False
+    for name, df in frames.items():
+        # One report per distinct frame: loaders may preprocess the file differently.
+        by_fingerprint = entry["assets"].setdefault(name, {})
+        fingerprint = frame_fingerprint(df)
+        cached = by_fingerprint.get(fingerprint)
+        if cached is not None:
+            reports[name] = QualityReport(**cached)
+            continue
+        report = validate_bars(df)
+        print(f"Quality check {name} ({filename}): {report.summary()}")
+        by_fingerprint[fingerprint] = dataclasses.asdict(report)
+        reports[name] = report
+        changed = True
+
+    if changed and signature is not None:
+        _save_report(path, entry)
+    return reports
+
+
+def ensure_quality(
+    file_path: str,
+    frames: dict[str, pd.DataFrame],
+    max_bad_fraction: float = MAX_BAD_FRACTION,
+    cache_dir: str = DEFAULT_QUALITY_DIR,
+) -> dict[str, pd.DataFrame]:
+    """
+    Quality gate for the frames loaded from `file_path`.
+
+    Clean frames are returned untouched (without re-validating unchanged
+    files), frames with errors are repaired with `clean_bars`, and frames with
+    more than `max_bad_fraction` bad rows are dropped.
+
+    Raises:
+        DataQualityError: If no frame passes.
+    """
+    reports = quality_reports(file_path, frames, cache_dir)
+    passed = {}
+    blocked = []
+    for name, df in frames.items():
+        report = reports[name]
+        if report.is_blocked(max_bad_fraction):
+            blocked.append(f"{name} ({report.summary()})")
+            continue
+        passed[name] = clean_bars(df) if report.needs_repair else df
+
+    if blocked:
+        message = f"Blocked by quality checks in {os.path.basename(file_path)}: " + "; ".join(
+            blocked
+        )
+        if not passed:
+            raise DataQualityError(message)
+        print(message)
+    return passed
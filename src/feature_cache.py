@@ -0,0 +1,147 @@
+"""
+Persistent cache of computed features.
+
+`FeatureEngineer` output depends only on the input bars and on the feature
+definitions, so the same history (the SPY series every training run and ML
+backtest starts from) does not need to be recomputed. A `FeatureCache` keys
+each result by:
+
+- a content hash of the input bars (index and OHLCV values, not the file
+  they came from, so identical data loaded from a CSV or the bar store
+  shares an entry);
+- the feature spec: the requested feature names (`FEATURE_COLUMNS` by
+  default), which encode every indicator parameter (`SMA_50`,
+  `BBU_20_2.0`, ...);
+- `FEATURE_VERSION`, bumped whenever an indicator's computation changes.
+
+Entries are Parquet files in `data/cache/features/`. Like the bar cache, the
+directory is held to a byte budget by its `CacheManifest` (LRU by default).
+"""
+
+import hashlib
+import json
+import os
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.bar_store import PARQUET_EXTENSION, to_epoch_ns
+from src.cache_manifest import CacheManifest
+from src.feature_engineering import (
+    FEATURE_VERSION,
+    FeatureEngineer,
+    FeatureSelection,
+    resolve_features,
+)
+from src.panel import Panel
+
+DEFAULT_FEATURE_CACHE_DIR = os.path.join("data", "cache", "features")
+DEFAULT_FEATURE_CACHE_BUDGET_BYTES = 256 * 1024 * 1024
+
+INPUT_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+
+def feature_spec(features: FeatureSelection = None) -> str:
+    """The feature definitions a cached result was computed with."""
+    return json.dumps({"version": FEATURE_VERSION, "columns": resolve_features(features)})
+
+
+def _hash_array(digest: Any, values: np.ndarray) -> None:
+    digest.update(str(values.dtype).encode())
+    digest.update(np.ascontiguousarray(values).tobytes())
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """Content hash of the bars `calculate_features` reads (index and OHLCV)."""
+    digest = hashlib.sha1()
+    _hash_array(digest, to_epoch_ns(df.index))
+    for col in INPUT_COLUMNS:
+        digest.update(col.encode())
+        _hash_array(digest, df[col].to_numpy(dtype="float64"))
+    return digest.hexdigest()
+
+
+def panel_fingerprint(panel: Panel) -> str:
+    """Content hash of a panel's index, assets, fields, values and mask."""
+    digest = hashlib.sha1()
+    _hash_array(digest, to_epoch_ns(panel.index))
+    digest.update(json.dumps([panel.assets, panel.fields]).encode())
+    _hash_array(digest, panel.values)
+    _hash_array(digest, panel.mask)
+    return digest.hexdigest()
+
+
+class FeatureCache:
+    """
+    Computes features through a `FeatureEngineer`, reusing results stored on
+    disk for inputs that were seen before.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_FEATURE_CACHE_DIR,
+        max_bytes: int = DEFAULT_FEATURE_CACHE_BUDGET_BYTES,
+        engineer: FeatureEngineer | None = None,
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.engineer = engineer if engineer is not None else FeatureEngineer()
+        self.manifest = CacheManifest(cache_dir)
+
+    def key_for(self, fingerprint: str, features: FeatureSelection = None) -> str:
+        """Cache key of an input fingerprint under the current feature spec."""
+        return hashlib.sha1(f"{fingerprint}|{feature_spec(features)}".encode()).hexdigest()
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}{PARQUET_EXTENSION}")
+
+    def _load(self, key: str) -> pd.DataFrame | None:
+        path = self.path_for(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            features = pq.read_table(path).to_pandas()
+        except (OSError, pa.ArrowException) as e:
+            # An unreadable entry is recomputed and overwritten.
+            print(f"Ignoring unreadable cached features {path}: {e}")
+            return None
+        self.manifest.touch(key, os.path.basename(path))
+        return features
+
+    def _store(self, key: str, features: pd.DataFrame) -> None:
+        path = self.path_for(key)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        pq.write_table(pa.Table.from_pandas(features, preserve_index=True), tmp_path)
+        os.replace(tmp_path, path)
+        self.manifest.touch(key, os.path.basename(path))
+        self.evict(pinned={key})
+
+    def calculate_features(
+        self, df: pd.DataFrame, features: FeatureSelection = None
+    ) -> pd.DataFrame:
+        """`FeatureEngineer.calculate_features`, served from disk when cached."""
+        key = self.key_for(frame_fingerprint(df), features)
+        result = self._load(key)
+        if result is None:
+            result = self.engineer.calculate_features(df, features)
+            self._store(key, result)
+        return result
+
+    def calculate_panel_features(
+        self, panel: Panel, features: FeatureSelection = None
+    ) -> pd.DataFrame:
+        """`FeatureEngineer.calculate_panel_features`, served from disk when cached."""
+        key = self.key_for(f"panel:{panel_fingerprint(panel)}", features)
+        result = self._load(key)
+        if result is None:
+            result = self.engineer.calculate_panel_features(panel, features)
+            self._store(key, result)
+        return result
+
+    def evict(self, pinned: set[str] | None = None, policy: str = "lru") -> list[str]:
+        """Evicts cached feature sets until the cache fits in its byte budget."""
+        return self.manifest.evict(self.max_bytes, PARQUET_EXTENSION, pinned=pinned, policy=policy)
@@ -1,5 +1,322 @@
+"""
+Technical indicator features, shared by research (training) and live trading.
+
+Every feature is a named `FeatureDefinition` in `FEATURE_REGISTRY`, declaring
+the columns or other features it is computed from and its parameters.
+Requesting a subset (e.g. `["RSI_14", "ATR_14"]`) resolves the dependency
+graph and computes only what that subset needs. Intermediates are computed
+once and shared: MACD, its signal line and its histogram all reuse the same
+12/26-period EMAs.
+
+Each definition also has a streaming update, which takes one bar's inputs
+and keeps its own state, so `StreamingFeatureEngineer` can produce any
+feature selection one bar at a time.
+
+Named presets map to fixed, ordered feature lists. `"xgboost"` (the default,
+also exported as `FEATURE_COLUMNS`) is the layout the trained XGBoost models
+expect.
+"""
+
+import functools
+import operator
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
 import pandas as pd
 
+from src import kernels
+from src.bar_stream import iter_windows
+from src.panel import Panel
+
+# Bumped whenever an indicator's computation changes, invalidating cached
+# features (see `src/feature_cache.py`).
+FEATURE_VERSION = "2"
+
+# Input columns features are computed from (the `calculate_features` layout).
+RAW_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+@dataclass(frozen=True)
+class FeatureDefinition:
+    """
+    A named feature: `compute(*inputs, **params)`, where each input is a raw
+    column or another registered feature.
+
+    Inputs and outputs are float arrays along axis 0: `(time,)` for one
+    ticker or `(time, assets)` for a panel, so one definition serves both
+    (see `src/kernels.py`).
+
+    `stream(**params)` creates the feature's streaming state, whose
+    `update(*inputs)` takes the inputs of one bar and returns its value.
+    """
+
+    name: str
+    compute: Callable[..., np.ndarray]
+    inputs: tuple[str, ...]
+    params: Mapping[str, Any] = field(default_factory=dict)
+    stream: Callable[..., Any] | None = None
+
+    def streamer(self) -> Any:
+        """New streaming state for this feature."""
+        if self.stream is None:
+            raise ValueError(f"Feature '{self.name}' has no streaming update")
+        return self.stream(**self.params)
+
+
+FEATURE_REGISTRY: dict[str, FeatureDefinition] = {}
+
+
+def register_feature(
+    name: str,
+    compute: Callable[..., np.ndarray],
+    inputs: Iterable[str],
+    *,
+    elementwise: bool = False,
+    stream: Callable[..., Any] | None = None,
+    **params: Any,
+) -> FeatureDefinition:
+    """
+    Adds a feature definition to `FEATURE_REGISTRY`.
+
+    Args:
+        elementwise: `compute` combines its inputs bar by bar (e.g.
+                     `operator.sub`), so it also serves as the streaming update.
+        stream: Factory of the streaming state (see `FeatureDefinition`).
+                Defaults to the streaming counterpart of a `kernels` function
+                (`kernels.STREAMING`).
+    """
+    if name in FEATURE_REGISTRY or name in RAW_COLUMNS:
+        raise ValueError(f"Feature '{name}' is already defined")
+    if elementwise:
+        stream = functools.partial(_ElementwiseStream, compute)
+    elif stream is None:
+        stream = kernels.STREAMING.get(compute)
+    if stream is None:
+        raise ValueError(f"Feature '{name}' needs a streaming update (elementwise or stream)")
+    definition = FeatureDefinition(name, compute, tuple(inputs), params, stream)
+    FEATURE_REGISTRY[name] = definition
+    return definition
+
+
+# --- Indicator functions ---
+
+
+def _previous(values: np.ndarray) -> np.ndarray:
+    """`values` shifted one bar later (NaN on the first bar)."""
+    shifted = np.empty_like(values)
+    shifted[:1] = np.nan
+    shifted[1:] = values[:-1]
+    return shifted
+
+
+def _band(middle: np.ndarray, std: np.ndarray, width: float) -> np.ndarray:
+    return middle + (std * width)
+
+
+def _rsi(close: np.ndarray, period: int = 14) -> np.ndarray:
+    delta = close - _previous(close)
+    gain = kernels.rolling_mean(np.where(delta > 0, delta, 0.0), period)
+    loss = kernels.rolling_mean(np.where(delta < 0, -delta, 0.0), period)
+    rs = gain / loss
+    return 100 - (100 / (1 + rs))
+
+
+def _stoch_k(close: np.ndarray, low_min: np.ndarray, high_max: np.ndarray) -> np.ndarray:
+    return 100 * ((close - low_min) / (high_max - low_min))
+
+
+def _atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
+    previous_close = _previous(close)
+    tr1 = high - low
+    tr2 = np.abs(high - previous_close)
+    tr3 = np.abs(low - previous_close)
+    # NaN-skipping max of the three ranges (the first bar has no previous close).
+    tr = np.fmax(np.fmax(tr1, tr2), tr3)
+    return kernels.rolling_mean(tr, period)
+
+
+# --- Streaming updates ---
+
+
+class _ElementwiseStream:
+    """Streaming state of an elementwise feature: `compute` on one bar's inputs."""
+
+    def __init__(self, compute: Callable[..., np.ndarray], **params: Any) -> None:
+        self.compute = compute
+        self.params = params
+
+    def update(self, *values: float) -> float:
+        # NumPy scalars, so division by zero gives inf/NaN as in the batch version.
+        return float(self.compute(*map(np.float64, values), **self.params))
+
+
+class _RSIStream:
+    """Streaming `_rsi`."""
+
+    def __init__(self, period: int = 14) -> None:
+        self.gain = kernels.RollingMeanStream(period)
+        self.loss = kernels.RollingMeanStream(period)
+        self.previous = np.nan
+
+    def update(self, close: float) -> float:
+        # The first bar has no change; like the batch version it counts as 0.
+        delta = close - self.previous
+        self.previous = close
+        gain = np.float64(self.gain.update(delta if delta > 0 else 0.0))
+        loss = self.loss.update(-delta if delta < 0 else 0.0)
+        return float(100 - (100 / (1 + gain / loss)))
+
+
+class _ATRStream:
+    """Streaming `_atr`."""
+
+    def __init__(self, period: int = 14) -> None:
+        self.true_range = kernels.RollingMeanStream(period)
+        self.previous_close = np.nan
+
+    def update(self, high: float, low: float, close: float) -> float:
+        ranges = (high - low, abs(high - self.previous_close), abs(low - self.previous_close))
+        self.previous_close = close
+        return self.true_range.update(float(np.fmax(np.fmax(ranges[0], ranges[1]), ranges[2])))
+
+
+# --- Trend Indicators ---
+register_feature("SMA_50", kernels.rolling_mean, ["close"], window=50)
+register_feature("SMA_200", kernels.rolling_mean, ["close"], window=200)
+register_feature("EMA_20", kernels.ema, ["close"], span=20)
+# MACD (12, 26, 9)
+register_feature("ema_12", kernels.ema, ["close"], span=12)
+register_feature("ema_26", kernels.ema, ["close"], span=26)
+register_feature("MACD_12_26_9", operator.sub, ["ema_12", "ema_26"], elementwise=True)
+register_feature("MACDS_12_26_9", kernels.ema, ["MACD_12_26_9"], span=9)
+register_feature("MACDH_12_26_9", operator.sub, ["MACD_12_26_9", "MACDS_12_26_9"], elementwise=True)
+
+# --- Momentum Indicators ---
+register_feature("RSI_14", _rsi, ["close"], stream=_RSIStream, period=14)
+# Stochastic Oscillator (14, 3, 3)
+register_feature("low_min_14", kernels.rolling_min, ["low"], window=14)
+register_feature("high_max_14", kernels.rolling_max, ["high"], window=14)
+register_feature(
+    "STOCHk_14_3_3", _stoch_k, ["close", "low_min_14", "high_max_14"], elementwise=True
+)
+register_feature("STOCHd_14_3_3", kernels.rolling_mean, ["STOCHk_14_3_3"], window=3)
+
+# --- Volatility Indicators ---
+# Bollinger Bands (20, 2)
+register_feature("BBM_20_2.0", kernels.rolling_mean, ["close"], window=20)
+register_feature("std_20", kernels.rolling_std, ["close"], window=20)
+register_feature("BBU_20_2.0", _band, ["BBM_20_2.0", "std_20"], elementwise=True, width=2.0)
+register_feature("BBL_20_2.0", _band, ["BBM_20_2.0", "std_20"], elementwise=True, width=-2.0)
+register_feature("ATR_14", _atr, ["high", "low", "close"], stream=_ATRStream, period=14)
+
+# --- Volume Indicators ---
+# VWAP requires a datetime index to reset correctly, but talib has no
+# direct VWAP implementation. For OHLCV without intraday resets we may
+# skip it or use a rolling VWAP approximation:
+# df['VWAP'] = ta.vwap(df['high'], df['low'], df['close'], df['volume'])
+
+# --- Presets ---
+
+FEATURE_PRESETS: dict[str, list[str]] = {
+    # Feature order of the trained XGBoost models.
+    "xgboost": [
+        "close",
+        "high",
+        "low",
+        "open",
+        "volume",
+        "SMA_50",
+        "SMA_200",
+        "EMA_20",
+        "MACD_12_26_9",
+        "MACDS_12_26_9",
+        "MACDH_12_26_9",
+        "RSI_14",
+        "STOCHk_14_3_3",
+        "STOCHd_14_3_3",
+        "BBL_20_2.0",
+        "BBM_20_2.0",
+        "BBU_20_2.0",
+        "ATR_14",
+    ],
+}
+DEFAULT_PRESET = "xgboost"
+FEATURE_COLUMNS = FEATURE_PRESETS[DEFAULT_PRESET]
+
+FeatureSelection = str | Iterable[str] | None
+
+
+def resolve_features(features: FeatureSelection = None) -> list[str]:
+    """
+    Output columns for a feature selection: None (the default preset), a
+    preset name, a single feature name or a list of feature names.
+    """
+    if features is None:
+        features = DEFAULT_PRESET
+    if isinstance(features, str):
+        if features in FEATURE_PRESETS:
+            return list(FEATURE_PRESETS[features])
+        features = [features]
+    names = list(features)
+    unknown = [name for name in names if name not in FEATURE_REGISTRY and name not in RAW_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown feature(s): {', '.join(unknown)}")
+    return names
+
+
+def feature_plan(names: Iterable[str]) -> tuple[list[str], list[FeatureDefinition]]:
+    """
+    Resolves the dependency graph of `names`.
+
+    Returns:
+        The raw columns needed, and the feature definitions to compute in
+        dependency order (each appears once, however many features share it).
+    """
+    raw: list[str] = []
+    order: list[FeatureDefinition] = []
+    state: dict[str, str] = {}
+
+    def visit(name: str) -> None:
+        if name in RAW_COLUMNS:
+            if name not in raw:
+                raw.append(name)
+            return
+        if state.get(name) == "done":
+            return
+        if state.get(name) == "visiting":
+            raise ValueError(f"Feature '{name}' depends on itself")
+        definition = FEATURE_REGISTRY.get(name)
+        if definition is None:
+            raise ValueError(f"Unknown feature '{name}'")
+        state[name] = "visiting"
+        for dependency in definition.inputs:
+            visit(dependency)
+        state[name] = "done"
+        order.append(definition)
+
+    for name in names:
+        visit(name)
+    return raw, order
+
+
+def evaluate_features(
+    source: Mapping[str, np.ndarray], names: Iterable[str]
+) -> dict[str, np.ndarray]:
+    """
+    Computes `names` (and only their dependencies) from the raw column arrays
+    in `source`. Returns every computed array, intermediates included.
+    """
+    raw, order = feature_plan(names)
+    values = {name: np.asarray(source[name], dtype=np.float64) for name in raw}
+    # Flat ranges and zero losses divide by zero, giving inf/NaN as in pandas.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for definition in order:
+            inputs = [values[name] for name in definition.inputs]
+            values[definition.name] = definition.compute(*inputs, **definition.params)
+    return values
+
 
 class FeatureEngineer:
     """
@@ -10,111 +327,79 @@ class FeatureEngineer:
     def __init__(self) -> None:
         pass
 
-    def calculate_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    def calculate_features(
+        self, df: pd.DataFrame, features: FeatureSelection = None
+    ) -> pd.DataFrame:
         """
-        Applies all defined technical indicators to the dataframe.
+        Applies the requested technical indicators to the dataframe.
 
         Args:
-            df: OHLCV DataFrame.
+            df: OHLCV DataFrame (lowercase column names).
+            features: A preset name, feature names, or None for the default
+                      preset (`FEATURE_COLUMNS`). Only what they depend on is
+                      computed.
 
         Returns:
-            DataFrame with added feature columns.
+            DataFrame with the requested feature columns, in order.
         """
-        # Ensure we have a copy to avoid SettingWithCopy warnings on the original df
-        df = df.copy()
-
-        # Helper for RSI
-        def calculate_rsi(series: pd.Series, period: int = 14) -> pd.Series:
-            delta = series.diff().astype(float)
-            gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-            rs = gain / loss
-            return 100 - (100 / (1 + rs))
-
-        # Helper for Stochastic
-        def calculate_stoch(
-            high: pd.Series, low: pd.Series, close: pd.Series, k_period: int = 14, d_period: int = 3
-        ) -> tuple[pd.Series, pd.Series]:
-            low_min = low.rolling(window=k_period).min()
-            high_max = high.rolling(window=k_period).max()
-            k = 100 * ((close - low_min) / (high_max - low_min))
-            d = k.rolling(window=d_period).mean()
-            return k, d
-
-        # Helper for ATR
-        def calculate_atr(
-            high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14
-        ) -> pd.Series:
-            tr1 = high - low
-            tr2 = (high - close.shift()).abs()
-            tr3 = (low - close.shift()).abs()
-            tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-            return tr.rolling(window=period).mean()
-
-        # --- Trend Indicators ---
-        # Simple Moving Averages
-        df["SMA_50"] = df["close"].rolling(window=50).mean()
-        df["SMA_200"] = df["close"].rolling(window=200).mean()
-
-        # Exponential Moving Averages
-        df["EMA_20"] = df["close"].ewm(span=20, adjust=False).mean()
-
-        # MACD (12, 26, 9)
-        ema12 = df["close"].ewm(span=12, adjust=False).mean()
-        ema26 = df["close"].ewm(span=26, adjust=False).mean()
-        df["MACD_12_26_9"] = ema12 - ema26
-        df["MACDS_12_26_9"] = df["MACD_12_26_9"].ewm(span=9, adjust=False).mean()
-        df["MACDH_12_26_9"] = df["MACD_12_26_9"] - df["MACDS_12_26_9"]
-
-        # --- Momentum Indicators ---
-        # RSI (14)
-        df["RSI_14"] = calculate_rsi(df["close"], period=14)
-
-        # Stochastic Oscillator
-        slowk, slowd = calculate_stoch(df["high"], df["low"], df["close"], k_period=14, d_period=3)
-        df["STOCHk_14_3_3"] = slowk
-        df["STOCHd_14_3_3"] = slowd
-
-        # --- Volatility Indicators ---
-        # Bollinger Bands (20, 2)
-        middle = df["close"].rolling(window=20).mean()
-        std = df["close"].rolling(window=20).std()
-        df["BBM_20_2.0"] = middle
-        df["BBU_20_2.0"] = middle + (std * 2)
-        df["BBL_20_2.0"] = middle - (std * 2)
-
-        # ATR (14)
-        df["ATR_14"] = calculate_atr(df["high"], df["low"], df["close"], period=14)
-
-        # --- Volume Indicators ---
-        # VWAP requires a datetime index to reset correctly, but talib has no
-        # direct VWAP implementation. For OHLCV without intraday resets we may
-        # skip it or use a rolling VWAP approximation:
-        # df['VWAP'] = ta.vwap(df['high'], df['low'], df['close'], df['volume'])
-
-        # Reorder columns to match the trained XGBoost models' feature order.
-        expected_order = [
-            "close",
-            "high",
-            "low",
-            "open",
-            "volume",
-            "SMA_50",
-            "SMA_200",
-            "EMA_20",
-            "MACD_12_26_9",
-            "MACDS_12_26_9",
-            "MACDH_12_26_9",
-            "RSI_14",
-            "STOCHk_14_3_3",
-            "STOCHd_14_3_3",
-            "BBL_20_2.0",
-            "BBM_20_2.0",
-            "BBU_20_2.0",
-            "ATR_14",
-        ]
+        names = resolve_features(features)
+        raw, _ = feature_plan(names)
+        values = evaluate_features({name: df[name].to_numpy() for name in raw}, names)
+        # Raw columns are passed through with their own dtype.
+        columns = {name: df[name] if name in RAW_COLUMNS else values[name] for name in names}
+        return pd.DataFrame(columns, index=df.index)
+
+    def calculate_panel_features(
+        self, panel: Panel, features: FeatureSelection = None
+    ) -> pd.DataFrame:
+        """
+        `calculate_features` for every asset of a `Panel` in one pass.
+
+        Each asset's observed bars are packed into the top rows of a
+        `(bars, assets)` matrix (an outer-joined panel may have gaps and
+        different start dates per asset), so every indicator is a single
+        column-wise operation across the universe. The result equals running
+        `calculate_features` on each asset's own bars.
+
+        Args:
+            panel: Aligned panel with the OHLCV fields the requested features
+                   need (any capitalization).
+            features: As in `calculate_features`.
+
+        Returns:
+            Long-format frame with one row per observed bar of each asset,
+            indexed by `(Date, Asset)` in time order and with the requested
+            features as float64 columns, ready to use as an XGBoost feature
+            matrix.
+        """
+        names = resolve_features(features)
+        raw, _ = feature_plan(names)
+        positions = {field.lower(): i for i, field in enumerate(panel.fields)}
+        missing = [name for name in raw if name not in positions]
+        if missing:
+            raise ValueError(f"Panel is missing field(s): {', '.join(missing)}")
+
+        times, assets = np.nonzero(panel.mask)
+        # Row of each observed bar within its own asset's series.
+        rows = (np.cumsum(panel.mask, axis=0) - 1)[times, assets]
+        depth = int(rows.max()) + 1 if len(rows) else 0
+
+        def packed(name: str) -> np.ndarray:
+            data = np.full((depth, len(panel.assets)), np.nan)
+            data[rows, assets] = panel.values[times, assets, positions[name]]
+            return data
+
+        values = evaluate_features({name: packed(name) for name in raw}, names)
 
-        return df[expected_order]
+        flat = rows * len(panel.assets) + assets
+        matrix = np.empty((len(rows), len(names)))
+        for j, name in enumerate(names):
+            matrix[:, j] = np.take(values[name], flat)
+        index = pd.MultiIndex.from_arrays(
+            [panel.index[times], np.asarray(panel.assets, dtype=object)[assets]],
+            names=["Date", "Asset"],
+        )
+        return pd.DataFrame(matrix, index=index, columns=names)
 
     def get_required_lookback(self) -> int:
         """
@@ -122,3 +407,90 @@ class FeatureEngineer:
         Useful for live trading to fetch just enough data.
         """
         return 200  # Based on SMA_200
+
+    def calculate_features_chunked(
+        self,
+        chunks: Iterable[pd.DataFrame],
+        lookback: int | None = None,
+        features: FeatureSelection = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Windowed variant of `calculate_features` for histories that are read
+        a chunk at a time (see `src.bar_stream.iter_bars`).
+
+        Each chunk is prefixed with the `lookback` preceding bars (default:
+        `get_required_lookback()`), so rolling indicators on the new rows see
+        the same history as a full-frame computation. Exponential indicators
+        (EMA, MACD) restart at the window start; after a 200 bar warm-up their
+        difference from the full computation is around 1e-9 of the price level.
+
+        Args:
+            chunks: Consecutive OHLCV chunks in the `calculate_features` layout.
+            lookback: Number of warm-up bars carried between chunks.
+            features: As in `calculate_features`.
+
+        Yields:
+            The feature rows for each chunk (warm-up rows excluded).
+        """
+        if lookback is None:
+            lookback = self.get_required_lookback()
+        for window, warmup in iter_windows(chunks, lookback):
+            yield self.calculate_features(window, features).iloc[warmup:]
+
+
+# --- Streaming (incremental) features ---
+
+
+class StreamingFeatureEngineer:
+    """
+    Incremental counterpart of `FeatureEngineer.calculate_features`.
+
+    Holds the streaming state of every feature in the selection's dependency
+    plan (see `FeatureDefinition.stream`), so each new bar is processed in
+    O(1) instead of recomputing the full lookback. Fed the same bars from the
+    start, its features match the batch computation to float rounding.
+
+    Usage:
+        streamer = StreamingFeatureEngineer()   # or a preset / feature names
+        streamer.update_frame(history)        # warm up on past bars
+        features = streamer.update(new_bar)   # then one bar at a time
+    """
+
+    def __init__(self, features: FeatureSelection = None) -> None:
+        self.features = resolve_features(features)
+        self.raw, self.plan = feature_plan(self.features)
+        self.reset()
+
+    def reset(self) -> None:
+        """Clears all indicator state."""
+        self.streams = [
+            (definition.name, definition.inputs, definition.streamer()) for definition in self.plan
+        ]
+        self.bars = 0
+
+    def update(self, bar: Mapping[str, float]) -> dict[str, float]:
+        """
+        Adds one bar and returns its features.
+
+        Args:
+            bar: Mapping with the raw columns the features need (the
+                 `calculate_features` column layout).
+
+        Returns:
+            `{feature: value}` in the order of the feature selection.
+        """
+        values = {name: float(bar[name]) for name in self.raw}
+        # Flat ranges and zero losses divide by zero, as in `evaluate_features`.
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for name, inputs, stream in self.streams:
+                values[name] = stream.update(*[values[column] for column in inputs])
+        self.bars += 1
+        return {name: values[name] for name in self.features}
+
+    def update_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Feeds every bar of `df` in order and returns their features (batch layout)."""
+        rows = [
+            self.update(dict(zip(self.raw, values, strict=True)))
+            for values in df[self.raw].itertuples(index=False, name=None)
+        ]
+        return pd.DataFrame(rows, index=df.index, columns=self.features)
@@ -0,0 +1,316 @@
+"""
+Data ingestion: turns data files into normalised per-asset DataFrames.
+
+`load_asset_file` is the single normalisation routine for every file layout
+the framework reads (single-asset CSV, yfinance multi-asset CSV, bar store
+Parquet). `load_assets` runs it over many files, optionally in a process or
+thread pool, and returns the `assets_map` structure used by the benchmark:
+`{asset_name: {"data": DataFrame, "source": filename}}`. `load_panel` returns
+the same assets aligned in one `Panel` instead.
+"""
+
+import glob
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from src.bar_store import (
+    CSV_EXTENSION,
+    NAT_NS,
+    OHLCV_COLUMNS,
+    PARQUET_EXTENSION,
+    from_epoch_ns,
+    parse_timestamps,
+    read_bars,
+    timestamp_index,
+)
+from src.data_quality import DEFAULT_QUALITY_DIR, ensure_quality
+from src.panel import Panel
+
+EXECUTORS = ("process", "thread")
+
+# Price precision of loaded frames. float32 halves the memory of the price
+# columns at the cost of ~7 significant digits; float64 keeps results
+# bit-identical to the raw data.
+PRICE_DTYPES = ("float64", "float32")
+DEFAULT_PRICE_DTYPE = os.environ.get("QUANT_CORE_PRICE_DTYPE", "float64")
+
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    """Memory held by a DataFrame, including its index and any object values."""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def format_memory_saving(before: int, after: int) -> str:
+    """Formats a before/after memory comparison, e.g. '12.0 MB -> 6.5 MB (saved 45.8%)'."""
+    saved = 100 * (before - after) / before if before else 0.0
+    return f"{before / 1e6:.1f} MB -> {after / 1e6:.1f} MB (saved {saved:.1f}%)"
+
+
+def compact_bars(df: pd.DataFrame, price_dtype: str = DEFAULT_PRICE_DTYPE) -> pd.DataFrame:
+    """
+    Normalises a bar frame to compact, fixed dtypes.
+
+    - Price (and other numeric) columns become `price_dtype`; object columns
+      are parsed as numbers first.
+    - `Volume` becomes int64 when every value is integral, float64 otherwise.
+    - The index becomes a naive (UTC) datetime64[ns] index, i.e. int64 epoch
+      nanoseconds rather than strings or Timestamp objects.
+
+    The result is built from one contiguous array per column, so slices of a
+    larger (multi-asset) frame do not keep the parent's memory alive. Works
+    with flat and (Price, Ticker) MultiIndex columns.
+    """
+    if price_dtype not in PRICE_DTYPES:
+        raise ValueError(
+            f"Unknown price dtype '{price_dtype}'. Expected one of: {', '.join(PRICE_DTYPES)}"
+        )
+
+    columns = {}
+    for col in df.columns:
+        name = col[0] if isinstance(col, tuple) else col
+        values = df[col]
+        if values.dtype == object:
+            values = pd.to_numeric(values, errors="coerce")
+        if name == "Volume":
+            array = values.to_numpy(dtype="float64")
+            if np.isfinite(array).all() and np.array_equal(array, np.floor(array)):
+                array = array.astype("int64")
+        else:
+            array = values.to_numpy(dtype=price_dtype)
+        columns[col] = array
+
+    index = df.index
+    if not isinstance(index, pd.DatetimeIndex) or index.tz is not None:
+        index = timestamp_index(index)
+    index = index.as_unit("ns").rename(df.index.name)
+
+    result = pd.DataFrame(columns, index=index)
+    result.columns = df.columns
+    result.attrs = dict(df.attrs)
+    return result
+
+
+def discover_data_files(directory: str) -> list[str]:
+    """
+    Lists the data files in `directory`. When a CSV has a bar store
+    (`.parquet`) sibling, only the store file is returned.
+    """
+    store_files = sorted(glob.glob(os.path.join(directory, f"*{PARQUET_EXTENSION}")))
+    store_stems = {os.path.splitext(path)[0] for path in store_files}
+    csv_files = [
+        path
+        for path in sorted(glob.glob(os.path.join(directory, f"*{CSV_EXTENSION}")))
+        if os.path.splitext(path)[0] not in store_stems
+    ]
+    return csv_files + store_files
+
+
+def is_multi_asset_csv(file_path: str) -> bool:
+    """Checks the header rows for the yfinance (Price/Ticker) multi-asset layout."""
+    with open(file_path) as f:
+        header_line_1 = f.readline()
+        header_line_2 = f.readline()
+    return "Ticker" in header_line_2 or "Price" in header_line_1
+
+
+def _parse_asset_file(file_path: str) -> dict[str, pd.DataFrame]:
+    """Parses a data file into raw per-asset frames, before the quality gate."""
+    asset_name = Path(file_path).stem.split("_")[0]
+
+    if file_path.endswith(PARQUET_EXTENSION):
+        return {asset_name: read_bars(file_path)}
+
+    if is_multi_asset_csv(file_path):
+        full_data = pd.read_csv(file_path, header=[0, 1], index_col=0)
+
+        # Parse the index and the values once for the whole file rather than
+        # per ticker. The stray 'Date' header row has no valid date.
+        timestamps = parse_timestamps(full_data.index)
+        valid = timestamps != NAT_NS
+        full_data = full_data.loc[valid].apply(pd.to_numeric, errors="coerce")
+        full_data.index = from_epoch_ns(timestamps[valid]).rename("date")
+
+        assets = {}
+        tickers = full_data.columns.get_level_values(1).unique().tolist()
+        for ticker in tickers:
+            # Skip tickers that are missing any of the OHLCV columns
+            if any((col, ticker) not in full_data.columns for col in OHLCV_COLUMNS):
+                continue
+            # All-empty rows only pad a ticker to the file's common date range.
+            ticker_data = full_data.xs(ticker, axis=1, level=1)[OHLCV_COLUMNS]
+            assets[ticker] = ticker_data.dropna(how="all")
+        return assets
+
+    # Single Asset File
+    df = pd.read_csv(file_path)
+
+    # Standardize columns
+    df.columns = [col.capitalize() for col in df.columns]
+
+    # Standardize Index (parsed once, straight to naive UTC)
+    if "Date" in df.columns:
+        df.index = timestamp_index(df.pop("Date"))
+    return {asset_name: df}
+
+
+def _read_asset_file(
+    file_path: str, quality_dir: str = DEFAULT_QUALITY_DIR
+) -> dict[str, pd.DataFrame]:
+    """
+    Parses a data file into per-asset frames (see `load_asset_file`) that
+    passed the quality gate, before compaction.
+    """
+    return ensure_quality(file_path, _parse_asset_file(file_path), cache_dir=quality_dir)
+
+
+def load_asset_file(
+    file_path: str,
+    price_dtype: str = DEFAULT_PRICE_DTYPE,
+    quality_dir: str = DEFAULT_QUALITY_DIR,
+) -> dict[str, pd.DataFrame]:
+    """
+    Loads a single data file and normalises it for Backtesting.py.
+
+    - Multi-asset CSVs (Price/Ticker headers) are split into one frame per
+      ticker with numeric OHLCV columns.
+    - Single-asset CSVs get capitalised columns and a `Date` index; the asset
+      name is inferred from the filename (e.g. TSLA_2024_2025.csv -> TSLA).
+    - Bar store files are already typed and indexed and need no parsing.
+
+    Every index is a timezone-naive (UTC) DatetimeIndex and the frames are
+    compacted with `compact_bars`. Each file passes the quality gate of
+    `src.data_quality.ensure_quality` (validated once per file version):
+    out-of-order, duplicate and invalid bars are repaired, and assets with
+    too many bad rows are rejected. The quality reports are cached in
+    `quality_dir`.
+
+    Returns:
+        A dictionary mapping asset names to their DataFrames.
+
+    Raises:
+        DataQualityError: If no asset in the file passes the quality gate.
+    """
+    raw = _read_asset_file(file_path, quality_dir)
+    return {name: compact_bars(df, price_dtype) for name, df in raw.items()}
+
+
+def _load_asset_file_safe(
+    file_path: str,
+    price_dtype: str = DEFAULT_PRICE_DTYPE,
+    quality_dir: str = DEFAULT_QUALITY_DIR,
+) -> tuple[str, dict[str, pd.DataFrame] | None, str, int]:
+    """
+    Pool worker: never raises, so one bad file cannot abort the whole batch.
+    Also returns the memory the parsed frames held before compaction.
+    """
+    try:
+        raw = _read_asset_file(file_path, quality_dir)
+        raw_bytes = sum(frame_nbytes(df) for df in raw.values())
+        assets = {name: compact_bars(df, price_dtype) for name, df in raw.items()}
+        return file_path, assets, "", raw_bytes
+    except Exception as e:
+        return file_path, None, str(e), 0
+
+
+def _make_executor(executor: str, workers: int) -> Executor:
+    if executor == "process":
+        return ProcessPoolExecutor(max_workers=workers)
+    if executor == "thread":
+        return ThreadPoolExecutor(max_workers=workers)
+    raise ValueError(f"Unknown executor '{executor}'. Expected one of: {', '.join(EXECUTORS)}")
+
+
+def load_assets(
+    file_paths: list[str],
+    workers: int | None = None,
+    executor: str = "process",
+    verbose: bool = True,
+    price_dtype: str = DEFAULT_PRICE_DTYPE,
+    quality_dir: str = DEFAULT_QUALITY_DIR,
+) -> dict[str, dict[str, Any]]:
+    """
+    Loads many data files into the benchmark's `assets_map` structure.
+
+    Args:
+        file_paths: The files to load.
+        workers: Number of parallel workers. `None` uses one per CPU; `1` (or a
+                 single file) loads serially in the calling process.
+        executor: "process" for a process pool (CSV parsing is CPU bound and
+                  holds the GIL) or "thread" for a thread pool.
+        verbose: Print one line per loaded asset / failed file, and the
+                 memory saved by compaction.
+        price_dtype: Price precision of the loaded frames (see `compact_bars`).
+        quality_dir: Directory of the cached quality reports (see
+                     `src.data_quality.ensure_quality`).
+
+    Returns:
+        `{asset_name: {"data": DataFrame, "source": filename}}`, in file order.
+        Files that fail to load are reported and skipped.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(file_paths)))
+
+    load = partial(_load_asset_file_safe, price_dtype=price_dtype, quality_dir=quality_dir)
+    if workers == 1:
+        results = [load(path) for path in file_paths]
+    else:
+        with _make_executor(executor, workers) as pool:
+            # map() preserves input order, so the assets_map is deterministic.
+            results = list(pool.map(load, file_paths))
+
+    assets_map: dict[str, dict[str, Any]] = {}
+    raw_bytes = 0
+    for file_path, assets, error, file_raw_bytes in results:
+        raw_bytes += file_raw_bytes
+        source = os.path.basename(file_path)
+        if assets is None:
+            print(f"Error loading {file_path}: {error}")
+            continue
+        for asset_name, df in assets.items():
+            assets_map[asset_name] = {"data": df, "source": source}
+            if verbose:
+                print(f"Loaded {asset_name} from {source}")
+
+    if verbose and assets_map:
+        compact_bytes = sum(frame_nbytes(asset["data"]) for asset in assets_map.values())
+        print(
+            f"Loaded {len(assets_map)} assets as {price_dtype}: "
+            f"{format_memory_saving(raw_bytes, compact_bytes)}"
+        )
+    return assets_map
+
+
+def load_panel(
+    file_paths: list[str],
+    how: str = "outer",
+    workers: int | None = None,
+    executor: str = "process",
+    verbose: bool = True,
+    price_dtype: str = DEFAULT_PRICE_DTYPE,
+    quality_dir: str = DEFAULT_QUALITY_DIR,
+) -> Panel:
+    """
+    Loads many data files straight into an aligned `Panel` of their assets.
+
+    Args:
+        how: "outer" keeps every timestamp (bars an asset lacks are masked),
+             "inner" only the timestamps shared by every asset.
+        Other arguments are passed to `load_assets`.
+    """
+    assets_map = load_assets(
+        file_paths,
+        workers=workers,
+        executor=executor,
+        verbose=verbose,
+        price_dtype=price_dtype,
+        quality_dir=quality_dir,
+    )
+    frames = {name: info["data"] for name, info in assets_map.items()}
+    return Panel.from_frames(frames, how=how, dtype=price_dtype)
@@ -0,0 +1,524 @@
+"""
+Rolling-window and recursive indicator kernels on NumPy arrays.
+
+The single implementation of the moving-window math behind the features in
+`src/feature_engineering.py` and the strategies in `strategies/`. Every
+kernel works along axis 0 of a 1-D `(time,)` or 2-D `(time, series)` float
+array, so one call covers a single ticker or a whole universe, and returns
+an array of the same shape.
+
+Rolling windows are O(n) regardless of the window length: the series is cut
+into blocks of `window` bars, and every window is the suffix of one block
+plus the prefix of the next (van Herk / Gil-Werman). Block prefix and suffix
+aggregates are single vectorised passes:
+
+- sums and means add the two parts. Each part sums at most `window` values,
+  so rounding is that of summing the window directly;
+- variances merge the two parts' `(count, mean, M2)` with the parallel
+  Welford update (Chan et al.). Each block is centred on its own level, so
+  there is no catastrophic cancellation on long price series. Windows of
+  identical values have a variance of exactly 0;
+- minima and maxima take the extreme of the two parts.
+
+A window containing NaN is NaN, and the first `window - 1` rows are NaN
+(pandas `rolling(window)` semantics).
+
+Rounding differs from reducing each slice with NumPy in the last bits. On
+prices that move in whole ticks, two indicators are often equal in exact
+arithmetic, and that last bit decides which one compares greater: neither
+`np.mean` per slice nor these kernels resolve such ties consistently. Signal
+code that compares indicators with each other or with prices therefore
+applies `snap_ties` first, so exact-arithmetic ties compare equal.
+
+EMA and Wilder smoothing are first-order recursions, solved a block of bars
+at a time with one matrix product rather than a Python loop over bars.
+
+`STREAMING` maps kernels to their streaming counterparts, which take one
+value at a time and update in O(1) (see `StreamingFeatureEngineer`). Fed the
+same series, they return the kernel's values to float rounding.
+"""
+
+import math
+from collections import deque
+
+import numpy as np
+
+
+def _as_float(values: np.ndarray) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim not in (1, 2):
+        raise ValueError(f"Expected a 1-D or 2-D array, got {values.ndim} dimensions")
+    return values
+
+
+def _columns(values: np.ndarray) -> np.ndarray:
+    """`values` as a 2-D `(time, series)` array."""
+    return values[:, np.newaxis] if values.ndim == 1 else values
+
+
+def _check_window(window: int) -> None:
+    if window < 1:
+        raise ValueError(f"Window must be at least 1, got {window}")
+
+
+def _blocks(values: np.ndarray, window: int) -> np.ndarray:
+    """`values` padded with NaN to whole blocks, as `(blocks, window, ...)`."""
+    pad = -len(values) % window
+    if pad:
+        filler = np.full((pad,) + values.shape[1:], np.nan)
+        values = np.concatenate([values, filler])
+    return values.reshape((-1, window) + values.shape[1:])
+
+
+def _unblock(blocks: np.ndarray, n: int) -> np.ndarray:
+    return blocks.reshape((-1,) + blocks.shape[2:])[:n]
+
+
+def _prefix_suffix(blocks: np.ndarray, op: np.ufunc, n: int) -> tuple[np.ndarray, np.ndarray]:
+    """Running `op` from each block's start, and to each block's end."""
+    prefix = op.accumulate(blocks, axis=1)
+    suffix = op.accumulate(blocks[:, ::-1], axis=1)[:, ::-1]
+    return _unblock(prefix, n), _unblock(suffix, n)
+
+
+def _windows(prefix: np.ndarray, suffix: np.ndarray, window: int, combine) -> np.ndarray:
+    """
+    Combines the suffix starting at each window's first row with the prefix
+    ending at its last row. A window that is exactly one block is the prefix.
+    """
+    out = np.full(prefix.shape, np.nan)
+    if len(prefix) >= window:
+        out[window - 1 :] = combine(suffix[: len(prefix) - window + 1], prefix[window - 1 :])
+        out[window - 1 :: window] = prefix[window - 1 :: window]
+    return out
+
+
+def rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """Sum over the trailing `window` rows."""
+    _check_window(window)
+    values = _as_float(values)
+    prefix, suffix = _prefix_suffix(_blocks(values, window), np.add, len(values))
+    return _windows(prefix, suffix, window, np.add)
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Simple moving average over the trailing `window` rows."""
+    return rolling_sum(values, window) / window
+
+
+def rolling_min(values: np.ndarray, window: int) -> np.ndarray:
+    """Minimum over the trailing `window` rows."""
+    _check_window(window)
+    values = _as_float(values)
+    prefix, suffix = _prefix_suffix(_blocks(values, window), np.minimum, len(values))
+    return _windows(prefix, suffix, window, np.minimum)
+
+
+def rolling_max(values: np.ndarray, window: int) -> np.ndarray:
+    """Maximum over the trailing `window` rows."""
+    _check_window(window)
+    values = _as_float(values)
+    prefix, suffix = _prefix_suffix(_blocks(values, window), np.maximum, len(values))
+    return _windows(prefix, suffix, window, np.maximum)
+
+
+def rolling_var(values: np.ndarray, window: int, ddof: int = 1) -> np.ndarray:
+    """
+    Variance over the trailing `window` rows.
+
+    Args:
+        ddof: Delta degrees of freedom: 1 for the sample variance (pandas
+              `rolling().var()`), 0 for the population variance (`np.var`).
+    """
+    _check_window(window)
+    if window <= ddof:
+        raise ValueError(f"Window {window} is too short for ddof={ddof}")
+    values = _as_float(values)
+    n = len(values)
+    m2 = np.full(values.shape, np.nan)
+    if n < window:
+        return m2
+    blocks = _blocks(values, window)
+
+    # Centre each block on its own level (NaN-skipping max; 0 for all-NaN
+    # blocks, whose windows are NaN anyway).
+    reference = np.fmax.reduce(blocks, axis=1)
+    reference[np.isnan(reference)] = 0.0
+    deviations = blocks - reference[:, np.newaxis]
+    sums = np.add.accumulate(deviations, axis=1)
+    squares = np.add.accumulate(deviations * deviations, axis=1)
+    sums_suffix = np.add.accumulate(deviations[:, ::-1], axis=1)[:, ::-1]
+    deviations *= deviations
+    squares_suffix = np.add.accumulate(deviations[:, ::-1], axis=1)[:, ::-1]
+
+    # The window ending at row j of block k is the suffix of block k-1 from
+    # row j+1 (a) and the prefix of block k up to row j (b): merge their
+    # (count, mean, M2) with Chan et al.'s update.
+    count_b = np.arange(1.0, window)
+    count_a = window - count_b
+    if values.ndim == 2:
+        count_a, count_b = count_a[:, np.newaxis], count_b[:, np.newaxis]
+    sum_a, sum_b = sums_suffix[:-1, 1:], sums[1:, :-1]
+    m2_a = squares_suffix[:-1, 1:] - sum_a * sum_a / count_a
+    m2_b = squares[1:, :-1] - sum_b * sum_b / count_b
+    delta = (reference[1:] - reference[:-1])[:, np.newaxis] + sum_b / count_b - sum_a / count_a
+
+    merged = np.empty(blocks.shape)
+    merged[0, :-1] = np.nan
+    merged[1:, :-1] = m2_a + m2_b + delta * delta * (count_a * count_b / window)
+    # Windows that are exactly one block.
+    merged[:, -1] = squares[:, -1] - sums[:, -1] * sums[:, -1] / window
+    m2 = _unblock(merged, n)
+
+    # A window is constant when no value in it differs from the previous one.
+    if window > 1:
+        changes = np.zeros(values.shape)
+        changes[1:] = values[1:] != values[:-1]
+        constant = rolling_sum(changes, window - 1) == 0
+        constant[: window - 1] = False
+        m2[constant] = 0.0
+    return np.maximum(m2, 0.0) / (window - ddof)
+
+
+def rolling_std(values: np.ndarray, window: int, ddof: int = 1) -> np.ndarray:
+    """Standard deviation over the trailing `window` rows (see `rolling_var`)."""
+    return np.sqrt(rolling_var(values, window, ddof))
+
+
+# Relative difference under which two indicator values are taken as equal:
+# far above the rounding of the kernels (~1e-15), far below a price tick.
+TIE_RTOL = 1e-9
+
+
+def snap_ties(values: np.ndarray, reference, rtol: float = TIE_RTOL) -> np.ndarray:
+    """
+    `values`, with every value within `rtol` (relative) of `reference`
+    replaced by `reference`, so comparisons of the two treat rounding-level
+    differences as ties. `reference` is an array of the same shape or a scalar
+    (e.g. a threshold); NaN stays NaN.
+    """
+    values = _as_float(values)
+    reference = np.broadcast_to(np.asarray(reference, dtype=np.float64), values.shape)
+    scale = np.maximum(np.abs(values), np.abs(reference))
+    return np.where(np.abs(values - reference) <= rtol * scale, reference, values)
+
+
+# Rows per block of the blocked exponential smoothing below.
+SMOOTHING_BLOCK = 32
+
+
+def _powers(base: float, exponents: np.ndarray) -> np.ndarray:
+    """`base ** exponents`, flushing subnormal results (slow in BLAS) to 0."""
+    powers = base ** np.asarray(exponents, dtype=np.float64)
+    powers[powers < np.finfo(np.float64).tiny] = 0.0
+    return powers
+
+
+def _recurrence(inputs: np.ndarray, decay: float) -> np.ndarray:
+    """
+    `y[t] = decay * y[t-1] + inputs[t]` down each column, from `y[-1] = 0`.
+
+    Within a block the recurrence is a lower-triangular matrix product, and
+    the value carried from block to block is the same recurrence over the
+    block ends (with `decay ** block`), so no step runs in a Python loop.
+    """
+    n = len(inputs)
+    block = min(SMOOTHING_BLOCK, n)
+    steps = np.arange(block)
+    lags = steps[:, np.newaxis] - steps
+    response = np.where(lags >= 0, _powers(decay, np.maximum(lags, 0)), 0.0)
+    if n <= block:
+        return response @ inputs
+
+    blocks = np.nan_to_num(_blocks(inputs, block))
+    count, _, width = blocks.shape
+    # One matrix product for every block: (block, block) @ (block, blocks * width).
+    local = response @ blocks.transpose(1, 0, 2).reshape(block, -1)
+    local = local.reshape(block, count, width).transpose(1, 0, 2)
+    ends = _recurrence(local[:, -1], decay**block)
+    local[1:] += _powers(decay, steps + 1.0)[:, np.newaxis] * ends[:-1, np.newaxis]
+    return _unblock(local, n)
+
+
+def _smooth_gaps(
+    values: np.ndarray, alpha: float, start: np.ndarray, seed: np.ndarray
+) -> np.ndarray:
+    """Bar-by-bar `_smooth`, for series with NaN gaps."""
+    decay = 1.0 - alpha
+    out = np.full(values.shape, np.nan)
+    value = np.full(values.shape[1], np.nan)
+    old_weight = np.ones(values.shape[1])
+    for i in range(int(start.min(initial=len(values))), len(values)):
+        x = values[i]
+        active = i > start
+        old_weight = np.where(active, old_weight * decay, old_weight)
+        update = active & ~np.isnan(x)
+        blended = (old_weight * value + alpha * x) / (old_weight + alpha)
+        value = np.where(update & (value != x), blended, value)
+        value = np.where(i == start, seed, value)
+        old_weight = np.where(update, 1.0, old_weight)
+        out[i] = value
+    return out
+
+
+def _smooth(values: np.ndarray, alpha: float, start: np.ndarray, seed: np.ndarray) -> np.ndarray:
+    """
+    Exponential smoothing `y[t] = (1 - alpha) * y[t-1] + alpha * x[t]` of each
+    column of `values`, starting from `seed` at row `start` (NaN before it).
+
+    A NaN input holds the last value, and the next valid input is blended
+    with the weight of the whole gap, like pandas `ewm(adjust=False)`.
+
+    Series without gaps are solved in blocks (`_recurrence`) instead of bar by
+    bar.
+    """
+    n, width = values.shape
+    if not n:
+        return np.full(values.shape, np.nan)
+    start = np.broadcast_to(start, (width,))
+    seed = np.broadcast_to(seed, (width,))
+    rows = np.arange(n)[:, np.newaxis]
+    valid = ~np.isnan(values)
+    last = np.where(valid.any(axis=0), n - 1 - valid[::-1].argmax(axis=0), -1)
+    observed = (rows >= start) & (rows <= last)
+    if not np.array_equal(observed, valid & (rows >= start)):
+        return _smooth_gaps(values, alpha, start, seed)
+
+    # pandas divides by (1 - alpha) + alpha, which is not always exactly 1.
+    decay = (1.0 - alpha) / ((1.0 - alpha) + alpha)
+    gain = alpha / ((1.0 - alpha) + alpha)
+    inputs = np.where(observed & (rows > start), gain * values, 0.0)
+    started = np.flatnonzero(start < n)
+    inputs[start[started], started] = seed[started]
+    out = _recurrence(inputs, decay)
+
+    out[rows < start] = np.nan
+    # After a series' last value, hold it.
+    held = (rows > last) & (last >= start)
+    if held.any():
+        out = np.where(held, np.take_along_axis(out, np.maximum(last, 0)[np.newaxis], axis=0), out)
+    return out
+
+
+def _first_valid(values: np.ndarray) -> np.ndarray:
+    """Row of each series' first non-NaN value (`len(values)` if none)."""
+    valid = ~np.isnan(values)
+    if not len(values):
+        return np.zeros(values.shape[1:], dtype=np.intp)
+    return np.where(valid.any(axis=0), valid.argmax(axis=0), len(values))
+
+
+def _at_rows(values: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """`values[rows[j], j]` for each series `j` (NaN past the end)."""
+    if not len(values):
+        return np.full(values.shape[1:], np.nan)
+    clipped = np.minimum(rows, len(values) - 1)
+    if values.ndim == 1:
+        return values[clipped]
+    return np.take_along_axis(values, clipped[np.newaxis], axis=0)[0]
+
+
+def ema(values: np.ndarray, span: int) -> np.ndarray:
+    """
+    Exponential moving average with `alpha = 2 / (span + 1)`, started at each
+    series' first value (pandas `ewm(span=span, adjust=False).mean()`).
+    """
+    if span < 1:
+        raise ValueError(f"Span must be at least 1, got {span}")
+    values = _as_float(values)
+    start = _first_valid(values)
+    smoothed = _smooth(_columns(values), 2.0 / (span + 1.0), start, _at_rows(values, start))
+    return smoothed.reshape(values.shape)
+
+
+def wilder(values: np.ndarray, period: int) -> np.ndarray:
+    """
+    Wilder's smoothing (`alpha = 1 / period`), as used by RSI and ATR: seeded
+    with the simple mean of the first `period` values of each series.
+    """
+    _check_window(period)
+    values = _as_float(values)
+    start = _first_valid(values) + period - 1
+    seed = _at_rows(rolling_mean(values, period), start)
+    return _smooth(_columns(values), 1.0 / period, start, seed).reshape(values.shape)
+
+
+# --- Streaming counterparts (one value at a time) ---
+
+
+class RollingSumStream:
+    """
+    `rolling_sum` one value at a time. NaN until the window holds `window`
+    values, and while it contains a NaN.
+
+    The running sum is re-summed exactly once per `window` updates, so float
+    error does not accumulate over long streams (amortised O(1)).
+    """
+
+    def __init__(self, window: int) -> None:
+        _check_window(window)
+        self.window = window
+        self.values: deque[float] = deque()
+        self.total = 0.0
+        self.valid = 0
+        self.since_resync = 0
+
+    def update(self, value: float) -> float:
+        self.values.append(value)
+        if not math.isnan(value):
+            self.total += value
+            self.valid += 1
+        if len(self.values) > self.window:
+            old = self.values.popleft()
+            if not math.isnan(old):
+                self.total -= old
+                self.valid -= 1
+        self.since_resync += 1
+        if self.since_resync >= self.window:
+            self.total = math.fsum(v for v in self.values if not math.isnan(v))
+            self.since_resync = 0
+        if self.valid < self.window:
+            return math.nan
+        return self.total
+
+
+class RollingMeanStream(RollingSumStream):
+    """`rolling_mean` one value at a time."""
+
+    def update(self, value: float) -> float:
+        return super().update(value) / self.window
+
+
+class RollingVarStream:
+    """
+    `rolling_var` one value at a time, with Welford's algorithm for a sliding
+    window. Windows of identical values have a variance of exactly 0.
+    """
+
+    def __init__(self, window: int, ddof: int = 1) -> None:
+        _check_window(window)
+        if window <= ddof:
+            raise ValueError(f"Window {window} is too short for ddof={ddof}")
+        self.window = window
+        self.ddof = ddof
+        self.values: deque[float] = deque()
+        self.nan_count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.since_resync = 0
+        self.same_run = 0
+
+    def _resync(self) -> None:
+        valid = [v for v in self.values if not math.isnan(v)]
+        self.mean = math.fsum(valid) / len(valid) if valid else 0.0
+        self.m2 = math.fsum((v - self.mean) ** 2 for v in valid)
+        self.since_resync = 0
+
+    def update(self, value: float) -> float:
+        self.values.append(value)
+        old = self.values.popleft() if len(self.values) > self.window else None
+        self.nan_count += math.isnan(value) - (old is not None and math.isnan(old))
+        self.since_resync += 1
+        previous = self.values[-2] if len(self.values) > 1 else math.nan
+        self.same_run = self.same_run + 1 if value == previous else 1
+
+        if math.isnan(value) or (old is not None and math.isnan(old)):
+            self._resync()
+        elif old is None:
+            delta = value - self.mean
+            self.mean += delta / len(self.values)
+            self.m2 += delta * (value - self.mean)
+        else:
+            previous_mean = self.mean
+            self.mean += (value - old) / self.window
+            self.m2 += (value - old) * (value - self.mean + old - previous_mean)
+        if self.since_resync >= self.window:
+            self._resync()
+
+        if len(self.values) < self.window or self.nan_count:
+            return math.nan
+        if self.same_run >= self.window:
+            self.mean, self.m2 = value, 0.0
+        return max(self.m2, 0.0) / (self.window - self.ddof)
+
+
+class RollingStdStream(RollingVarStream):
+    """`rolling_std` one value at a time."""
+
+    def update(self, value: float) -> float:
+        return math.sqrt(super().update(value))
+
+
+class RollingMaxStream:
+    """
+    `rolling_max` one value at a time, with a monotonic deque: each value is
+    pushed and popped at most once (amortised O(1)).
+    """
+
+    maximum = True
+
+    def __init__(self, window: int) -> None:
+        _check_window(window)
+        self.window = window
+        self.candidates: deque[tuple[int, float]] = deque()
+        self.count = 0
+        self.last_nan = -window
+
+    def update(self, value: float) -> float:
+        i = self.count
+        self.count += 1
+        if math.isnan(value):
+            self.last_nan = i
+        else:
+            while self.candidates and (
+                self.candidates[-1][1] <= value if self.maximum else self.candidates[-1][1] >= value
+            ):
+                self.candidates.pop()
+            self.candidates.append((i, value))
+        while self.candidates and self.candidates[0][0] <= i - self.window:
+            self.candidates.popleft()
+        if self.count < self.window or i - self.last_nan < self.window:
+            return math.nan
+        return self.candidates[0][1]
+
+
+class RollingMinStream(RollingMaxStream):
+    """`rolling_min` one value at a time."""
+
+    maximum = False
+
+
+class EMAStream:
+    """`ema` one value at a time, including its handling of NaN gaps."""
+
+    def __init__(self, span: int) -> None:
+        if span < 1:
+            raise ValueError(f"Span must be at least 1, got {span}")
+        self.alpha = 2.0 / (span + 1.0)
+        self.value = math.nan
+        self.old_weight = 1.0
+
+    def update(self, value: float) -> float:
+        if math.isnan(self.value):
+            if not math.isnan(value):
+                self.value = value
+            return self.value
+        self.old_weight *= 1.0 - self.alpha
+        if not math.isnan(value):
+            if self.value != value:
+                self.value = (self.old_weight * self.value + self.alpha * value) / (
+                    self.old_weight + self.alpha
+                )
+            self.old_weight = 1.0
+        return self.value
+
+
+STREAMING = {
+    rolling_sum: RollingSumStream,
+    rolling_mean: RollingMeanStream,
+    rolling_var: RollingVarStream,
+    rolling_std: RollingStdStream,
+    rolling_min: RollingMinStream,
+    rolling_max: RollingMaxStream,
+    ema: EMAStream,
+}
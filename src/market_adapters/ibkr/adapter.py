@@ -1,12 +1,21 @@
 # src/market_adapters/ibkr/adapter.py
+import asyncio
+import logging
 from typing import Any
 
+from ib_insync import util
+
 from src.interfaces import IMarketAdapter
 
 from .connection import IBConnection
+from .contracts import DEFAULT_CONTRACT_TTL_SECONDS, ContractCache
 from .data_loader import IBKRDataLoader
 from .execution import IBKRExecutionHandler
 
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONTRACT_REFRESH_SECONDS = 60 * 60
+
 
 class IBKRMarketAdapter(IMarketAdapter):
     """
@@ -16,14 +25,80 @@ class IBKRMarketAdapter(IMarketAdapter):
     execution handling components into a single, cohesive unit.
     """
 
-    def __init__(self, **connection_params: Any) -> None:
+    def __init__(
+        self,
+        contract_cache_path: str | None = None,
+        contract_ttl_seconds: float = DEFAULT_CONTRACT_TTL_SECONDS,
+        contract_refresh_seconds: float | None = DEFAULT_CONTRACT_REFRESH_SECONDS,
+        **connection_params: Any,
+    ) -> None:
         """
         Initializes the adapter and its components.
 
         Args:
+            contract_cache_path: Optional JSON file that persists qualified
+                                 contracts across restarts.
+            contract_ttl_seconds: How long a qualified contract stays fresh.
+            contract_refresh_seconds: Interval of the background refresh of
+                                      expired contracts while connected
+                                      (`None` refreshes on connect only).
             **connection_params: Connection parameters for IBConnection
                                  (e.g., host, port, client_id).
         """
         self.connection = IBConnection(**connection_params)
-        self.data_loader = IBKRDataLoader(self.connection)
-        self.execution_handler = IBKRExecutionHandler(self.connection)
+        # One contract cache shared by data loading and order execution.
+        self.contract_cache = ContractCache(
+            self.connection.ib, ttl_seconds=contract_ttl_seconds, path=contract_cache_path
+        )
+        self.data_loader = IBKRDataLoader(self.connection, self.contract_cache)
+        self.execution_handler = IBKRExecutionHandler(self.connection, self.contract_cache)
+        self.contract_refresh_seconds = contract_refresh_seconds
+        self._refresh_timer: asyncio.TimerHandle | None = None
+
+    def connect(self, **kwargs: Any) -> None:
+        """
+        Connects to IB, then re-qualifies the cached contracts that expired
+        (e.g. persisted ones that aged while the process was down) and starts
+        the refresh timer, so orders never wait on a re-qualification.
+        """
+        self.connection.connect(**kwargs)
+        refreshed = self.contract_cache.refresh_stale()
+        if refreshed:
+            logger.info(f"Refreshed {refreshed} stale contract(s).")
+        self._schedule_contract_refresh()
+
+    def disconnect(self) -> None:
+        """Stops the refresh timer and disconnects from IB."""
+        if self._refresh_timer is not None:
+            self._refresh_timer.cancel()
+            self._refresh_timer = None
+        self.connection.disconnect()
+
+    def _schedule_contract_refresh(self) -> None:
+        if self.contract_refresh_seconds is None or self._refresh_timer is not None:
+            return
+        self._refresh_timer = util.getLoop().call_later(
+            self.contract_refresh_seconds, self._refresh_contracts
+        )
+
+    def _refresh_contracts(self) -> None:
+        """Timer callback: refreshes expired contracts as a task on the IB event loop."""
+        self._refresh_timer = None
+        if not self.connection.is_connected():
+            # `connect` restarts the timer.
+            return
+        task = asyncio.ensure_future(self.contract_cache.refresh_stale_async())
+        task.add_done_callback(self._log_refresh)
+        self._schedule_contract_refresh()
+
+    @staticmethod
+    def _log_refresh(task: "asyncio.Future[int]") -> None:
+        if not task.cancelled() and task.result():
+            logger.info(f"Refreshed {task.result()} stale contract(s).")
+
+    def prequalify(self, symbols: list[str], **contract_params: Any) -> dict[str, Any]:
+        """
+        Qualifies a symbol universe in one request (call after connecting), so
+        later data requests and orders for these symbols skip the round-trip.
+        """
+        return self.contract_cache.prequalify(symbols, **contract_params)
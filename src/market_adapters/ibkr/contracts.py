@@ -0,0 +1,246 @@
+# src/market_adapters/ibkr/contracts.py
+"""
+Contract qualification cache for the IBKR adapter.
+
+Qualifying a contract is a full gateway round-trip. `ContractCache` keeps
+qualified contracts keyed by (symbol, security type, exchange, currency) with
+a time-to-live, optionally persists them to a JSON file so they survive
+restarts, and can pre-qualify a whole symbol universe in one request at
+startup. One instance is owned by `IBKRMarketAdapter` and shared by its data
+loader and execution handler, which both default to `DEFAULT_EXCHANGE` so that
+they look up the same entries. Expired entries are refreshed in bulk by the
+adapter (on connect and on a timer), never on the order path.
+"""
+
+import dataclasses
+import json
+import logging
+import os
+import time
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from ib_insync import Contract
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONTRACT_TTL_SECONDS = 24 * 60 * 60
+# A contract whose refresh failed is not retried before this has elapsed.
+DEFAULT_RETRY_SECONDS = 5 * 60
+# IB's smart router; the default exchange for contracts, data and orders alike.
+DEFAULT_EXCHANGE = "SMART"
+
+
+class ContractCache:
+    """
+    Caches qualified IB contracts.
+
+    Entries older than `ttl_seconds` are re-qualified on lookup, except when
+    the caller passes `allow_stale=True` (the order path), which returns the
+    cached contract immediately and leaves the refresh to `refresh_stale`
+    (run by `IBKRMarketAdapter.connect` and its refresh timer).
+
+    A cached entry whose re-qualification failed keeps being served and is
+    not retried until `retry_seconds` have passed, so an unreachable gateway
+    or a delisted symbol costs one failed request per interval.
+    """
+
+    def __init__(
+        self,
+        ib: Any,
+        ttl_seconds: float = DEFAULT_CONTRACT_TTL_SECONDS,
+        path: str | None = None,
+        clock: Callable[[], float] = time.time,
+        retry_seconds: float = DEFAULT_RETRY_SECONDS,
+    ) -> None:
+        """
+        Args:
+            ib: The `ib_insync.IB` instance used for qualification.
+            ttl_seconds: How long a qualified contract is considered fresh.
+            path: Optional JSON file the cache is loaded from and saved to.
+            clock: Time source (seconds), injectable for tests.
+            retry_seconds: Back-off before a failed refresh is attempted again.
+        """
+        self.ib = ib
+        self.ttl_seconds = ttl_seconds
+        self.retry_seconds = retry_seconds
+        self.path = path
+        self._clock = clock
+        # { key: (qualified_at, contract) }
+        self._entries: dict[str, tuple[float, Contract]] = {}
+        # { key: time of the last failed qualification }
+        self._failed_at: dict[str, float] = {}
+        if path:
+            self.load()
+
+    @staticmethod
+    def key(symbol: str, sec_type: str, exchange: str, currency: str) -> str:
+        return f"{symbol}:{sec_type}:{exchange}:{currency}"
+
+    def _is_fresh(self, qualified_at: float) -> bool:
+        return self._clock() - qualified_at < self.ttl_seconds
+
+    def _backing_off(self, key: str) -> bool:
+        failed_at = self._failed_at.get(key)
+        return failed_at is not None and self._clock() - failed_at < self.retry_seconds
+
+    def get(
+        self,
+        symbol: str,
+        sec_type: str = "STK",
+        exchange: str = DEFAULT_EXCHANGE,
+        currency: str = "USD",
+        allow_stale: bool = False,
+    ) -> Contract | None:
+        """
+        Returns the qualified contract, qualifying it with IB only when it is
+        not cached (or stale and `allow_stale` is False).
+        """
+        key = self.key(symbol, sec_type, exchange, currency)
+        cached = self._entries.get(key)
+        if cached is not None and (
+            allow_stale or self._is_fresh(cached[0]) or self._backing_off(key)
+        ):
+            return cached[1]
+
+        qualified = self._qualify(
+            [Contract(symbol=symbol, secType=sec_type, exchange=exchange, currency=currency)]
+        )
+        if key in qualified:
+            return qualified[key]
+        # Fall back to a stale entry rather than failing when IB is unavailable.
+        return cached[1] if cached is not None else None
+
+    def prequalify(
+        self,
+        symbols: Iterable[str],
+        sec_type: str = "STK",
+        exchange: str = DEFAULT_EXCHANGE,
+        currency: str = "USD",
+    ) -> dict[str, Contract]:
+        """
+        Qualifies every symbol that is not already fresh in the cache in a
+        single `qualifyContracts` call.
+
+        Returns:
+            `{symbol: contract}` for every symbol that is cached afterwards.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        missing = [
+            Contract(symbol=symbol, secType=sec_type, exchange=exchange, currency=currency)
+            for symbol in symbols
+            if not self._fresh_entry(self.key(symbol, sec_type, exchange, currency))
+        ]
+        if missing:
+            self._qualify(missing)
+            logger.info(f"Pre-qualified {len(missing)} contract(s).")
+
+        result = {}
+        for symbol in symbols:
+            cached = self._entries.get(self.key(symbol, sec_type, exchange, currency))
+            if cached is not None:
+                result[symbol] = cached[1]
+        return result
+
+    def refresh_stale(self) -> int:
+        """
+        Re-qualifies every expired entry that is not backing off from a
+        failure, in one request. Returns the number refreshed.
+        """
+        stale = self._stale_requests()
+        return len(self._qualify(stale)) if stale else 0
+
+    async def refresh_stale_async(self) -> int:
+        """`refresh_stale` for callers running on the IB event loop (the refresh timer)."""
+        stale = self._stale_requests()
+        if not stale:
+            return 0
+        keys = [self._contract_key(contract) for contract in stale]
+        try:
+            await self.ib.qualifyContractsAsync(*stale)
+        except Exception as e:
+            logger.error(f"Error refreshing contracts: {e}")
+            self._record_failures(keys)
+            return 0
+        return len(self._store_qualified(keys, stale))
+
+    def _stale_requests(self) -> list[Contract]:
+        return [
+            Contract(
+                symbol=contract.symbol,
+                secType=contract.secType,
+                exchange=contract.exchange,
+                currency=contract.currency,
+            )
+            for key, (at, contract) in self._entries.items()
+            if not self._is_fresh(at) and not self._backing_off(key)
+        ]
+
+    def _fresh_entry(self, key: str) -> bool:
+        cached = self._entries.get(key)
+        return cached is not None and self._is_fresh(cached[0])
+
+    @classmethod
+    def _contract_key(cls, contract: Contract) -> str:
+        return cls.key(contract.symbol, contract.secType, contract.exchange, contract.currency)
+
+    def _qualify(self, contracts: list[Contract]) -> dict[str, Contract]:
+        """Qualifies `contracts` with IB, caches the successes and returns them by key."""
+        keys = [self._contract_key(contract) for contract in contracts]
+        try:
+            self.ib.qualifyContracts(*contracts)
+        except Exception as e:
+            logger.error(f"Error qualifying contracts: {e}")
+            self._record_failures(keys)
+            return {}
+        return self._store_qualified(keys, contracts)
+
+    def _record_failures(self, keys: list[str]) -> None:
+        now = self._clock()
+        for key in keys:
+            self._failed_at[key] = now
+
+    def _store_qualified(self, keys: list[str], contracts: list[Contract]) -> dict[str, Contract]:
+        """Caches the contracts IB resolved and records the others as failed."""
+        now = self._clock()
+        qualified = {}
+        # qualifyContracts fills in conId in place; unresolved contracts keep 0.
+        for key, contract in zip(keys, contracts, strict=True):
+            if contract.conId:
+                self._entries[key] = (now, contract)
+                self._failed_at.pop(key, None)
+                qualified[key] = contract
+            else:
+                self._failed_at[key] = now
+                logger.warning(f"No contract details found for {contract.symbol}")
+        if qualified and self.path:
+            self.save()
+        return qualified
+
+    def load(self) -> None:
+        """Loads persisted entries from `path` (missing or corrupt files are ignored)."""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path) as f:
+                raw = json.load(f)
+            for key, entry in raw.items():
+                self._entries[key] = (entry["qualified_at"], Contract.create(**entry["contract"]))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable contract cache {self.path}: {e}")
+
+    def save(self) -> None:
+        """Writes the cache to `path` atomically."""
+        if not self.path:
+            return
+        raw = {
+            key: {"qualified_at": at, "contract": dataclasses.asdict(contract)}
+            for key, (at, contract) in self._entries.items()
+        }
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(raw, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
@@ -2,10 +2,18 @@ import logging
 from typing import Any
 
 import pandas as pd
-from ib_insync import BarData, Contract
+from ib_insync import Contract
 
+from src.corporate_actions import DEFAULT_ACTIONS_PATH, actions_for, adjust_bars, load_actions
 from src.interfaces import IDataLoader
 from src.market_adapters.ibkr.connection import IBConnection
+from src.market_adapters.ibkr.contracts import DEFAULT_EXCHANGE, ContractCache
+from src.market_adapters.ibkr.history import (
+    DEFAULT_MAX_CONCURRENT,
+    TokenBucket,
+    fetch_history,
+    plan_requests,
+)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -18,38 +26,37 @@ class IBKRDataLoader(IDataLoader):
     IBConnection.
     """
 
-    def __init__(self, ib_connection: IBConnection) -> None:
+    def __init__(
+        self, ib_connection: IBConnection, contract_cache: ContractCache | None = None
+    ) -> None:
         """
         Initializes the DataLoader with an IBConnection instance.
 
         Args:
             ib_connection (IBConnection): An active IBConnection instance.
+            contract_cache (ContractCache, optional): Shared contract cache; a
+                private one is created if omitted.
         """
         if not isinstance(ib_connection, IBConnection):
             raise TypeError("ib_connection must be an instance of IBConnection")
         self.ib_connection = ib_connection
         self.ib = ib_connection.ib
+        self.contracts = contract_cache or ContractCache(self.ib)
+        # Shared by every request from this loader so IB's pacing limits hold
+        # across calls, not just within one.
+        self.pacing = TokenBucket()
         logging.info("IBKRDataLoader initialized.")
 
     def create_contract(
         self, symbol: str, sec_type: str, exchange: str, currency: str
     ) -> Contract | None:
         """
-        Creates and qualifies an IB Contract object.
+        Returns a qualified IB Contract object from the contract cache.
         """
-        contract = Contract(symbol=symbol, secType=sec_type, exchange=exchange, currency=currency)
-        logging.info(f"Attempting to qualify contract: {contract}")
-        try:
-            qualified_contracts = self.ib.qualifyContracts(contract)
-            if not qualified_contracts:
-                logging.warning(f"No contract details found for {symbol}")
-                return None
-            qualified_contract = qualified_contracts[0]
-            logging.info(f"Qualified contract: {qualified_contract.localSymbol}")
-            return qualified_contract
-        except Exception as e:
-            logging.error(f"Error qualifying contract for {symbol}: {e}")
-            return None
+        contract = self.contracts.get(symbol, sec_type, exchange, currency)
+        if contract is not None:
+            logging.info(f"Qualified contract: {contract.localSymbol or contract.symbol}")
+        return contract
 
     def get_historical_data(
         self,
@@ -58,56 +65,79 @@ class IBKRDataLoader(IDataLoader):
         start: str,
         end: str,
         sec_type: str = "STK",
-        exchange: str = "ARCA",
+        exchange: str = DEFAULT_EXCHANGE,
         currency: str = "USD",
         **kwargs: Any,
     ) -> pd.DataFrame:
         """
         Fetches historical market data for a given symbol.
         This method implements the IDataLoader interface.
+
+        `[start, end]` is split into chunks sized for the bar size
+        (`timeframe`, e.g. '1 min' or '1 day'), which are requested
+        concurrently under IB's pacing limits and stitched together. An empty
+        `end` means now; an empty `start` fetches one year.
+
+        Keyword Args:
+            max_concurrent (int): Maximum requests in flight at once.
+            what_to_show (str): IB data type (default 'TRADES').
+            use_rth (bool): Restrict to regular trading hours (default True).
+            adjust (bool): Back-adjust the raw bars for the splits and
+                dividends in the local corporate action table (default False).
+            actions_path (str): Corporate action table used by `adjust`.
+
+        Returns:
+            OHLCV DataFrame indexed by a naive (UTC) `Date` index, empty on failure.
         """
         if not self.ib_connection.is_connected():
             logging.error("IB not connected. Cannot fetch historical data.")
             return pd.DataFrame()
 
+        try:
+            requests = plan_requests(start, end, timeframe)
+        except ValueError as e:
+            logging.error(f"Cannot plan historical request for {symbol}: {e}")
+            return pd.DataFrame()
+
         contract = self.create_contract(symbol, sec_type, exchange, currency)
         if not contract:
             return pd.DataFrame()
 
-        # Note: This is a simplified mapping. A robust implementation would
-        # need a more sophisticated way to handle duration and bar size based
-        # on the 'start' and 'end' dates and the 'timeframe'.
-        # For now, we use placeholder values for demonstration.
-        duration_str = "1 Y"  # Placeholder
-        bar_size_setting = timeframe  # e.g., '1 day', '1 hour'
-
+        logging.info(f"Fetching {symbol} {timeframe} bars in {len(requests)} request(s).")
         try:
-            bars: list[BarData] = self.ib.reqHistoricalData(
-                contract,
-                endDateTime=end,
-                durationStr=duration_str,
-                barSizeSetting=bar_size_setting,
-                whatToShow="TRADES",
-                useRTH=True,
-                formatDate=1,
+            df = self.ib.run(
+                fetch_history(
+                    self.ib,
+                    contract,
+                    requests,
+                    bar_size=timeframe,
+                    bucket=self.pacing,
+                    max_concurrent=kwargs.get("max_concurrent", DEFAULT_MAX_CONCURRENT),
+                    what_to_show=kwargs.get("what_to_show", "TRADES"),
+                    use_rth=kwargs.get("use_rth", True),
+                )
             )
-
-            if not bars:
-                logging.warning(f"No historical data returned for {symbol}")
-                return pd.DataFrame()
-
-            df = pd.DataFrame([b.__dict__ for b in bars])
-            df["date"] = pd.to_datetime(df["date"])
-            df = df.set_index("date")
-            df = df[["open", "high", "low", "close", "volume"]]
-            df.columns = ["Open", "High", "Low", "Close", "Volume"]
-            logging.info(f"Successfully fetched {len(df)} bars for {symbol}.")
-            return df
-
         except Exception as e:
             logging.error(f"Error fetching historical data for {symbol}: {e}")
             return pd.DataFrame()
 
+        if df.empty:
+            logging.warning(f"No historical data returned for {symbol}")
+            return pd.DataFrame()
+
+        # Chunks are rounded to whole days/seconds; trim to the requested range.
+        first, last = requests[0].start.tz_localize(None), requests[-1].end.tz_localize(None)
+        df = df.loc[(df.index >= first) & (df.index <= last)]
+        logging.info(f"Successfully fetched {len(df)} bars for {symbol}.")
+
+        if kwargs.get("adjust", False):
+            actions = actions_for(
+                symbol, load_actions(kwargs.get("actions_path", DEFAULT_ACTIONS_PATH))
+            )
+            df = adjust_bars(df, actions)
+            logging.info(f"Adjusted {symbol} bars for {len(actions)} corporate action(s).")
+        return df
+
 
 def main() -> None:
     """
@@ -123,8 +153,8 @@ def main() -> None:
             df_spy = data_loader.get_historical_data(
                 symbol="SPY",
                 timeframe="1 day",
-                start="",  # Not used in this simplified example
-                end="",  # IB defaults to now if end is empty
+                start="",  # Defaults to one year before end
+                end="",  # Defaults to now
             )
 
             if not df_spy.empty:
@@ -7,6 +7,7 @@ from ib_insync import IB, Contract, Order
 from src.interfaces import IExecutionHandler
 
 from .connection import IBConnection
+from .contracts import DEFAULT_EXCHANGE, ContractCache
 
 logger = logging.getLogger(__name__)
 
@@ -18,27 +19,28 @@ class IBKRExecutionHandler(IExecutionHandler):
     IB-specific Contract and Order objects and submitting them.
     """
 
-    def __init__(self, ib_connection: IBConnection) -> None:
+    def __init__(
+        self, ib_connection: IBConnection, contract_cache: ContractCache | None = None
+    ) -> None:
         if not isinstance(ib_connection, IBConnection):
             raise TypeError("ib_connection must be an instance of IBConnection")
         self.ib_connection = ib_connection
         self.ib: IB = ib_connection.ib
+        self.contracts = contract_cache or ContractCache(self.ib)
         logger.info("IBKRExecutionHandler initialized.")
 
     def _create_contract(
-        self, symbol: str, sec_type: str = "STK", exchange: str = "SMART", currency: str = "USD"
+        self,
+        symbol: str,
+        sec_type: str = "STK",
+        exchange: str = DEFAULT_EXCHANGE,
+        currency: str = "USD",
     ) -> Contract | None:
-        """Creates and qualifies an IB Contract object."""
-        contract = Contract(symbol=symbol, secType=sec_type, exchange=exchange, currency=currency)
-        try:
-            qualified_contracts = self.ib.qualifyContracts(contract)
-            if not qualified_contracts:
-                logger.warning(f"No contract details found for {symbol}")
-                return None
-            return qualified_contracts[0]
-        except Exception as e:
-            logger.error(f"Error qualifying contract for {symbol}: {e}")
-            return None
+        """
+        Returns a qualified IB Contract object. Cached contracts are used even
+        when past their TTL so a known symbol never waits on a gateway round-trip.
+        """
+        return self.contracts.get(symbol, sec_type, exchange, currency, allow_stale=True)
 
     def _create_order(self, order_details: dict[str, Any]) -> Order:
         """Creates an IB Order object from a generic dictionary."""
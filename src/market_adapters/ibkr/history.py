@@ -0,0 +1,236 @@
+# src/market_adapters/ibkr/history.py
+"""
+Paged historical data requests for Interactive Brokers.
+
+IB caps how much history a single `reqHistoricalData` call may return for a
+given bar size and paces the rate of requests. `plan_requests` splits a
+`[start, end]` range into request chunks sized for the bar size,
+`TokenBucket` throttles them to IB's pacing limits, and `fetch_history`
+issues the chunks concurrently through ib_insync's async API before
+stitching them into a single de-duplicated DataFrame.
+"""
+
+import asyncio
+import datetime as dt
+import logging
+import math
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+import pandas as pd
+from ib_insync import BarData, Contract
+
+logger = logging.getLogger(__name__)
+
+# Largest span requested per call for each bar size, kept inside the limits
+# documented for TWS historical data requests.
+MAX_CHUNK_SPAN: dict[str, pd.Timedelta] = {
+    "1 secs": pd.Timedelta(minutes=30),
+    "5 secs": pd.Timedelta(hours=1),
+    "10 secs": pd.Timedelta(hours=4),
+    "15 secs": pd.Timedelta(hours=4),
+    "30 secs": pd.Timedelta(hours=8),
+    "1 min": pd.Timedelta(days=1),
+    "2 mins": pd.Timedelta(days=2),
+    "3 mins": pd.Timedelta(days=7),
+    "5 mins": pd.Timedelta(days=7),
+    "10 mins": pd.Timedelta(days=14),
+    "15 mins": pd.Timedelta(days=14),
+    "20 mins": pd.Timedelta(days=28),
+    "30 mins": pd.Timedelta(days=28),
+    "1 hour": pd.Timedelta(days=28),
+    "2 hours": pd.Timedelta(days=28),
+    "3 hours": pd.Timedelta(days=28),
+    "4 hours": pd.Timedelta(days=28),
+    "8 hours": pd.Timedelta(days=28),
+    "1 day": pd.Timedelta(days=365),
+    "1 week": pd.Timedelta(days=365),
+    "1 month": pd.Timedelta(days=365),
+}
+
+# IB pacing: at most 60 historical requests per 10 minutes, and no more than
+# 6 requests for the same contract within 2 seconds.
+PACING_RATE_PER_SEC = 60 / 600
+PACING_BURST = 5
+# Concurrently outstanding requests (IB allows up to 50 open requests).
+DEFAULT_MAX_CONCURRENT = 5
+
+DEFAULT_HISTORY_SPAN = pd.Timedelta(days=365)
+OHLCV_FIELDS = ["open", "high", "low", "close", "volume"]
+
+
+@dataclass(frozen=True)
+class HistoricalRequest:
+    """One `reqHistoricalData` call covering `[start, end]`."""
+
+    start: pd.Timestamp
+    end: pd.Timestamp
+    duration_str: str
+
+    @property
+    def end_datetime(self) -> dt.datetime:
+        """The request end as an aware UTC datetime (what ib_insync sends to TWS)."""
+        return self.end.to_pydatetime()
+
+
+def _to_utc(value: str | pd.Timestamp | dt.datetime | None) -> pd.Timestamp | None:
+    """Parses a date bound; naive values are interpreted as UTC."""
+    if value is None or value == "":
+        return None
+    ts = pd.Timestamp(value)
+    return ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+
+
+def duration_string(span: pd.Timedelta) -> str:
+    """Formats a span as an IB duration: seconds below one day, whole days above."""
+    if span <= pd.Timedelta(days=1):
+        return f"{max(1, int(span.total_seconds()))} S"
+    return f"{math.ceil(span / pd.Timedelta(days=1))} D"
+
+
+def plan_requests(
+    start: str | pd.Timestamp | None,
+    end: str | pd.Timestamp | None,
+    bar_size: str,
+) -> list[HistoricalRequest]:
+    """
+    Splits `[start, end]` into request chunks no larger than IB permits for
+    `bar_size`, ordered from the oldest chunk to the newest.
+
+    An empty `end` means now and an empty `start` means `DEFAULT_HISTORY_SPAN`
+    before `end`.
+    """
+    if bar_size not in MAX_CHUNK_SPAN:
+        raise ValueError(
+            f"Unsupported bar size '{bar_size}'. Expected one of: {', '.join(MAX_CHUNK_SPAN)}"
+        )
+    end_ts = _to_utc(end)
+    if end_ts is None:
+        end_ts = pd.Timestamp.now(tz="UTC").floor("s")
+    start_ts = _to_utc(start)
+    if start_ts is None:
+        start_ts = end_ts - DEFAULT_HISTORY_SPAN
+    if start_ts >= end_ts:
+        raise ValueError(f"start ({start_ts}) must be before end ({end_ts})")
+
+    max_span = MAX_CHUNK_SPAN[bar_size]
+    requests = []
+    chunk_end = end_ts
+    while chunk_end > start_ts:
+        chunk_start = max(start_ts, chunk_end - max_span)
+        requests.append(
+            HistoricalRequest(chunk_start, chunk_end, duration_string(chunk_end - chunk_start))
+        )
+        chunk_end = chunk_start
+    return requests[::-1]
+
+
+class TokenBucket:
+    """
+    Async token bucket: `capacity` requests may be issued in a burst, after
+    which tokens refill at `rate` per second.
+    """
+
+    def __init__(
+        self,
+        rate: float = PACING_RATE_PER_SEC,
+        capacity: int = PACING_BURST,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if rate <= 0 or capacity < 1:
+            raise ValueError("TokenBucket needs a positive rate and a capacity of at least 1")
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+
+    def try_acquire(self) -> float:
+        """Takes a token if one is available. Returns 0, or the seconds until one will be."""
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    async def acquire(self) -> None:
+        """Waits until a token is available and takes it."""
+        while (wait := self.try_acquire()) > 0:
+            await asyncio.sleep(wait)
+
+
+def bars_to_frame(bars: list[BarData]) -> pd.DataFrame:
+    """Converts IB bars to the standard OHLCV layout with a naive (UTC) `Date` index."""
+    if not bars:
+        return pd.DataFrame(columns=[field.capitalize() for field in OHLCV_FIELDS])
+    df = pd.DataFrame(
+        [[getattr(bar, field) for field in OHLCV_FIELDS] for bar in bars],
+        columns=[field.capitalize() for field in OHLCV_FIELDS],
+    )
+    df.index = pd.DatetimeIndex(
+        pd.to_datetime([bar.date for bar in bars], utc=True).tz_localize(None), name="Date"
+    )
+    return df
+
+
+def stitch(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenates chunk frames, sorting by time and dropping bars returned by two chunks."""
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return bars_to_frame([])
+    df = pd.concat(frames).sort_index(kind="stable")
+    return df[~df.index.duplicated(keep="last")]
+
+
+async def fetch_history(
+    ib: Any,
+    contract: Contract,
+    requests: list[HistoricalRequest],
+    bar_size: str,
+    bucket: TokenBucket | None = None,
+    max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+    what_to_show: str = "TRADES",
+    use_rth: bool = True,
+) -> pd.DataFrame:
+    """
+    Issues the planned requests concurrently, throttled by `bucket`, and
+    stitches the results. Chunks that fail are logged and left out.
+
+    Args:
+        ib: A connected `ib_insync.IB` (or an object with the same
+            `reqHistoricalDataAsync` method).
+        contract: A qualified contract.
+        requests: Chunks from `plan_requests`.
+        bar_size: IB bar size setting (e.g. '1 min').
+        bucket: Pacing limiter; defaults to IB's historical data limits.
+        max_concurrent: Maximum requests in flight at once.
+    """
+    bucket = bucket or TokenBucket()
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def fetch_chunk(request: HistoricalRequest) -> pd.DataFrame:
+        async with semaphore:
+            await bucket.acquire()
+            try:
+                bars = await ib.reqHistoricalDataAsync(
+                    contract,
+                    endDateTime=request.end_datetime,
+                    durationStr=request.duration_str,
+                    barSizeSetting=bar_size,
+                    whatToShow=what_to_show,
+                    useRTH=use_rth,
+                    formatDate=2,  # UTC timestamps for intraday bars
+                )
+            except Exception as e:
+                logger.error(f"Historical request ending {request.end} failed: {e}")
+                return bars_to_frame([])
+        if not bars:
+            logger.warning(f"No bars returned for chunk ending {request.end}")
+        return bars_to_frame(bars)
+
+    frames = await asyncio.gather(*(fetch_chunk(request) for request in requests))
+    return stitch(list(frames))
@@ -0,0 +1,262 @@
+"""
+Aligned multi-asset panel.
+
+A `Panel` holds a universe of bar series as one `(time, asset, field)` array on
+a single shared, sorted index, with an explicit `(time, asset)` mask marking
+which assets have a bar at each timestamp. Building it aligns every asset
+once; afterwards per-asset frames are zero-copy views into the array, and
+cross-sectional operations (ranks, z-scores, means across the universe) are
+single vectorised passes instead of repeated merges of per-asset frames.
+"""
+
+from collections.abc import Iterable, Mapping
+
+import numpy as np
+import pandas as pd
+
+from src.bar_store import OHLCV_COLUMNS, from_epoch_ns, to_epoch_ns
+
+JOINS = ("outer", "inner")
+PAIR_SUFFIXES = ("_1", "_2")
+
+
+class Panel:
+    """
+    Time x asset x field array on one aligned index.
+
+    Attributes:
+        values: float array of shape `(len(index), len(assets), len(fields))`.
+                Entries where an asset has no bar are NaN.
+        mask: bool array of shape `(len(index), len(assets))`, True where the
+              asset has a bar at that timestamp.
+        index: Shared, sorted, timezone-naive (UTC) DatetimeIndex.
+        assets: Asset names, in column order.
+        fields: Field names (e.g. OHLCV), in order.
+    """
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        index: pd.DatetimeIndex,
+        assets: Iterable[str],
+        fields: Iterable[str],
+        mask: np.ndarray | None = None,
+    ) -> None:
+        self.values = values
+        self.index = index
+        self.assets = list(assets)
+        self.fields = list(fields)
+        expected = (len(index), len(self.assets), len(self.fields))
+        if values.shape != expected:
+            raise ValueError(f"Panel values have shape {values.shape}, expected {expected}")
+        if mask is None:
+            mask = ~np.isnan(values).all(axis=2)
+        if mask.shape != expected[:2]:
+            raise ValueError(f"Panel mask has shape {mask.shape}, expected {expected[:2]}")
+        self.mask = mask
+        self._asset_pos = {name: i for i, name in enumerate(self.assets)}
+        self._field_pos = {name: i for i, name in enumerate(self.fields)}
+
+    @classmethod
+    def from_frames(
+        cls,
+        frames: Mapping[str, pd.DataFrame],
+        fields: Iterable[str] = OHLCV_COLUMNS,
+        how: str = "outer",
+        dtype: str = "float64",
+    ) -> "Panel":
+        """
+        Aligns per-asset bar frames onto one index.
+
+        Args:
+            frames: `{asset_name: DataFrame}` with a DatetimeIndex and at least
+                    the requested `fields` as columns.
+            fields: Columns to keep, in order.
+            how: "outer" keeps every timestamp seen by any asset (missing bars
+                 are masked); "inner" keeps only timestamps every asset has.
+            dtype: Value dtype ("float64" or "float32").
+        """
+        if how not in JOINS:
+            raise ValueError(f"Unknown join '{how}'. Expected one of: {', '.join(JOINS)}")
+        fields = list(fields)
+        assets = list(frames)
+
+        stamps = {}
+        for name, df in frames.items():
+            missing = [f for f in fields if f not in df.columns]
+            if missing:
+                raise ValueError(f"Asset '{name}' is missing field(s): {', '.join(missing)}")
+            ts = to_epoch_ns(df.index)
+            order = np.argsort(ts, kind="stable")
+            ts = ts[order]
+            # Duplicate timestamps keep their last bar.
+            keep = np.r_[ts[1:] != ts[:-1], True] if ts.size else np.ones(0, dtype=bool)
+            stamps[name] = (ts[keep], order[keep])
+
+        arrays = [ts for ts, _ in stamps.values()]
+        if not arrays:
+            timestamps = np.array([], dtype="int64")
+        elif how == "outer":
+            timestamps = np.unique(np.concatenate(arrays))
+        else:
+            timestamps = arrays[0]
+            for ts in arrays[1:]:
+                timestamps = np.intersect1d(timestamps, ts, assume_unique=True)
+
+        values = np.full((len(timestamps), len(assets), len(fields)), np.nan, dtype=dtype)
+        mask = np.zeros((len(timestamps), len(assets)), dtype=bool)
+        for a, name in enumerate(assets):
+            ts, rows = stamps[name]
+            if how == "inner":
+                present = np.isin(ts, timestamps, assume_unique=True)
+                ts, rows = ts[present], rows[present]
+            pos = np.searchsorted(timestamps, ts)
+            values[pos, a, :] = frames[name][fields].to_numpy(dtype=dtype)[rows]
+            mask[pos, a] = True
+
+        return cls(values, from_epoch_ns(timestamps), assets, fields, mask)
+
+    @property
+    def shape(self) -> tuple[int, int, int]:
+        return self.values.shape
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, asset: str) -> bool:
+        return asset in self._asset_pos
+
+    def __repr__(self) -> str:
+        span = f"{self.index[0]} to {self.index[-1]}" if len(self.index) else "empty"
+        return (
+            f"Panel({len(self.index)} bars x {len(self.assets)} assets x "
+            f"{len(self.fields)} fields, {span})"
+        )
+
+    def _asset_index(self, asset: str) -> int:
+        try:
+            return self._asset_pos[asset]
+        except KeyError:
+            raise KeyError(f"Asset '{asset}' is not in the panel") from None
+
+    def _field_index(self, field: str) -> int:
+        try:
+            return self._field_pos[field]
+        except KeyError:
+            raise KeyError(f"Field '{field}' is not in the panel") from None
+
+    def asset(self, name: str, observed: bool = False) -> pd.DataFrame:
+        """
+        Bars of one asset as a `(time x field)` DataFrame.
+
+        By default this is a zero-copy view on the full panel index (rows where
+        the asset has no bar are NaN). `observed=True` returns only the rows the
+        asset actually has, which is a copy.
+        """
+        a = self._asset_index(name)
+        if observed:
+            rows = self.mask[:, a]
+            return pd.DataFrame(
+                self.values[rows, a, :], index=self.index[rows], columns=self.fields
+            )
+        return pd.DataFrame(self.values[:, a, :], index=self.index, columns=self.fields, copy=False)
+
+    def field(self, name: str) -> pd.DataFrame:
+        """One field across the universe as a zero-copy `(time x asset)` DataFrame."""
+        f = self._field_index(name)
+        return pd.DataFrame(self.values[:, :, f], index=self.index, columns=self.assets, copy=False)
+
+    def select(self, assets: Iterable[str]) -> "Panel":
+        """Sub-panel of `assets` on the same index (values are copied)."""
+        positions = [self._asset_index(name) for name in assets]
+        return Panel(
+            self.values[:, positions, :],
+            self.index,
+            [self.assets[p] for p in positions],
+            self.fields,
+            self.mask[:, positions],
+        )
+
+    def dropna(self) -> "Panel":
+        """Keeps only the timestamps at which every asset has a bar (an inner join)."""
+        rows = self.mask.all(axis=1)
+        return Panel(self.values[rows], self.index[rows], self.assets, self.fields, self.mask[rows])
+
+    def to_frames(self) -> dict[str, pd.DataFrame]:
+        """`{asset: DataFrame}` with each asset's observed bars only."""
+        return {name: self.asset(name, observed=True) for name in self.assets}
+
+    # --- Cross-sectional operations (across assets, per timestamp) ---
+
+    def cross_mean(self, field: str = "Close") -> pd.Series:
+        """Mean of `field` across the assets present at each timestamp."""
+        with np.errstate(invalid="ignore"):
+            data = self.values[:, :, self._field_index(field)]
+            counts = self.mask.sum(axis=1)
+            total = np.where(self.mask, data, 0.0).sum(axis=1)
+            mean = np.where(counts > 0, total / np.maximum(counts, 1), np.nan)
+        return pd.Series(mean, index=self.index, name=field)
+
+    def cross_zscore(self, field: str = "Close") -> pd.DataFrame:
+        """
+        Cross-sectional z-score of `field`: each value minus the universe mean
+        at that timestamp, divided by the universe standard deviation
+        (population, ddof=0). Masked entries stay NaN.
+        """
+        data = np.where(self.mask, self.values[:, :, self._field_index(field)], np.nan)
+        counts = self.mask.sum(axis=1, keepdims=True)
+        safe_counts = np.maximum(counts, 1)
+        mean = np.where(self.mask, data, 0.0).sum(axis=1, keepdims=True) / safe_counts
+        centred = np.where(self.mask, data - mean, 0.0)
+        std = np.sqrt((centred**2).sum(axis=1, keepdims=True) / safe_counts)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            z = np.where(self.mask & (std > 0), centred / std, np.nan)
+        return pd.DataFrame(z, index=self.index, columns=self.assets)
+
+    def cross_rank(self, field: str = "Close", pct: bool = True) -> pd.DataFrame:
+        """Rank of `field` across the assets present at each timestamp (ties averaged)."""
+        return self.field(field).where(self.mask).rank(axis=1, pct=pct)
+
+    def returns(self, field: str = "Close") -> pd.DataFrame:
+        """
+        Simple returns of `field` per asset, between each asset's consecutive
+        observed bars. Entries where the asset has no bar are NaN.
+        """
+        data = self.values[:, :, self._field_index(field)]
+        result = np.full(data.shape, np.nan, dtype=data.dtype)
+        for a in range(len(self.assets)):
+            rows = np.flatnonzero(self.mask[:, a])
+            series = data[rows, a]
+            result[rows[1:], a] = series[1:] / series[:-1] - 1
+        return pd.DataFrame(result, index=self.index, columns=self.assets)
+
+    # --- Pairs and multi-asset frames ---
+
+    def wide_frame(self, assets: list[str], suffixes: list[str]) -> pd.DataFrame:
+        """
+        Flat frame of several assets on the timestamps they all share, with
+        each asset's fields suffixed (e.g. `Close_1`, `Close_2`). An empty
+        suffix keeps that asset's field names unchanged.
+        """
+        if len(assets) != len(suffixes):
+            raise ValueError("wide_frame needs one suffix per asset")
+        positions = [self._asset_index(name) for name in assets]
+        rows = self.mask[:, positions].all(axis=1)
+        columns = {}
+        for a, suffix in zip(positions, suffixes, strict=True):
+            block = self.values[rows, a, :]
+            for f, name in enumerate(self.fields):
+                columns[f"{name}{suffix}"] = block[:, f]
+        return pd.DataFrame(columns, index=self.index[rows])
+
+    def pair_frame(self, first: str, second: str) -> pd.DataFrame:
+        """
+        Frame for a two-asset (pairs) strategy on the timestamps both assets
+        share: every field of `first` suffixed with `_1`, every field of
+        `second` with `_2`, and the unsuffixed fields taken from `first` so
+        Backtesting.py executes on the primary asset.
+        """
+        frame = self.wide_frame([first, second], list(PAIR_SUFFIXES))
+        for name in self.fields:
+            frame[name] = frame[f"{name}{PAIR_SUFFIXES[0]}"]
+        return frame
@@ -0,0 +1,250 @@
+"""
+Vectorized OHLCV resampling with cached derived timeframes.
+
+`resample_bars` aggregates fine bars (e.g. 1-minute) into coarser ones
+(5-minute, hourly, daily or any custom size) directly on the OHLCV arrays
+with `numpy.ufunc.reduceat`. Bars never span two sessions: an intraday bin
+that would cross the overnight gap is split at the session boundary, and
+daily bars are built per exchange-local trading date. With
+`regular_hours=True`, pre- and post-market bars are dropped first using the
+NYSE calendar's session opens and closes (see `src/trading_calendar.py`).
+
+`resample_file` caches the derived timeframe in the bar store, keyed by the
+source file and the rule, and rebuilds it only when the source changes.
+"""
+
+import argparse
+import hashlib
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.bar_store import (
+    OHLCV_COLUMNS,
+    from_epoch_ns,
+    load_bars,
+    read_bar_metadata,
+    read_bars,
+    to_epoch_ns,
+    write_bars,
+)
+from src.trading_calendar import nyse_calendar
+
+DEFAULT_DERIVED_DIR = os.path.join("data", "cache", "derived")
+DEFAULT_TIMEZONE = "America/New_York"
+ANCHORS = ("clock", "session")
+
+# Bumped whenever the aggregation logic changes, invalidating cached files.
+RESAMPLE_VERSION = "1"
+DERIVED_KEY = "quant_core.derived"
+
+DAY_NS = 24 * 60 * 60 * 1_000_000_000
+
+
+def parse_rule(rule: str) -> pd.Timedelta:
+    """
+    Parses a bar size such as '5min', '90s', '1h', '1D' or '5D'.
+    Rules of one day or more must be whole days (counted in trading sessions).
+    """
+    try:
+        size = pd.Timedelta(rule)
+    except ValueError as e:
+        raise ValueError(f"Invalid resampling rule '{rule}': {e}") from e
+    if size <= pd.Timedelta(0):
+        raise ValueError(f"Resampling rule must be positive, got '{rule}'")
+    if size >= pd.Timedelta(days=1) and size % pd.Timedelta(days=1) != pd.Timedelta(0):
+        raise ValueError(f"Rules of a day or more must be whole days, got '{rule}'")
+    return size
+
+
+def _local_ns(timestamps: np.ndarray, tz: str | None) -> np.ndarray:
+    """
+    Converts UTC epoch nanoseconds to exchange-local wall-clock nanoseconds.
+    Bars stamped exactly at midnight (daily data) are already session dates.
+    """
+    if tz is None or (timestamps % DAY_NS == 0).all():
+        return timestamps
+    index = pd.DatetimeIndex(timestamps.view("datetime64[ns]")).tz_localize("UTC")
+    return index.tz_convert(tz).tz_localize(None).asi8
+
+
+def resample_bars(
+    df: pd.DataFrame,
+    rule: str,
+    tz: str | None = DEFAULT_TIMEZONE,
+    anchor: str = "clock",
+    regular_hours: bool = False,
+) -> pd.DataFrame:
+    """
+    Aggregates OHLCV bars to a coarser bar size.
+
+    Args:
+        df: Bars in the standard layout (naive UTC index, OHLCV columns), sorted.
+        rule: Target bar size (see `parse_rule`).
+        tz: Exchange timezone defining sessions (a session is one local
+            calendar date). None treats the index as local time.
+        anchor: "clock" aligns intraday bins to multiples of the bar size from
+                local midnight (09:30-10:00, 10:00-11:00 for hourly bars);
+                "session" aligns them to each session's first bar
+                (09:30-10:30, ...).
+        regular_hours: Drop intraday bars outside NYSE regular sessions
+                       (09:30-16:00, 13:00 on early closes) before aggregating.
+
+    Returns:
+        OHLCV DataFrame labelled by each bin's start (naive UTC for intraday
+        rules, the session date for daily rules).
+    """
+    if anchor not in ANCHORS:
+        raise ValueError(f"Unknown anchor '{anchor}'. Expected one of: {', '.join(ANCHORS)}")
+    size_ns = parse_rule(rule).value
+
+    df = df[OHLCV_COLUMNS].dropna()
+    if df.empty:
+        return df
+    timestamps = to_epoch_ns(df.index)
+    if (np.diff(timestamps) < 0).any():
+        raise ValueError("resample_bars expects bars sorted by time")
+    if regular_hours and not (timestamps % DAY_NS == 0).all():
+        inside = nyse_calendar().in_session(timestamps)
+        df, timestamps = df.iloc[inside], timestamps[inside]
+        if df.empty:
+            return df
+
+    local = _local_ns(timestamps, tz)
+    session = local // DAY_NS
+    session_starts = np.flatnonzero(np.r_[True, session[1:] != session[:-1]])
+
+    if size_ns >= DAY_NS:
+        # Whole-day rules group consecutive trading sessions (not calendar days).
+        session_ordinal = np.cumsum(np.r_[True, session[1:] != session[:-1]]) - 1
+        key = session_ordinal // (size_ns // DAY_NS)
+        starts = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+        labels = from_epoch_ns(session[starts] * DAY_NS)
+    else:
+        within = local - session * DAY_NS
+        if anchor == "session":
+            session_offset = np.repeat(
+                within[session_starts], np.diff(np.r_[session_starts, len(within)])
+            )
+        else:
+            session_offset = np.zeros_like(within)
+        bin_index = (within - session_offset) // size_ns
+        boundary = (session[1:] != session[:-1]) | (bin_index[1:] != bin_index[:-1])
+        starts = np.flatnonzero(np.r_[True, boundary])
+        # Shift each bin's local start back to UTC by its first bar's offset.
+        label_local = (
+            session[starts] * DAY_NS + session_offset[starts] + bin_index[starts] * size_ns
+        )
+        labels = from_epoch_ns(timestamps[starts] - (local[starts] - label_local))
+
+    ends = np.r_[starts[1:], len(df)]
+    values = {col: df[col].to_numpy() for col in OHLCV_COLUMNS}
+    result = pd.DataFrame(
+        {
+            "Open": values["Open"][starts],
+            "High": np.maximum.reduceat(values["High"], starts),
+            "Low": np.minimum.reduceat(values["Low"], starts),
+            "Close": values["Close"][ends - 1],
+            "Volume": np.add.reduceat(values["Volume"], starts),
+        },
+        index=labels,
+    )
+    return result
+
+
+def _rule_slug(rule: str) -> str:
+    return "".join(ch for ch in rule if ch.isalnum())
+
+
+def derived_path(
+    source_path: str,
+    rule: str,
+    anchor: str = "clock",
+    cache_dir: str = DEFAULT_DERIVED_DIR,
+    regular_hours: bool = False,
+) -> str:
+    """Returns the cache file for `source_path` resampled with `rule`."""
+    source_hash = hashlib.sha1(os.path.abspath(source_path).encode()).hexdigest()[:10]
+    hours = "_rth" if regular_hours else ""
+    name = f"{Path(source_path).stem}_{source_hash}_{_rule_slug(rule)}_{anchor}{hours}.parquet"
+    return os.path.join(cache_dir, name)
+
+
+def _source_signature(
+    source_path: str, rule: str, tz: str | None, anchor: str, regular_hours: bool
+) -> str:
+    stat = os.stat(source_path)
+    hours = "|rth" if regular_hours else ""
+    return (
+        f"{os.path.abspath(source_path)}|{stat.st_mtime_ns}|{stat.st_size}|"
+        f"{rule}|{tz}|{anchor}{hours}|v{RESAMPLE_VERSION}"
+    )
+
+
+def resample_file(
+    source_path: str,
+    rule: str,
+    tz: str | None = DEFAULT_TIMEZONE,
+    anchor: str = "clock",
+    cache_dir: str = DEFAULT_DERIVED_DIR,
+    regular_hours: bool = False,
+) -> pd.DataFrame:
+    """
+    Returns `source_path` resampled to `rule`, from the derived-timeframe
+    cache when it was built from the same version of the source file.
+    """
+    path = derived_path(source_path, rule, anchor, cache_dir, regular_hours)
+    signature = _source_signature(source_path, rule, tz, anchor, regular_hours)
+    if os.path.exists(path) and read_bar_metadata(path).get(DERIVED_KEY) == signature:
+        return read_bars(path)
+
+    derived = resample_bars(
+        load_bars(source_path), rule, tz=tz, anchor=anchor, regular_hours=regular_hours
+    )
+    write_bars(derived, path, metadata={DERIVED_KEY: signature})
+    return derived
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Main entry point for the resampling script."""
+    parser = argparse.ArgumentParser(description="Derive a coarser timeframe from a bar file.")
+    parser.add_argument("--data", required=True, help="Source bar file (.csv or .parquet).")
+    parser.add_argument(
+        "--rule", required=True, help="Target bar size, e.g. '5min', '1h', '1D', '7min'."
+    )
+    parser.add_argument(
+        "--tz", default=DEFAULT_TIMEZONE, help="Exchange timezone that defines sessions."
+    )
+    parser.add_argument(
+        "--anchor",
+        choices=ANCHORS,
+        default="clock",
+        help="Align bins to the clock or session open.",
+    )
+    parser.add_argument(
+        "--regular-hours",
+        action="store_true",
+        help="Drop pre- and post-market bars (NYSE calendar) before aggregating.",
+    )
+    parser.add_argument("--output", help="Optional CSV path to export the derived bars to.")
+    args = parser.parse_args(argv)
+
+    derived = resample_file(
+        args.data,
+        args.rule,
+        tz=args.tz,
+        anchor=args.anchor,
+        regular_hours=args.regular_hours,
+    )
+    print(f"Derived {len(derived)} '{args.rule}' bars from {args.data}")
+    if args.output:
+        derived.to_csv(args.output, index_label="Date")
+        print(f"Saved to {args.output}")
+    else:
+        print(derived.head())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Warm-state snapshots for restarting a live strategy quickly.
+
+A snapshot holds everything a strategy needs to carry on after a restart:
+
+- its derived state (`BaseStrategy.get_state()`: entry price, trailing-stop
+  level, size factor, ...);
+- its indicator buffers, i.e. the last `warmup_bars()` bars. They cover the
+  longest window behind the strategy's next decision: its own indicators and
+  the ATR its trailing stop trails by. Rebuilt on them, the indicators match
+  the full-history ones to rounding (a recursive one such as Wilder's RSI
+  keeps enough bars for its seed to be forgotten to float resolution);
+- its parameters, for reference and to reject snapshots taken with other
+  settings.
+
+`SnapshotStore.update()` writes one every `every_bars` bars. Each file is
+written to a temporary file and atomically renamed into place, so a crash
+never leaves a torn snapshot behind. The newest `keep` snapshots are kept.
+`with_snapshots(strategy, store)` calls it after every bar of a backtest
+(`run_backtest.py --snapshot-every N`).
+
+On restart, instead of re-fetching and replaying the full history (see
+`docs/safety_and_recovery.md`), load the latest snapshot, fetch only the bars
+after `snapshot.last_bar`, and rebuild the strategy on
+`resume_bars(snapshot, new_bars)`. Then call `restore_state(strategy,
+snapshot)`. The restart cost depends on the warm-up window and the bars
+missed, not on how much history the strategy has seen.
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from src.bar_store import OHLCV_COLUMNS, from_epoch_ns, to_epoch_ns
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+DEFAULT_SNAPSHOT_DIR = "data/state"
+SNAPSHOT_EXTENSION = ".json"
+DEFAULT_KEEP = 3
+
+
+@dataclass
+class StrategySnapshot:
+    """
+    A strategy's warm state as of its last bar.
+
+    Attributes:
+        strategy: Name of the strategy class.
+        params: `get_params()` when the snapshot was taken.
+        state: `get_state()` when the snapshot was taken.
+        bars: The last `warmup_bars()` OHLCV bars (Backtesting.py columns).
+    """
+
+    strategy: str
+    params: dict[str, Any]
+    state: dict[str, Any]
+    bars: pd.DataFrame = field(repr=False)
+
+    @property
+    def last_bar(self) -> pd.Timestamp:
+        """Timestamp of the last bar the strategy had seen."""
+        return self.bars.index[-1]
+
+    @classmethod
+    def capture(cls, strategy: Any) -> "StrategySnapshot":
+        """Snapshots a running `BaseStrategy` as of its current bar."""
+        history = strategy.data.df
+        columns = [column for column in OHLCV_COLUMNS if column in history.columns]
+        bars = history[columns].iloc[-strategy.warmup_bars() :]
+        if bars.empty:
+            raise ValueError("Cannot snapshot a strategy that has not seen any bars")
+        return cls(type(strategy).__name__, strategy.get_params(), strategy.get_state(), bars)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": SNAPSHOT_VERSION,
+            "strategy": self.strategy,
+            "params": self.params,
+            "state": self.state,
+            "bars": {
+                "timestamp": to_epoch_ns(self.bars.index).tolist(),
+                **{column: self.bars[column].tolist() for column in self.bars.columns},
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, raw: dict[str, Any]) -> "StrategySnapshot":
+        if raw.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {raw.get('version')!r}")
+        columns = dict(raw["bars"])
+        index = from_epoch_ns(np.asarray(columns.pop("timestamp"), dtype="int64"))
+        return cls(raw["strategy"], raw["params"], raw["state"], pd.DataFrame(columns, index=index))
+
+
+class SnapshotStore:
+    """
+    Periodic, atomic snapshots of one strategy instance, as JSON files in
+    `directory` named `<name>-<last bar, epoch ns>.json`.
+
+    Usage:
+        store = SnapshotStore(DEFAULT_SNAPSHOT_DIR, "SimpleMACrossover-SPY", every_bars=10)
+        store.update(strategy)        # after every bar; writes every 10th
+        snapshot = store.latest()     # on restart
+    """
+
+    def __init__(
+        self, directory: str, name: str, every_bars: int = 1, keep: int = DEFAULT_KEEP
+    ) -> None:
+        if every_bars < 1 or keep < 1:
+            raise ValueError("every_bars and keep must be at least 1")
+        self.directory = directory
+        self.name = name
+        self.every_bars = every_bars
+        self.keep = keep
+        self._bars_since_save = 0
+
+    def path_for(self, last_bar: pd.Timestamp) -> str:
+        # Zero-padded so that file names sort in time order.
+        epoch_ns = int(to_epoch_ns(pd.DatetimeIndex([last_bar]))[0])
+        return os.path.join(self.directory, f"{self.name}-{epoch_ns:020d}{SNAPSHOT_EXTENSION}")
+
+    def paths(self) -> list[str]:
+        """Snapshot files of this strategy, oldest first."""
+        if not os.path.isdir(self.directory):
+            return []
+        prefix = f"{self.name}-"
+        return sorted(
+            os.path.join(self.directory, filename)
+            for filename in os.listdir(self.directory)
+            if filename.startswith(prefix)
+            and filename.endswith(SNAPSHOT_EXTENSION)
+            and filename[len(prefix) : -len(SNAPSHOT_EXTENSION)].isdigit()
+        )
+
+    def save(self, snapshot: StrategySnapshot) -> str:
+        """Writes `snapshot` atomically, prunes old ones and returns its path."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path_for(snapshot.last_bar)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(snapshot.to_dict(), f)
+            # On disk before the rename, so a power loss cannot leave an empty snapshot.
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        self._bars_since_save = 0
+        for old in self.paths()[: -self.keep]:
+            os.remove(old)
+        return path
+
+    def update(self, strategy: Any) -> str | None:
+        """
+        Call once per bar: snapshots `strategy` every `every_bars` bars.
+
+        Returns:
+            The path written, or None if no snapshot was due.
+        """
+        self._bars_since_save += 1
+        if self._bars_since_save < self.every_bars:
+            return None
+        return self.save(StrategySnapshot.capture(strategy))
+
+    def latest(self) -> StrategySnapshot | None:
+        """The newest readable snapshot (unreadable files are skipped), or None."""
+        for path in reversed(self.paths()):
+            try:
+                with open(path) as f:
+                    return StrategySnapshot.from_dict(json.load(f))
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Ignoring unreadable strategy snapshot {path}: {e}")
+        return None
+
+
+def with_snapshots(strategy: type, store: SnapshotStore) -> type:
+    """
+    `strategy` (a Backtesting.py strategy class) with `store.update()` called
+    after every bar. A wrapper such as `SignalExecutor`, which runs a
+    `BaseStrategy` as its `strategy` attribute, snapshots the wrapped one.
+    The subclass keeps `strategy`'s name, so its snapshots restore it.
+    """
+
+    def next(self) -> None:
+        strategy.next(self)
+        store.update(getattr(self, "strategy", self))
+
+    return type(strategy.__name__, (strategy,), {"next": next, "__module__": strategy.__module__})
+
+
+def resume_bars(snapshot: StrategySnapshot, new_bars: pd.DataFrame) -> pd.DataFrame:
+    """
+    The history to rebuild a strategy on after a restart: the snapshot's
+    warm-up bars followed by the bars after `snapshot.last_bar` (bars of
+    `new_bars` at or before it are dropped).
+    """
+    later = new_bars[new_bars.index > snapshot.last_bar]
+    return pd.concat([snapshot.bars, later[snapshot.bars.columns]])
+
+
+def restore_state(strategy: Any, snapshot: StrategySnapshot) -> None:
+    """
+    Applies `snapshot`'s state to `strategy`, a `BaseStrategy` rebuilt on
+    `resume_bars(snapshot, ...)`.
+
+    Raises:
+        ValueError: If the snapshot belongs to another strategy or was taken
+            with other parameters (and so possibly another warm-up window).
+    """
+    if snapshot.strategy != type(strategy).__name__:
+        raise ValueError(
+            f"Snapshot of {snapshot.strategy} cannot restore {type(strategy).__name__}"
+        )
+    if snapshot.params != strategy.get_params():
+        raise ValueError(
+            f"Snapshot parameters {snapshot.params} differ from {strategy.get_params()}"
+        )
+    strategy.set_state(snapshot.state)
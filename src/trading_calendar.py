@@ -0,0 +1,298 @@
+"""
+Exchange trading calendar with binary-search range and session lookups.
+
+A `TradingCalendar` precomputes its sessions once as sorted int64 arrays:
+session dates (epoch nanoseconds of local midnight, the way daily bars are
+stamped), open and close times (UTC epoch nanoseconds), holidays and early
+closes. Every lookup is then a `numpy.searchsorted` over those arrays
+instead of a scan of the data: whether a bar falls inside a session, which
+session it belongs to, and how many sessions lie between two dates.
+
+`slice_range` and `slice_dates` do the same for bar frames. They return
+the rows of a sorted frame in a date range by binary search on its index
+(O(log n)) rather than building a boolean mask over the whole index.
+
+`nyse_calendar()` is the shared NYSE calendar used by the dashboard,
+resampling and the data quality gap check.
+"""
+
+import datetime
+from functools import cache
+
+import numpy as np
+import pandas as pd
+
+from src.bar_store import NAT_NS, from_epoch_ns, to_epoch_ns
+
+EXCHANGE_TIMEZONE = "America/New_York"
+FIRST_YEAR = 1990
+LAST_YEAR = 2035
+
+HOUR_NS = 60 * 60 * 1_000_000_000
+DAY_NS = 24 * HOUR_NS
+REGULAR_OPEN_NS = 9 * HOUR_NS + 30 * 60 * 1_000_000_000
+REGULAR_CLOSE_NS = 16 * HOUR_NS
+EARLY_CLOSE_NS = 13 * HOUR_NS
+
+# Unscheduled NYSE closures (national days of mourning, 9/11, Hurricane Sandy).
+SPECIAL_CLOSURES = (
+    "1994-04-27",
+    "2001-09-11",
+    "2001-09-12",
+    "2001-09-13",
+    "2001-09-14",
+    "2004-06-11",
+    "2007-01-02",
+    "2012-10-29",
+    "2012-10-30",
+    "2018-12-05",
+    "2025-01-09",
+)
+
+Dates = pd.Index | np.ndarray | list | str | pd.Timestamp | datetime.date
+
+
+def _easter(year: int) -> datetime.date:
+    """Gregorian Easter Sunday (anonymous Gregorian algorithm)."""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = divmod(b, 4)
+    g = (b - (b + 8) // 25 + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    weekday = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * weekday) // 451
+    month, day = divmod(h + weekday - 7 * m + 114, 31)
+    return datetime.date(year, month, day + 1)
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> datetime.date:
+    """The n-th `weekday` (Monday=0) of a month; n=-1 is the last one."""
+    if n > 0:
+        first = datetime.date(year, month, 1)
+        return first + datetime.timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = datetime.date(year + month // 12, month % 12 + 1, 1) - datetime.timedelta(days=1)
+    return last - datetime.timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _observed(day: datetime.date) -> datetime.date:
+    """Saturday holidays are observed on Friday, Sunday holidays on Monday."""
+    if day.weekday() == 5:
+        return day - datetime.timedelta(days=1)
+    if day.weekday() == 6:
+        return day + datetime.timedelta(days=1)
+    return day
+
+
+def nyse_holidays(year: int) -> list[datetime.date]:
+    """Full-day NYSE holidays of one year under the current rules."""
+    new_year = datetime.date(year, 1, 1)
+    holidays = [
+        # A Saturday New Year's Day is not observed on the Friday before.
+        new_year + datetime.timedelta(days=1) if new_year.weekday() == 6 else new_year,
+        _nth_weekday(year, 2, 0, 3),  # Washington's Birthday
+        _easter(year) - datetime.timedelta(days=2),  # Good Friday
+        _nth_weekday(year, 5, 0, -1),  # Memorial Day
+        _observed(datetime.date(year, 7, 4)),
+        _nth_weekday(year, 9, 0, 1),  # Labor Day
+        _nth_weekday(year, 11, 3, 4),  # Thanksgiving
+        _observed(datetime.date(year, 12, 25)),
+    ]
+    if year >= 1998:
+        holidays.append(_nth_weekday(year, 1, 0, 3))  # Martin Luther King Jr. Day
+    if year >= 2022:
+        holidays.append(_observed(datetime.date(year, 6, 19)))  # Juneteenth
+    return sorted(day for day in holidays if day.weekday() < 5)
+
+
+def nyse_early_closes(year: int) -> list[datetime.date]:
+    """13:00 closes: the day before Independence Day, after Thanksgiving and Christmas Eve."""
+    days = [_nth_weekday(year, 11, 3, 4) + datetime.timedelta(days=1)]
+    for day in (datetime.date(year, 7, 3), datetime.date(year, 12, 24)):
+        # On a Friday these are the observed holiday instead.
+        if day.weekday() < 4:
+            days.append(day)
+    return sorted(days)
+
+
+def _date_ns(days: list[datetime.date] | tuple[str, ...]) -> np.ndarray:
+    return np.sort(np.array(days, dtype="datetime64[D]").astype("datetime64[ns]").view("int64"))
+
+
+def _wall_to_utc(local_ns: np.ndarray, tz: str) -> np.ndarray:
+    index = pd.DatetimeIndex(local_ns.view("datetime64[ns]")).tz_localize(tz)
+    return index.tz_convert("UTC").as_unit("ns").asi8
+
+
+class TradingCalendar:
+    """
+    Sessions of one exchange as sorted int64 arrays.
+
+    Attributes:
+        sessions: Session dates, epoch ns of local midnight.
+        opens: Session open times, UTC epoch ns (aligned with `sessions`).
+        closes: Session close times, UTC epoch ns (aligned with `sessions`).
+        holidays: Weekday closures, epoch ns of local midnight.
+        early_closes: Sessions closing early, epoch ns of local midnight.
+        tz: Exchange timezone.
+    """
+
+    def __init__(
+        self,
+        sessions: np.ndarray,
+        opens: np.ndarray,
+        closes: np.ndarray,
+        holidays: np.ndarray,
+        early_closes: np.ndarray,
+        tz: str,
+    ) -> None:
+        if not (len(sessions) == len(opens) == len(closes)):
+            raise ValueError("Calendar sessions, opens and closes must have the same length")
+        self.sessions = sessions
+        self.opens = opens
+        self.closes = closes
+        self.holidays = holidays
+        self.early_closes = early_closes
+        self.tz = tz
+
+    @classmethod
+    def nyse(cls, first_year: int = FIRST_YEAR, last_year: int = LAST_YEAR) -> "TradingCalendar":
+        """NYSE regular sessions (09:30-16:00 New York, 13:00 on early closes)."""
+        years = range(first_year, last_year + 1)
+        holidays = np.union1d(
+            _date_ns([day for year in years for day in nyse_holidays(year)]),
+            _date_ns(SPECIAL_CLOSURES),
+        )
+        early_closes = _date_ns([day for year in years for day in nyse_early_closes(year)])
+
+        days = np.arange(f"{first_year}-01-01", f"{last_year + 1}-01-01", dtype="datetime64[D]")
+        weekdays = days[np.is_busday(days)].astype("datetime64[ns]").view("int64")
+        sessions = weekdays[~np.isin(weekdays, holidays)]
+        holidays = holidays[(holidays >= weekdays[0]) & (holidays <= weekdays[-1])]
+        early_closes = early_closes[np.isin(early_closes, sessions)]
+
+        close_offset = np.where(np.isin(sessions, early_closes), EARLY_CLOSE_NS, REGULAR_CLOSE_NS)
+        return cls(
+            sessions,
+            _wall_to_utc(sessions + REGULAR_OPEN_NS, EXCHANGE_TIMEZONE),
+            _wall_to_utc(sessions + close_offset, EXCHANGE_TIMEZONE),
+            holidays,
+            early_closes,
+            EXCHANGE_TIMEZONE,
+        )
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def __repr__(self) -> str:
+        span = (
+            f"{from_epoch_ns(self.sessions[:1])[0].date()} to "
+            f"{from_epoch_ns(self.sessions[-1:])[0].date()}"
+            if len(self.sessions)
+            else "empty"
+        )
+        return f"TradingCalendar({len(self.sessions)} sessions, {self.tz}, {span})"
+
+    # --- Session dates ---
+
+    def is_session(self, dates: Dates) -> np.ndarray:
+        """True for each date (midnight) that is a trading session."""
+        days = _day_ns(dates)
+        pos = np.minimum(np.searchsorted(self.sessions, days), len(self.sessions) - 1)
+        return self.sessions[pos] == days
+
+    def sessions_in_range(self, start: Dates, end: Dates) -> pd.DatetimeIndex:
+        """Session dates from `start` to `end`, both inclusive."""
+        lo = np.searchsorted(self.sessions, _day_ns(start)[0], side="left")
+        hi = np.searchsorted(self.sessions, _day_ns(end)[0], side="right")
+        return from_epoch_ns(self.sessions[lo:hi])
+
+    def count_sessions(self, start: Dates, end: Dates) -> np.ndarray:
+        """Sessions in `[start, end)` for each pair of dates (element-wise)."""
+        return np.searchsorted(self.sessions, _day_ns(end)) - np.searchsorted(
+            self.sessions, _day_ns(start)
+        )
+
+    # --- Intraday timestamps ---
+
+    def session_of(self, timestamps: pd.Index | np.ndarray) -> np.ndarray:
+        """
+        Position in `sessions` of the session each UTC timestamp falls in
+        (open inclusive, close exclusive), or -1 outside regular hours.
+        """
+        ts = _epoch_ns(timestamps)
+        pos = np.searchsorted(self.opens, ts, side="right") - 1
+        inside = (pos >= 0) & (ts < self.closes[np.maximum(pos, 0)])
+        return np.where(inside, pos, -1)
+
+    def in_session(self, timestamps: pd.Index | np.ndarray) -> np.ndarray:
+        """True for each UTC timestamp inside a regular session."""
+        return self.session_of(timestamps) >= 0
+
+    def session_bounds(self, timestamps: pd.Index | np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Open and close (UTC epoch ns) of the session each timestamp falls in,
+        `NAT_NS` outside regular hours. E.g. `(close - ts)` is the time left
+        in the session for every bar.
+        """
+        pos = self.session_of(timestamps)
+        inside = pos >= 0
+        return (
+            np.where(inside, self.opens[pos], NAT_NS),
+            np.where(inside, self.closes[pos], NAT_NS),
+        )
+
+    def regular_hours(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Rows of an intraday bar frame that fall inside regular sessions."""
+        inside = self.in_session(df.index)
+        return df if inside.all() else df.iloc[inside]
+
+
+def _epoch_ns(values: pd.Index | np.ndarray) -> np.ndarray:
+    if isinstance(values, np.ndarray) and values.dtype == np.int64:
+        return values
+    return to_epoch_ns(pd.Index(values))
+
+
+def _day_ns(dates: Dates) -> np.ndarray:
+    """Date-like values (scalars, arrays or epoch ns) as epoch ns of midnight."""
+    if isinstance(dates, np.ndarray) and dates.dtype == np.int64:
+        return dates - dates % DAY_NS
+    if isinstance(dates, (str, pd.Timestamp, datetime.date)):
+        dates = [dates]
+    index = pd.DatetimeIndex(dates)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.normalize().as_unit("ns").asi8
+
+
+@cache
+def nyse_calendar() -> TradingCalendar:
+    """The shared NYSE calendar (built once per process)."""
+    return TradingCalendar.nyse()
+
+
+# --- Range slicing ---
+
+
+def slice_bounds(index: pd.Index, start: Dates | None, end: Dates | None) -> tuple[int, int]:
+    """Row positions `[lo, hi)` of a sorted index covering `[start, end)`."""
+    stamps = to_epoch_ns(index)
+    lo = 0 if start is None else int(np.searchsorted(stamps, _bound_ns(start)))
+    hi = len(stamps) if end is None else int(np.searchsorted(stamps, _bound_ns(end)))
+    return lo, max(lo, hi)
+
+
+def _bound_ns(value: Dates) -> int:
+    return int(to_epoch_ns(pd.DatetimeIndex([pd.Timestamp(value)]))[0])
+
+
+def slice_range(df: pd.DataFrame, start: Dates | None, end: Dates | None) -> pd.DataFrame:
+    """Rows of a time-sorted frame in `[start, end)`, found by binary search."""
+    lo, hi = slice_bounds(df.index, start, end)
+    return df.iloc[lo:hi]
+
+
+def slice_dates(df: pd.DataFrame, start_date: Dates | None, end_date: Dates | None) -> pd.DataFrame:
+    """Rows of a time-sorted frame from `start_date` through the whole of `end_date`."""
+    end = None if end_date is None else pd.Timestamp(end_date) + pd.Timedelta(days=1)
+    return slice_range(df, start_date, end)
@@ -0,0 +1,199 @@
+"""
+Array-only backtester for strategies that publish their signals up front.
+
+Rule strategies whose decisions are a pure function of price history can
+implement `BaseStrategy.generate_signals(ohlcv)`. It returns one target
+position per bar: 1 (long), 0 (flat), -1 (short), or NaN to keep the
+previous target. `run_signals` then simulates that position with arrays only,
+without a Python `next()` callback per bar.
+
+The fills follow backtesting.py's defaults, so results match a
+`Backtest(..., cash, commission)` run of the same logic trade for trade:
+
+- a target decided on bar i's close is filled at bar i+1's open. Backtesting.py
+  never calls `next()` on the first bar, so its signal is ignored. A signal on
+  the last bar is never filled;
+- entries buy (or sell short) as many whole units as the cash covers,
+  commission included, like `self.buy()` / `self.sell()` with no size;
+  reversing closes the open trade first;
+- commission is a relative fee, a `(fixed, relative)` pair, or a callable
+  `(size, price) -> fee` (e.g. `src.commission_models.ibkr_tiered_commission`).
+  It is charged at entry and at exit;
+- with `finalize_trades`, a trade still open at the end is closed at the last
+  bar's open, as `Backtest(..., finalize_trades=True)` does. Otherwise it stays
+  out of the trade list but counts in the equity curve.
+
+Not modelled: stop-loss/take-profit and trailing orders (strategies that use
+them stay on the event-driven engine), spread, margin/leverage, and the
+out-of-money stop.
+
+Only the position changes are visited in Python (each entry is sized from the
+cash left by the previous exit). The equity curve is filled with
+vectorised segment assignments.
+"""
+
+import sys
+from collections.abc import Callable
+from math import copysign
+
+import numpy as np
+import pandas as pd
+from backtesting._stats import compute_stats
+
+Commission = float | tuple[float, float] | Callable[[float, float], float]
+
+# Order size of backtesting.py's unsized `buy()`/`sell()`: all available cash.
+FULL_EQUITY = 1 - sys.float_info.epsilon
+
+
+def _commission_model(commission: Commission) -> Callable[[float, float], float]:
+    if callable(commission):
+        return commission
+    fixed, relative = commission if isinstance(commission, tuple) else (0.0, commission)
+    return lambda size, price: fixed + abs(size) * price * relative
+
+
+def signals_from_events(entries: np.ndarray, exits: np.ndarray, side: int = 1) -> np.ndarray:
+    """
+    Target positions for event-style rules: enter `side` where `entries`,
+    go flat where `exits` (entries win when both fire), hold otherwise.
+
+    This is the array form of the usual `next()` pattern
+    `if entry: (if not position: buy()) elif exit: (if position: close())`.
+    """
+    signals = np.full(len(entries), np.nan)
+    signals[np.asarray(exits, dtype=bool)] = 0.0
+    signals[np.asarray(entries, dtype=bool)] = float(side)
+    return signals
+
+
+def target_positions(signals: np.ndarray) -> np.ndarray:
+    """Signals with NaN forward-filled and the first bar flat, validated."""
+    target = np.asarray(signals, dtype=float).copy()
+    if target.ndim != 1:
+        raise ValueError(f"Signals must be one value per bar, got shape {target.shape}")
+    if len(target):
+        target[0] = 0.0
+    # Forward-fill NaN: index of the last non-NaN value at or before each bar.
+    last = np.where(np.isnan(target), 0, np.arange(len(target)))
+    target = target[np.maximum.accumulate(last)]
+    if not np.isin(target, (-1.0, 0.0, 1.0)).all():
+        raise ValueError("Signals must be 1 (long), 0 (flat), -1 (short) or NaN (hold)")
+    return target
+
+
+def simulate(
+    data: pd.DataFrame,
+    signals: np.ndarray,
+    cash: float = 10_000,
+    commission: Commission = 0.0,
+    finalize_trades: bool = False,
+) -> tuple[pd.DataFrame, np.ndarray]:
+    """
+    Simulates the target positions in `signals` over `data` (OHLC columns).
+
+    Returns:
+        The closed trades, in backtesting.py's `stats._trades` layout, and
+        the equity at every bar's close.
+    """
+    fee = _commission_model(commission)
+    open_ = data["Open"].to_numpy(dtype=float)
+    close = data["Close"].to_numpy(dtype=float)
+    n = len(close)
+    if len(signals) != n:
+        raise ValueError(f"Got {len(signals)} signals for {n} bars")
+
+    # The position held during bar j was decided at bar j-1's close.
+    held = np.zeros(n)
+    held[1:] = target_positions(signals)[:-1]
+    changes = np.flatnonzero(np.diff(held)) + 1
+
+    balance = np.empty(n)
+    units = np.zeros(n)
+    basis = np.zeros(n)
+    trades = []
+    size, entry_price, entry_bar = 0, 0.0, 0
+
+    def exit_trade(bar: int) -> None:
+        nonlocal cash, size
+        price = open_[bar]
+        pnl = size * (price - entry_price)
+        exit_fee = fee(size, price)
+        commissions = exit_fee + fee(size, entry_price)
+        cash += pnl - exit_fee
+        return_pct = copysign(1, size) * (price / entry_price - 1)
+        return_pct -= commissions / (abs(size) * entry_price)
+        trades.append(
+            (size, entry_bar, bar, entry_price, price, pnl - commissions, commissions, return_pct)
+        )
+        size = 0
+
+    segment_start = 0
+    for bar in changes:
+        balance[segment_start:bar] = cash
+        units[segment_start:bar] = size
+        basis[segment_start:bar] = entry_price
+        segment_start = bar
+
+        if size:
+            exit_trade(bar)
+        if held[bar]:
+            price = open_[bar]
+            order = copysign(FULL_EQUITY, held[bar])
+            per_unit = price + fee(order, price) / abs(order)
+            margin = max(0.0, cash)
+            wanted = int((margin * abs(order)) // per_unit)
+            # Like the broker, skip entries the cash cannot cover.
+            if wanted and wanted * per_unit <= margin:
+                size = int(copysign(wanted, order))
+                entry_price, entry_bar = price, bar
+                cash -= fee(size, price)
+
+    balance[segment_start:] = cash
+    units[segment_start:] = size
+    basis[segment_start:] = entry_price
+    # Unrealized P&L as the broker computes it: value at close minus cost.
+    equity = balance + (units * close - units * basis)
+
+    if finalize_trades and size:
+        exit_trade(n - 1)
+        equity[-1] = cash
+
+    records = np.array(trades, dtype=float).reshape(-1, 8).T
+    sizes, entry_bars, exit_bars = records[:3].astype(int)
+    entry_time, exit_time = data.index[entry_bars], data.index[exit_bars]
+    frame = pd.DataFrame(
+        {
+            "Size": sizes,
+            "EntryBar": entry_bars,
+            "ExitBar": exit_bars,
+            "EntryPrice": records[3],
+            "ExitPrice": records[4],
+            "SL": None,
+            "TP": None,
+            "PnL": records[5],
+            "Commission": records[6],
+            "ReturnPct": records[7],
+            "EntryTime": entry_time,
+            "ExitTime": exit_time,
+            "Duration": exit_time - entry_time,
+            "Tag": None,
+        }
+    )
+    return frame, equity
+
+
+def run_signals(
+    data: pd.DataFrame,
+    signals: np.ndarray,
+    cash: float = 10_000,
+    commission: Commission = 0.0,
+    finalize_trades: bool = False,
+) -> pd.Series:
+    """
+    Backtests `signals` over `data` and returns backtesting.py's statistics
+    (the same `pd.Series` as `Backtest.run()`, with `_trades` and
+    `_equity_curve`; `_strategy` is None).
+    """
+    trades, equity = simulate(data, signals, cash, commission, finalize_trades)
+    return compute_stats(trades, equity, data, strategy_instance=None)
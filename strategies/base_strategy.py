@@ -1,5 +1,7 @@
 from typing import Any
 
+import numpy as np
+import pandas as pd
 from backtesting.lib import TrailingStrategy
 
 from src.interfaces import IMarketAdapter
@@ -23,6 +25,8 @@ class BaseStrategy(TrailingStrategy):
     risk_percent: float = 0.01
     stop_loss_pct: float = 0.02
     take_profit_pct: float = 0.05
+    # Lookback of TrailingStrategy's ATR, which the trailing stop is built on.
+    atr_periods: int = 100
 
     def __init__(self, broker: Any, data: Any, params: dict) -> None:
         super().__init__(broker, data, params)
@@ -40,6 +44,14 @@ class BaseStrategy(TrailingStrategy):
             super().init()
             self.set_trailing_sl(self.stop_loss_pct)
 
+    def set_atr_periods(self, periods: int | None = None) -> None:
+        """
+        Computes TrailingStrategy's ATR over `periods` bars (`atr_periods` by
+        default). Change `atr_periods` rather than passing `periods`, so that
+        `warmup_bars` covers the window.
+        """
+        super().set_atr_periods(self.atr_periods if periods is None else periods)
+
     def next(self) -> None:
         """
         Main strategy logic loop. For backtesting only.
@@ -50,6 +62,25 @@ class BaseStrategy(TrailingStrategy):
             pass
         super().next()
 
+    @classmethod
+    def generate_signals(cls, ohlcv: pd.DataFrame) -> np.ndarray | None:
+        """
+        Optional vectorised form of the strategy, for the array-only
+        backtester in `src/vector_backtest.py`.
+
+        Strategies whose entries and exits are a pure function of price
+        history override this to return one target position per bar of
+        `ohlcv` (Backtesting.py column names, class-level parameters):
+        1 long, 0 flat, -1 short, NaN to keep the previous target. The
+        target on bar i must be what `next()` would decide at bar i's close.
+        A subclass that changes `next()` must override this as well.
+
+        Returns None (the default) when the strategy has no vectorised form,
+        e.g. because it relies on stops or on the broker's state. Such
+        strategies run on the event-driven engine.
+        """
+        return None
+
     def calculate_position_size(self) -> float:
         """Calculates the base position size."""
         return 0.1
@@ -71,12 +102,66 @@ class BaseStrategy(TrailingStrategy):
             self.buy(size=max(self.size_factor, 1e-3))
         self.entry_price = self.data.Close[-1]
 
+    @classmethod
+    def warmup_bars(cls) -> int:
+        """
+        Trailing bars, up to and including the current one, that `next()`
+        reads to decide on the next bar. A snapshot keeps this many bars
+        (see `src/strategy_state.py`), so a restarted strategy needs only
+        them plus the bars since.
+
+        The trailing stop trails the ATR of the last `atr_periods` true
+        ranges, so the base window is `atr_periods`. Children with indicators
+        return `max(their window, super().warmup_bars())`.
+        """
+        return cls.atr_periods
+
+    def get_state(self) -> dict[str, Any]:
+        """
+        Returns the strategy's derived state as JSON-serialisable values, for
+        warm-state snapshots (see `src/strategy_state.py`). Children that
+        keep more state extend it (call `super().get_state()`), in the same
+        way as `get_params`.
+
+        `trailing_stop` is the tightest stop of the open trades, where
+        TrailingStrategy keeps it (None when flat or trading live).
+        """
+        trailing_stop = None
+        if not self.market_adapter and self.trades:
+            stops = [trade.sl for trade in self.trades if trade.sl is not None]
+            if stops:
+                trailing_stop = max(stops) if self.position.is_long else min(stops)
+        return {
+            "entry_price": None if self.entry_price is None else float(self.entry_price),
+            "trailing_stop": None if trailing_stop is None else float(trailing_stop),
+            "size_factor": float(self.size_factor),
+        }
+
+    def set_state(self, state: dict[str, Any]) -> None:
+        """
+        Restores state returned by `get_state` (missing keys keep their
+        defaults). A restored `trailing_stop` is applied to the open trades,
+        so the stop keeps trailing from the level it had reached instead of
+        restarting from `stop_loss_pct`. It only ever tightens a stop.
+        """
+        self.entry_price = state.get("entry_price", self.entry_price)
+        self.size_factor = state.get("size_factor", self.size_factor)
+        trailing_stop = state.get("trailing_stop")
+        if trailing_stop is None or self.market_adapter:
+            return
+        for trade in self.trades:
+            if trade.is_long:
+                trade.sl = max(trade.sl or -np.inf, trailing_stop)
+            else:
+                trade.sl = min(trade.sl or np.inf, trailing_stop)
+
     def get_params(self) -> dict:
         """Returns a dictionary of the base strategy's parameters."""
         return {
             "risk_percent": self.risk_percent,
             "stop_loss_pct": self.stop_loss_pct,
             "take_profit_pct": self.take_profit_pct,
+            "atr_periods": self.atr_periods,
         }
 
     def buy_instrument(self, symbol: str, quantity: float) -> None:
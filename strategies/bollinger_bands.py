@@ -1,5 +1,6 @@
 import numpy as np
 
+from src import kernels
 from src.interfaces import IMarketAdapter
 from strategies.base_strategy import BaseStrategy
 
@@ -23,33 +24,38 @@ class BollingerBandsStrategy(BaseStrategy):
     bb_std_dev = 2.0  # Number of standard deviations for the bands
 
     def init(self, market_adapter: IMarketAdapter | None = None) -> None:
+        """
+        Initializes the strategy and computes the bands once, vectorised,
+        over the whole history (see `SimpleMACrossover.init`). Each bar's
+        current and previous bands are then lookups, whatever `bb_period` is.
+        """
         super().init(market_adapter=market_adapter)
+        close = np.asarray(self.data.Close, dtype=float)
+        # Middle Band (SMA) and population standard deviation (as np.std)
+        middle_band = kernels.rolling_mean(close, self.bb_period)
+        std_dev = kernels.rolling_std(close, self.bb_period, ddof=0)
+        # Lower Band (upper band unused — strategy exits at middle band, not upper)
+        lower_band = middle_band - (std_dev * self.bb_std_dev)
+        # Bands equal to the close up to rounding (flat stretches) are touches, not crosses
+        self.middle_band = kernels.snap_ties(middle_band, close)
+        self.lower_band = kernels.snap_ties(lower_band, close)
 
-    def next(self) -> None:
-        # Ensure we have enough data for Bollinger Bands calculation
-        if len(self.data.Close) < self.bb_period:
-            return
-
-        # Calculate Middle Band (SMA)
-        middle_band = np.mean(self.data.Close[-self.bb_period :])
-
-        # Calculate Standard Deviation
-        std_dev = np.std(self.data.Close[-self.bb_period :])
+    @classmethod
+    def warmup_bars(cls) -> int:
+        # The previous bar's bands reach bb_period + 1 bars back.
+        return max(cls.bb_period + 1, super().warmup_bars())
 
-        # Calculate Lower Band (upper band unused — strategy exits at middle band, not upper)
-        lower_band = middle_band - (std_dev * self.bb_std_dev)
+    def next(self) -> None:
+        i = len(self.data.Close) - 1
 
-        # Get previous values for crossover detection
-        if len(self.data.Close) < self.bb_period + 1:
+        # Ensure we have enough data for the previous bar's bands
+        if i < self.bb_period:
             return
 
-        # Previous Middle Band
-        middle_band_prev = np.mean(self.data.Close[-(self.bb_period + 1) : -1])
-
-        # Previous Lower Band
-        lower_band_prev = middle_band_prev - (
-            np.std(self.data.Close[-(self.bb_period + 1) : -1]) * self.bb_std_dev
-        )
+        middle_band = self.middle_band[i]
+        lower_band = self.lower_band[i]
+        middle_band_prev = self.middle_band[i - 1]
+        lower_band_prev = self.lower_band[i - 1]
 
         # Manual Crossover Logic
         cross_below_lower = (
@@ -1,8 +1,46 @@
+import math
+
 import numpy as np
+import pandas as pd
 
+from src import kernels
 from src.interfaces import IMarketAdapter
+from src.vector_backtest import signals_from_events
 from strategies.base_strategy import BaseStrategy
 
+# How `compute_rsi` averages gains and losses.
+RSI_SMOOTHING = {"simple": kernels.rolling_mean, "wilder": kernels.wilder}
+
+
+def compute_rsi(close: np.ndarray, period: int, smoothing: str = "simple") -> np.ndarray:
+    """
+    RSI of every bar, where bar `i` uses the `period` price changes up to `i`
+    (NaN before that).
+
+    "simple" averages gains and losses over the window (`kernels.rolling_mean`),
+    as the per-bar `np.mean` the strategy used to run. "wilder" uses Wilder's
+    smoothing (`kernels.wilder`). Where the
+    average loss is 0, RS is taken as 100 (strong upward momentum) instead of
+    dividing by zero, as before.
+    """
+    if smoothing not in RSI_SMOOTHING:
+        raise ValueError(
+            f"Unknown RSI smoothing {smoothing!r}; expected one of {list(RSI_SMOOTHING)}"
+        )
+    close = np.asarray(close, dtype=float)
+    delta = np.diff(close)
+    gains = delta * (delta > 0)
+    losses = -delta * (delta < 0)
+    smooth = RSI_SMOOTHING[smoothing]
+    avg_gain = smooth(gains, period)
+    avg_loss = smooth(losses, period)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = np.where(avg_loss == 0, 100.0, avg_gain / avg_loss)
+    rsi = np.full(close.shape, np.nan)
+    rsi[1:] = 100 - (100 / (1 + rs))
+    return rsi
+
 
 class RSI2PeriodStrategy(BaseStrategy):
     """
@@ -20,58 +58,64 @@ class RSI2PeriodStrategy(BaseStrategy):
 
     # --- Strategy-Specific Parameters ---
     rsi_period = 2
+    rsi_smoothing = "simple"  # "simple" (mean of the last rsi_period changes) or "wilder"
     oversold_threshold = 10
     overbought_threshold = 90
 
     def init(self, market_adapter: IMarketAdapter | None = None) -> None:
+        """
+        Initializes the strategy and computes the RSI once, vectorised, over
+        the whole history (see `SimpleMACrossover.init`). Each bar's current
+        and previous RSI are then lookups, whatever `rsi_period` is.
+        """
         super().init(market_adapter=market_adapter)
+        self.rsi = self._signal_rsi(self.data.Close)
 
-    def next(self) -> None:
-        # Ensure we have enough data for RSI calculation
-        # RSI(2) needs at least 2 periods for initial calculation, plus one more for previous value
-        if len(self.data.Close) <= self.rsi_period:
-            return
-
-        # Manual RSI calculation (simplified for 2-period)
-        # Price changes
-        delta = self.data.Close[-self.rsi_period :] - self.data.Close[-(self.rsi_period + 1) : -1]
-
-        # Gains and Losses
-        gains = delta * (delta > 0)
-        losses = -delta * (delta < 0)
-
-        # Average Gains and Losses (simple average for 2 periods)
-        avg_gain = np.mean(gains)
-        avg_loss = np.mean(losses)
-
-        if avg_loss == 0:
-            rs = 100  # Avoid division by zero, strong upward momentum
-        else:
-            rs = avg_gain / avg_loss
+    @classmethod
+    def warmup_bars(cls) -> int:
+        """
+        The previous bar's RSI needs `rsi_period + 2` closes. Wilder's
+        smoothing never forgets entirely, so it also gets the bars after
+        which the weight of its seed is below float resolution: from then on,
+        the RSI matches the full-history one to rounding. At least the
+        trailing stop's ATR window (`BaseStrategy.warmup_bars`).
+        """
+        bars = cls.rsi_period + 2
+        if cls.rsi_smoothing == "wilder" and cls.rsi_period > 1:
+            decay = 1 - 1 / cls.rsi_period
+            bars += math.ceil(math.log(np.finfo(float).eps) / math.log(decay))
+        return max(bars, super().warmup_bars())
+
+    @classmethod
+    def _signal_rsi(cls, close: np.ndarray) -> np.ndarray:
+        """The RSI, with values at a threshold up to rounding snapped onto it."""
+        rsi = compute_rsi(close, cls.rsi_period, cls.rsi_smoothing)
+        for threshold in (cls.oversold_threshold, cls.overbought_threshold):
+            rsi = kernels.snap_ties(rsi, threshold)
+        return rsi
+
+    @classmethod
+    def generate_signals(cls, ohlcv: pd.DataFrame) -> np.ndarray:
+        """
+        Long from an oversold cross until an overbought cross, as `next`
+        trades it (see `BaseStrategy.generate_signals`).
+        """
+        rsi = cls._signal_rsi(ohlcv["Close"])
+        entries = np.zeros(len(rsi), dtype=bool)
+        exits = np.zeros(len(rsi), dtype=bool)
+        entries[1:] = (rsi[:-1] >= cls.oversold_threshold) & (rsi[1:] < cls.oversold_threshold)
+        exits[1:] = (rsi[:-1] <= cls.overbought_threshold) & (rsi[1:] > cls.overbought_threshold)
+        return signals_from_events(entries, exits)
 
-        rsi_val = 100 - (100 / (1 + rs))
+    def next(self) -> None:
+        i = len(self.data.Close) - 1
 
-        # Get previous RSI value for crossover detection
-        # This requires re-calculating RSI for the previous bar
-        if (
-            len(self.data.Close) <= self.rsi_period + 1
-        ):  # Need 3 bars for current and previous RSI(2)
+        # The previous bar's RSI needs rsi_period price changes before it
+        if i <= self.rsi_period:
             return
 
-        delta_prev = (
-            self.data.Close[-(self.rsi_period + 1) : -1]
-            - self.data.Close[-(self.rsi_period + 2) : -2]
-        )
-        gains_prev = delta_prev * (delta_prev > 0)
-        losses_prev = -delta_prev * (delta_prev < 0)
-        avg_gain_prev = np.mean(gains_prev)
-        avg_loss_prev = np.mean(losses_prev)
-
-        if avg_loss_prev == 0:
-            rs_prev = 100
-        else:
-            rs_prev = avg_gain_prev / avg_loss_prev
-        rsi_prev = 100 - (100 / (1 + rs_prev))
+        rsi_val = self.rsi[i]
+        rsi_prev = self.rsi[i - 1]
 
         # Manual Crossover Logic for entry/exit
         cross_below_oversold = (
@@ -99,6 +143,7 @@ class RSI2PeriodStrategy(BaseStrategy):
         params.update(
             {
                 "rsi_period": self.rsi_period,
+                "rsi_smoothing": self.rsi_smoothing,
                 "oversold_threshold": self.oversold_threshold,
                 "overbought_threshold": self.overbought_threshold,
             }
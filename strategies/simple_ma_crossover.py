@@ -1,6 +1,9 @@
 import numpy as np
+import pandas as pd
 
+from src import kernels
 from src.interfaces import IMarketAdapter
+from src.vector_backtest import signals_from_events
 from strategies.base_strategy import BaseStrategy
 
 
@@ -25,31 +28,64 @@ class SimpleMACrossover(BaseStrategy):
 
     def init(self, market_adapter: IMarketAdapter | None = None) -> None:
         """
-        Initializes the strategy. We no longer pre-calculate or access
-        indicators here.
+        Initializes the strategy and computes both moving averages once,
+        vectorised, over the whole history.
+
+        A moving average at bar i only depends on bars up to i, so `next`
+        reads index i of the precomputed arrays. Averages that are equal up to
+        rounding are snapped together (`kernels.snap_ties`), so on flat
+        stretches a tie stays a tie instead of a one-ulp crossover.
+
+        They are plain arrays rather than `self.I` indicators because this
+        strategy also runs wrapped (by `SignalExecutor` and meta-strategies),
+        where backtesting.py does not slice a wrapped strategy's indicators
+        bar by bar.
         """
         # Call the parent class's init to set up risk management
         super().init(market_adapter=market_adapter)
+        self.fast_ma, self.slow_ma = self._moving_averages(self.data.Close)
+
+    @classmethod
+    def warmup_bars(cls) -> int:
+        # The previous bar's averages reach max(period) + 1 bars back.
+        return max(max(cls.fast_ma_period, cls.slow_ma_period) + 1, super().warmup_bars())
+
+    @classmethod
+    def _moving_averages(cls, close: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        close = np.asarray(close, dtype=float)
+        slow = kernels.rolling_mean(close, cls.slow_ma_period)
+        fast = kernels.snap_ties(kernels.rolling_mean(close, cls.fast_ma_period), slow)
+        return fast, slow
+
+    @classmethod
+    def generate_signals(cls, ohlcv: pd.DataFrame) -> np.ndarray:
+        """
+        Long from a crossover up until the next crossover down, as `next`
+        trades it (see `BaseStrategy.generate_signals`).
+        """
+        fast, slow = cls._moving_averages(ohlcv["Close"])
+        cross_up = np.zeros(len(fast), dtype=bool)
+        cross_down = np.zeros(len(fast), dtype=bool)
+        cross_up[1:] = (fast[:-1] <= slow[:-1]) & (fast[1:] > slow[1:])
+        cross_down[1:] = (fast[:-1] >= slow[:-1]) & (fast[1:] < slow[1:])
+        return signals_from_events(cross_up, cross_down)
 
     def next(self) -> None:
         """
         The main strategy logic loop, called for each data point (bar).
         """
-        # Ensure we have enough data for the longest SMA period
-        if len(self.data.Close) < self.slow_ma_period:
-            return
+        i = len(self.data.Close) - 1
 
-        # Calculate SMAs manually using numpy
-        fast_ma_val = np.mean(self.data.Close[-self.fast_ma_period :])
-        slow_ma_val = np.mean(self.data.Close[-self.slow_ma_period :])
-
-        # Get previous SMA values for crossover detection
-        # Ensure we have enough history for the previous bar's MAs
-        if len(self.data.Close) < self.slow_ma_period + 1:
+        # Ensure we have enough history for the previous bar's slow SMA
+        if i < self.slow_ma_period:
             return
 
-        fast_ma_prev = np.mean(self.data.Close[-(self.fast_ma_period + 1) : -1])
-        slow_ma_prev = np.mean(self.data.Close[-(self.slow_ma_period + 1) : -1])
+        fast_ma_val = self.fast_ma[i]
+        slow_ma_val = self.slow_ma[i]
+
+        # Previous SMA values for crossover detection
+        fast_ma_prev = self.fast_ma[i - 1]
+        slow_ma_prev = self.slow_ma[i - 1]
 
         # Manual Crossover Logic
         cross_up = fast_ma_prev <= slow_ma_prev and fast_ma_val > slow_ma_val
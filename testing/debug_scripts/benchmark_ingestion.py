@@ -0,0 +1,141 @@
+"""
+Timing comparison for data directory ingestion: the original serial per-file
+loop of `run_backtesting/benchmark.py` versus the serial path and the thread
+and process pools of `src.ingest.load_assets`.
+
+Every `load_assets` run gets its own empty quality cache, so no run is
+served reports validated by an earlier one.
+
+Usage:
+    python testing/debug_scripts/benchmark_ingestion.py --files 500 --rows 2500
+"""
+
+import argparse
+import glob
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path (this file lives at testing/debug_scripts/, so go up two)
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.ingest import discover_data_files, load_assets
+
+
+def write_synthetic_directory(directory: str, n_files: int, n_rows: int) -> None:
+    """Writes `n_files` single-asset CSVs in the data/benchmark layout."""
+    dates = pd.bdate_range("2010-01-01", periods=n_rows, name="Date")
+    rng = np.random.default_rng(0)
+    for i in range(n_files):
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_rows)))
+        df = pd.DataFrame(
+            {
+                "Close": close,
+                "High": close * 1.01,
+                "Low": close * 0.99,
+                "Open": close,
+                "Volume": rng.integers(1_000_000, 5_000_000, n_rows),
+            },
+            index=dates,
+        )
+        df.to_csv(os.path.join(directory, f"T{i:04d}_2010-01-01_2020-01-01.csv"))
+
+
+def original_load_directory(data_path: str) -> dict[str, dict[str, Any]]:
+    """
+    The directory loop `run_backtesting/benchmark.py` used before
+    `src.ingest` existed (per-asset prints removed).
+    """
+    assets_map: dict[str, dict[str, Any]] = {}
+    for file_path in glob.glob(os.path.join(data_path, "*.csv")):
+        try:
+            with open(file_path) as f:
+                header_line_1 = f.readline()
+                header_line_2 = f.readline()
+
+            if "Ticker" in header_line_2 or "Price" in header_line_1:
+                full_data = pd.read_csv(file_path, header=[0, 1], index_col=0)
+                full_data.index.name = "date"
+                for ticker in full_data.columns.get_level_values(1).unique().tolist():
+                    df = pd.DataFrame()
+                    try:
+                        for col in ["Open", "High", "Low", "Close", "Volume"]:
+                            df[col] = full_data[(col, ticker)]
+                    except KeyError:
+                        continue
+                    df = df.apply(pd.to_numeric, errors="coerce")
+                    df.dropna(inplace=True)
+                    if not isinstance(df.index, pd.DatetimeIndex):
+                        df.index = pd.to_datetime(df.index, utc=True)
+                    if isinstance(df.index, pd.DatetimeIndex):
+                        df.index = df.index.tz_localize(None)
+                    assets_map[ticker] = {"data": df, "source": os.path.basename(file_path)}
+            else:
+                df = pd.read_csv(file_path)
+                asset_name = Path(file_path).stem.split("_")[0]
+                df.columns = [col.capitalize() for col in df.columns]
+                if "Date" in df.columns:
+                    df["Date"] = pd.to_datetime(df["Date"], utc=True)
+                    df.set_index("Date", inplace=True)
+                if isinstance(df.index, pd.DatetimeIndex):
+                    df.index = df.index.tz_localize(None)
+                df.dropna(inplace=True)
+                assets_map[asset_name] = {"data": df, "source": os.path.basename(file_path)}
+        except Exception as e:
+            print(f"Error loading {file_path}: {e}")
+    return assets_map
+
+
+def time_original(directory: str) -> tuple[float, int]:
+    start = time.perf_counter()
+    assets_map = original_load_directory(directory)
+    return time.perf_counter() - start, len(assets_map)
+
+
+def time_load(files: list[str], workers: int, executor: str) -> tuple[float, int]:
+    with tempfile.TemporaryDirectory() as quality_dir:
+        start = time.perf_counter()
+        assets_map = load_assets(
+            files, workers=workers, executor=executor, verbose=False, quality_dir=quality_dir
+        )
+        return time.perf_counter() - start, len(assets_map)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark parallel CSV ingestion.")
+    parser.add_argument("--files", type=int, default=500, help="Number of CSV files.")
+    parser.add_argument("--rows", type=int, default=2500, help="Rows per CSV file.")
+    parser.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1, help="Pool size to compare."
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"Writing {args.files} files x {args.rows} rows to {directory}...")
+        write_synthetic_directory(directory, args.files, args.rows)
+        files = discover_data_files(directory)
+
+        rows = []
+        original_time, n_assets = time_original(directory)
+        rows.append(("original loop", 1, original_time, n_assets))
+        elapsed, n_assets = time_load(files, workers=1, executor="process")
+        rows.append(("serial", 1, elapsed, n_assets))
+        for executor in ["thread", "process"]:
+            elapsed, n_assets = time_load(files, workers=args.workers, executor=executor)
+            rows.append((executor, args.workers, elapsed, n_assets))
+
+    results = pd.DataFrame(rows, columns=["Mode", "Workers", "Time [s]", "Assets"])
+    results["Speedup"] = original_time / results["Time [s]"]
+    print(results.round(3).to_markdown(index=False))
+
+
+if __name__ == "__main__":
+    main()
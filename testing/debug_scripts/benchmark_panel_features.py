@@ -0,0 +1,89 @@
+"""
+Feature computation for a ticker universe: the per-ticker
+`calculate_features` loop versus one `calculate_panel_features` call on an
+aligned `Panel`.
+
+Usage:
+    python testing/debug_scripts/benchmark_panel_features.py --tickers 500 --bars 2000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path (this file lives at testing/debug_scripts/, so go up two)
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.feature_engineering import FeatureEngineer
+from src.panel import Panel
+
+
+def make_universe(n_tickers: int, n_bars: int) -> dict[str, pd.DataFrame]:
+    """Daily bars for `n_tickers` synthetic assets with staggered listing dates."""
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range("2010-01-04", periods=n_bars, name="Date")
+    frames = {}
+    for i in range(n_tickers):
+        start = int(rng.integers(0, n_bars // 4))
+        n = n_bars - start
+        close = 50 * np.exp(np.cumsum(rng.normal(0, 0.015, n)))
+        frames[f"T{i:04d}"] = pd.DataFrame(
+            {
+                "Open": close * (1 + rng.normal(0, 0.002, n)),
+                "High": close * 1.01,
+                "Low": close * 0.99,
+                "Close": close,
+                "Volume": rng.integers(1_000, 100_000, n),
+            },
+            index=dates[start:],
+        )
+    return frames
+
+
+def per_ticker(fe: FeatureEngineer, frames: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """The loop a training script runs today: one pandas pipeline per ticker."""
+    parts = {
+        name: fe.calculate_features(df.rename(columns=str.lower)) for name, df in frames.items()
+    }
+    long = pd.concat(parts, names=["Asset", "Date"]).swaplevel().sort_index()
+    return long.astype("float64")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark batched panel features.")
+    parser.add_argument("--tickers", type=int, default=500, help="Assets in the universe.")
+    parser.add_argument("--bars", type=int, default=2000, help="Bars per asset (at most).")
+    args = parser.parse_args()
+
+    fe = FeatureEngineer()
+    frames = make_universe(args.tickers, args.bars)
+
+    start = time.perf_counter()
+    loop = per_ticker(fe, frames)
+    loop_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    panel = Panel.from_frames(frames)
+    align_s = time.perf_counter() - start
+    start = time.perf_counter()
+    batched = fe.calculate_panel_features(panel)
+    batch_s = time.perf_counter() - start
+
+    pd.testing.assert_frame_equal(batched.sort_index(), loop, rtol=1e-9)
+    print(f"{args.tickers} tickers x up to {args.bars} bars ({len(batched):,} feature rows)")
+    print(f"  per-ticker calculate_features loop: {loop_s:7.3f}s")
+    print(f"  Panel.from_frames (alignment):      {align_s:7.3f}s")
+    print(
+        f"  calculate_panel_features:           {batch_s:7.3f}s "
+        f"({loop_s / batch_s:.1f}x, {loop_s / (align_s + batch_s):.1f}x incl. alignment)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Per-bar cost of the public strategies: indicators recomputed with NumPy over
+slices on every bar (the original implementations, kept here as the
+reference) versus indicators precomputed once in `init`.
+
+Both versions are backtested on the same bars and must make the same trades
+(`testing/test_strategy_indicators.py` checks this on the benchmark CSVs).
+
+Usage:
+    python testing/debug_scripts/benchmark_strategy_indicators.py --bars 20000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from backtesting import Backtest
+
+# Add project root to path (this file lives at testing/debug_scripts/, so go up two)
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.commission_models import ibkr_tiered_commission
+from src.interfaces import IMarketAdapter
+from strategies.base_strategy import BaseStrategy
+from strategies.bollinger_bands import BollingerBandsStrategy
+from strategies.rsi_2_period import RSI2PeriodStrategy
+from strategies.simple_ma_crossover import SimpleMACrossover
+
+TRADE_COLUMNS = ["Size", "EntryBar", "ExitBar", "EntryPrice", "ExitPrice"]
+
+
+class LegacySimpleMACrossover(SimpleMACrossover):
+    """`SimpleMACrossover` as it was: four `np.mean` calls over slices per bar."""
+
+    def init(self, market_adapter: IMarketAdapter | None = None) -> None:
+        BaseStrategy.init(self, market_adapter=market_adapter)
+
+    def next(self) -> None:
+        if len(self.data.Close) < self.slow_ma_period:
+            return
+
+        fast_ma_val = np.mean(self.data.Close[-self.fast_ma_period :])
+        slow_ma_val = np.mean(self.data.Close[-self.slow_ma_period :])
+
+        if len(self.data.Close) < self.slow_ma_period + 1:
+            return
+
+        fast_ma_prev = np.mean(self.data.Close[-(self.fast_ma_period + 1) : -1])
+        slow_ma_prev = np.mean(self.data.Close[-(self.slow_ma_period + 1) : -1])
+
+        cross_up = fast_ma_prev <= slow_ma_prev and fast_ma_val > slow_ma_val
+        cross_down = fast_ma_prev >= slow_ma_prev and fast_ma_val < slow_ma_val
+
+        if cross_up:
+            if not self.position:
+                self._default_buy()
+        elif cross_down:
+            if self.position:
+                self.position.close()
+
+
+class LegacyBollingerBandsStrategy(BollingerBandsStrategy):
+    """`BollingerBandsStrategy` as it was: `np.mean`/`np.std` over two slices per bar."""
+
+    def init(self, market_adapter: IMarketAdapter | None = None) -> None:
+        BaseStrategy.init(self, market_adapter=market_adapter)
+
+    def next(self) -> None:
+        if len(self.data.Close) < self.bb_period:
+            return
+
+        middle_band = np.mean(self.data.Close[-self.bb_period :])
+        std_dev = np.std(self.data.Close[-self.bb_period :])
+        lower_band = middle_band - (std_dev * self.bb_std_dev)
+
+        if len(self.data.Close) < self.bb_period + 1:
+            return
+
+        middle_band_prev = np.mean(self.data.Close[-(self.bb_period + 1) : -1])
+        lower_band_prev = middle_band_prev - (
+            np.std(self.data.Close[-(self.bb_period + 1) : -1]) * self.bb_std_dev
+        )
+
+        cross_below_lower = (
+            self.data.Close[-2] >= lower_band_prev and self.data.Close[-1] < lower_band
+        )
+        cross_above_middle = (
+            self.data.Close[-2] <= middle_band_prev and self.data.Close[-1] > middle_band
+        )
+
+        if cross_below_lower:
+            if not self.position:
+                self._default_buy()
+        elif cross_above_middle:
+            if self.position:
+                self.position.close()
+
+        BaseStrategy.next(self)
+
+
+class LegacyRSI2PeriodStrategy(RSI2PeriodStrategy):
+    """`RSI2PeriodStrategy` as it was: simple-mean RSI rebuilt from slices for two bars."""
+
+    def init(self, market_adapter: IMarketAdapter | None = None) -> None:
+        BaseStrategy.init(self, market_adapter=market_adapter)
+
+    def _rsi(self, delta: np.ndarray) -> float:
+        gains = delta * (delta > 0)
+        losses = -delta * (delta < 0)
+        avg_gain = np.mean(gains)
+        avg_loss = np.mean(losses)
+        rs = 100 if avg_loss == 0 else avg_gain / avg_loss
+        return 100 - (100 / (1 + rs))
+
+    def next(self) -> None:
+        if len(self.data.Close) <= self.rsi_period + 1:
+            return
+
+        rsi_val = self._rsi(
+            self.data.Close[-self.rsi_period :] - self.data.Close[-(self.rsi_period + 1) : -1]
+        )
+        rsi_prev = self._rsi(
+            self.data.Close[-(self.rsi_period + 1) : -1]
+            - self.data.Close[-(self.rsi_period + 2) : -2]
+        )
+
+        cross_below_oversold = (
+            rsi_prev >= self.oversold_threshold and rsi_val < self.oversold_threshold
+        )
+        cross_above_overbought = (
+            rsi_prev <= self.overbought_threshold and rsi_val > self.overbought_threshold
+        )
+
+        if cross_below_oversold:
+            if not self.position:
+                self._default_buy()
+        elif cross_above_overbought:
+            if self.position:
+                self.position.close()
+
+
+# (reference, current) implementations of each public strategy.
+STRATEGY_PAIRS = [
+    (LegacySimpleMACrossover, SimpleMACrossover),
+    (LegacyBollingerBandsStrategy, BollingerBandsStrategy),
+    (LegacyRSI2PeriodStrategy, RSI2PeriodStrategy),
+]
+
+
+def make_bars(n_bars: int, seed: int = 0) -> pd.DataFrame:
+    """Synthetic daily OHLCV bars in the Backtesting.py layout."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_bars)))
+    return pd.DataFrame(
+        {
+            "Open": close * (1 + rng.normal(0, 0.002, n_bars)),
+            "High": close * 1.01,
+            "Low": close * 0.99,
+            "Close": close,
+            "Volume": rng.integers(1_000, 100_000, n_bars),
+        },
+        index=pd.date_range("2000-01-03", periods=n_bars, freq="D", name="Date"),
+    )
+
+
+def run(strategy: type, data: pd.DataFrame) -> tuple[pd.DataFrame, float]:
+    """Backtests `strategy` on `data`; returns its trades and the run time."""
+    bt = Backtest(
+        data, strategy, cash=10_000, commission=ibkr_tiered_commission, finalize_trades=True
+    )
+    start = time.perf_counter()
+    stats = bt.run()
+    elapsed = time.perf_counter() - start
+    return stats._trades[TRADE_COLUMNS].reset_index(drop=True), elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark precomputed strategy indicators.")
+    parser.add_argument("--bars", type=int, default=20_000, help="Bars to backtest.")
+    args = parser.parse_args()
+
+    data = make_bars(args.bars)
+    print(f"{args.bars:,} bars")
+    for legacy, current in STRATEGY_PAIRS:
+        legacy_trades, legacy_s = run(legacy, data)
+        trades, current_s = run(current, data)
+        pd.testing.assert_frame_equal(trades, legacy_trades)
+        print(
+            f"  {current.__name__:<24} per-bar slices: {legacy_s / args.bars * 1e6:6.1f} us/bar   "
+            f"precomputed: {current_s / args.bars * 1e6:6.1f} us/bar   "
+            f"({legacy_s / current_s:.1f}x, {len(trades)} identical trades)"
+        )
+
+
+if __name__ == "__main__":
+    main()
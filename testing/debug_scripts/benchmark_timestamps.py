@@ -0,0 +1,86 @@
+"""
+Load-time comparison for intraday bar files: the former per-consumer
+timestamp handling (`pd.to_datetime(..., utc=True)` + `tz_localize(None)`)
+versus the canonical `parse_timestamps` ingest step and the bar store.
+
+Usage:
+    python testing/debug_scripts/benchmark_timestamps.py --rows 200000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path (this file lives at testing/debug_scripts/, so go up two)
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.bar_store import import_csv, read_bars, read_csv_bars
+
+
+def write_minute_csv(path: str, n_rows: int) -> None:
+    """Writes 1-minute bars stamped like IB exports ('2024-03-08 09:30:00-05:00')."""
+    index = pd.date_range("2020-01-02 09:30", periods=n_rows, freq="min", tz="America/New_York")
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, n_rows)))
+    pd.DataFrame(
+        {
+            "Open": close,
+            "High": close * 1.001,
+            "Low": close * 0.999,
+            "Close": close,
+            "Volume": rng.integers(100, 10_000, n_rows),
+        },
+        index=index.rename("date"),
+    ).to_csv(path)
+
+
+def legacy_load(path: str) -> pd.DataFrame:
+    """The timestamp handling consumers used to repeat on every load."""
+    df = pd.read_csv(path, header=0, index_col=0, parse_dates=True)
+    df.index = pd.to_datetime(df.index, utc=True).tz_localize(None)
+    df.index.name = "Date"
+    return df
+
+
+def best_of(func, path: str, repeat: int) -> tuple[float, pd.DataFrame]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(path)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark timestamp handling on load.")
+    parser.add_argument("--rows", type=int, default=200_000, help="Minute bars in the file.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per variant (best is kept).")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, "SPY_1min.csv")
+        write_minute_csv(csv_path, args.rows)
+        store_path = import_csv(csv_path, tz="America/New_York")
+
+        legacy_s, legacy = best_of(legacy_load, csv_path, args.repeat)
+        canonical_s, canonical = best_of(read_csv_bars, csv_path, args.repeat)
+        store_s, stored = best_of(read_bars, store_path, args.repeat)
+
+    assert legacy.index.equals(canonical.index) and canonical.index.equals(stored.index)
+    print(f"{args.rows:,} minute bars with UTC offsets")
+    print(f"  legacy to_datetime + tz_localize: {legacy_s:7.3f}s")
+    print(
+        f"  canonical parse_timestamps (CSV): {canonical_s:7.3f}s ({legacy_s / canonical_s:.1f}x)"
+    )
+    print(f"  bar store (int64 epoch):          {store_s:7.3f}s ({legacy_s / store_s:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
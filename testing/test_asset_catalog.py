@@ -0,0 +1,113 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import asset_catalog
+from src.bar_store import write_bars
+
+
+def make_bars(n_rows: int) -> pd.DataFrame:
+    dates = pd.bdate_range("2022-01-03", periods=n_rows, name="Date")
+    close = np.linspace(100, 110, n_rows)
+    return pd.DataFrame(
+        {"Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": 1000},
+        index=dates,
+    )
+
+
+class TestAssetCatalog(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = os.path.join(self.tmp.name, "data")
+        self.catalog_dir = os.path.join(self.tmp.name, "catalog")
+        os.makedirs(self.dir)
+
+        self.single_path = os.path.join(self.dir, "SPY_2022.csv")
+        make_bars(10).to_csv(self.single_path)
+
+        bars = make_bars(5)
+        pair = pd.concat({"PEP": bars, "KO": bars}, axis=1, names=["Ticker", "Price"])
+        self.pair_path = os.path.join(self.dir, "PEP_KO.csv")
+        pair.swaplevel(axis=1).to_csv(self.pair_path)
+
+        self.store_path = os.path.join(self.dir, "QQQ.parquet")
+        write_bars(make_bars(7), self.store_path)
+
+        self.files = [self.single_path, self.pair_path, self.store_path]
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_entries_describe_each_layout(self) -> None:
+        print("\n--- Testing Asset Catalog ---")
+        catalog = asset_catalog.catalog_files(self.files, self.catalog_dir)
+
+        single = catalog[self.single_path]
+        self.assertEqual(single["layout"], asset_catalog.LAYOUT_SINGLE)
+        self.assertEqual(single["tickers"], ["SPY"])
+        self.assertEqual(single["rows"], 10)
+        self.assertTrue(single["start"].startswith("2022-01-03"))
+
+        pair = catalog[self.pair_path]
+        self.assertEqual(pair["layout"], asset_catalog.LAYOUT_MULTI)
+        self.assertEqual(sorted(pair["tickers"]), ["KO", "PEP"])
+        self.assertEqual(pair["rows"], 5)
+
+        store = catalog[self.store_path]
+        self.assertEqual(store["tickers"], ["QQQ"])
+        self.assertEqual(store["rows"], 7)
+        self.assertIn("Close", store["columns"])
+
+        # The catalog lives in the cache, not next to the data
+        self.assertEqual(sorted(os.listdir(self.dir)), sorted(map(os.path.basename, self.files)))
+        self.assertTrue(os.path.exists(asset_catalog.catalog_path(self.dir, self.catalog_dir)))
+        print("Catalog records layout, tickers, rows and date range.")
+
+    def test_only_changed_files_are_rescanned(self) -> None:
+        asset_catalog.catalog_files(self.files, self.catalog_dir)
+
+        with patch.object(
+            asset_catalog, "describe_file", wraps=asset_catalog.describe_file
+        ) as describe:
+            asset_catalog.catalog_files(self.files, self.catalog_dir)
+            self.assertEqual(describe.call_count, 0)
+
+            make_bars(12).to_csv(self.single_path)
+            catalog = asset_catalog.catalog_files(self.files, self.catalog_dir)
+            describe.assert_called_once_with(self.single_path)
+        self.assertEqual(catalog[self.single_path]["rows"], 12)
+
+    def test_default_catalog_dir_is_the_projects(self) -> None:
+        # Not relative to the working directory, so every caller shares one catalog.
+        project_data = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+        self.assertTrue(os.path.isabs(asset_catalog.DEFAULT_CATALOG_DIR))
+        self.assertEqual(
+            os.path.dirname(os.path.dirname(asset_catalog.DEFAULT_CATALOG_DIR)),
+            os.path.abspath(project_data),
+        )
+
+    def test_unparseable_files_are_skipped(self) -> None:
+        broken_path = os.path.join(self.dir, "IWM.parquet")
+        with open(broken_path, "wb") as f:
+            f.write(b"not parquet")
+
+        for _ in range(2):
+            catalog = asset_catalog.catalog_files(self.files + [broken_path], self.catalog_dir)
+            self.assertEqual(sorted(catalog), sorted(self.files))
+        with open(asset_catalog.catalog_path(self.dir, self.catalog_dir)) as f:
+            self.assertNotIn("IWM.parquet", json.load(f))
+        with self.assertRaises(ValueError):
+            asset_catalog.lookup(broken_path, self.catalog_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
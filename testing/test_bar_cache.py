@@ -0,0 +1,111 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.bar_cache import BarCache, missing_ranges
+
+
+class FakeFetcher:
+    """Serves business-day bars for any range and records every request."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[tuple[str, ...], str, str]] = []
+
+    def __call__(self, tickers: list[str], start: str, end: str) -> dict[str, pd.DataFrame]:
+        self.calls.append((tuple(tickers), start, end))
+        dates = pd.bdate_range(start, pd.Timestamp(end) - pd.Timedelta(days=1), name="Date")
+        close = np.arange(len(dates), dtype=float) + 100
+        frame = pd.DataFrame(
+            {"Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": 1000},
+            index=dates,
+        )
+        return {ticker: frame for ticker in tickers}
+
+
+class TestBarCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.fetcher = FakeFetcher()
+        self.cache = BarCache(self.tmp.name, fetcher=self.fetcher)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_missing_ranges(self) -> None:
+        ts = pd.Timestamp
+        covered = [(ts("2020-01-01"), ts("2020-02-01")), (ts("2020-03-01"), ts("2020-04-01"))]
+        gaps = missing_ranges(covered, ts("2019-12-01"), ts("2020-05-01"))
+        self.assertEqual(
+            gaps,
+            [
+                (ts("2019-12-01"), ts("2020-01-01")),
+                (ts("2020-02-01"), ts("2020-03-01")),
+                (ts("2020-04-01"), ts("2020-05-01")),
+            ],
+        )
+
+    def test_only_gaps_are_downloaded(self) -> None:
+        print("\n--- Testing Range-Aware Cache ---")
+        first = self.cache.get("SPY", "2020-01-01", "2020-06-01")
+        self.assertIsNotNone(first)
+        self.assertEqual(len(self.fetcher.calls), 1)
+
+        # Extending the range by one week only fetches that week.
+        self.cache.get("SPY", "2020-01-01", "2020-06-08")
+        self.assertEqual(self.fetcher.calls[-1], (("SPY",), "2020-06-01", "2020-06-08"))
+
+        # Any sub-range is served from disk without a download.
+        sub = self.cache.get("SPY", "2020-02-03", "2020-02-08")
+        self.assertEqual(len(self.fetcher.calls), 2)
+        assert sub is not None
+        self.assertEqual(len(sub), 5)
+        self.assertEqual(sub.index[0], pd.Timestamp("2020-02-03"))
+        print("Cache only downloads uncovered ranges and slices sub-ranges.")
+
+    def test_quality_reports_live_in_cache_dir(self) -> None:
+        self.cache.get("SPY", "2020-01-01", "2020-02-01")
+        self.assertEqual(self.cache.quality_dir, os.path.join(self.tmp.name, "quality"))
+        self.assertTrue(os.listdir(self.cache.quality_dir))
+
+    def test_tickers_with_same_gap_share_one_download(self) -> None:
+        frames = self.cache.get_many(["AAPL", "MSFT"], "2021-01-01", "2021-02-01")
+        self.assertEqual(set(frames), {"AAPL", "MSFT"})
+        self.assertEqual(len(self.fetcher.calls), 1)
+
+    def test_refresh_redownloads_range(self) -> None:
+        self.cache.get("SPY", "2020-01-01", "2020-02-01")
+        self.cache.get("SPY", "2020-01-01", "2020-02-01", refresh=True)
+        self.assertEqual(len(self.fetcher.calls), 2)
+
+    def test_lru_eviction_respects_pins(self) -> None:
+        print("\n--- Testing Cache Eviction ---")
+        for ticker in ["SPY", "NVDA", "AMD"]:
+            self.cache.get(ticker, "2020-01-01", "2020-03-01")
+        # Touch NVDA again so AMD becomes the least recently used unpinned entry.
+        self.cache.get("NVDA", "2020-01-01", "2020-02-01")
+
+        sizes = {t: os.path.getsize(self.cache.path_for(t)) for t in ["SPY", "NVDA", "AMD"]}
+        budget = sum(sizes.values()) - 1
+
+        # SPY is the oldest entry but pinned, so AMD goes first.
+        evicted = self.cache.evict(budget, pinned={"SPY"})
+        self.assertEqual(evicted, ["AMD"])
+        self.assertTrue(os.path.exists(self.cache.path_for("SPY")))
+        self.assertFalse(os.path.exists(self.cache.path_for("AMD")))
+
+        # Even a zero budget never removes pinned tickers.
+        self.cache.evict(0, pinned={"SPY"})
+        self.assertTrue(os.path.exists(self.cache.path_for("SPY")))
+        self.assertFalse(os.path.exists(self.cache.path_for("NVDA")))
+        print("LRU eviction honors the budget and pinned tickers.")
+
+
+if __name__ == "__main__":
+    unittest.main()
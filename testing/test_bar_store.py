@@ -0,0 +1,127 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.bar_store import (
+    INDEX_COLUMN,
+    NAT_NS,
+    export_csv,
+    import_csv,
+    migrate_directory,
+    parse_timestamps,
+    read_bars,
+    read_csv_bars,
+    write_bars,
+)
+
+
+class TestBarStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        dates = pd.date_range(start="2024-01-01", periods=50, freq="D", name="Date")
+        close = 100 + np.cumsum(np.random.randn(50))
+        self.df = pd.DataFrame(
+            {
+                "Open": close - 0.5,
+                "High": close + 1.0,
+                "Low": close - 1.0,
+                "Close": close,
+                "Volume": np.random.randint(1_000, 10_000, 50).astype(float),
+            },
+            index=dates,
+        )
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_round_trip_types(self) -> None:
+        print("\n--- Testing Bar Store Round Trip ---")
+        path = write_bars(self.df, os.path.join(self.dir, "SPY_2024-01-01_2024-02-20.parquet"))
+
+        schema = pq.read_schema(path)
+        self.assertEqual(str(schema.field(INDEX_COLUMN).type), "int64")
+        self.assertEqual(str(schema.field("Close").type), "double")
+        self.assertEqual(str(schema.field("Volume").type), "int64")
+
+        loaded = read_bars(path)
+        self.assertIsInstance(loaded.index, pd.DatetimeIndex)
+        self.assertEqual(loaded.index.name, "Date")
+        pd.testing.assert_index_equal(loaded.index, self.df.index)
+        np.testing.assert_array_equal(loaded["Close"].to_numpy(), self.df["Close"].to_numpy())
+        print("Typed columns and epoch index round-trip correctly.")
+
+    def test_csv_import_export(self) -> None:
+        print("\n--- Testing CSV Import/Export ---")
+        # yfinance multi-header layout (Price / Ticker / Date rows)
+        csv_path = os.path.join(self.dir, "KO_daily.csv")
+        with open(csv_path, "w") as f:
+            f.write("Price,Close,High,Low,Open,Volume\n")
+            f.write("Ticker,KO,KO,KO,KO,KO\n")
+            f.write("Date,,,,,\n")
+            f.write("2010-01-04,17.5,17.6,17.4,17.5,13870400\n")
+            f.write("2010-01-05,17.3,17.5,17.2,17.4,23172400\n")
+
+        parsed = read_csv_bars(csv_path)
+        self.assertEqual(len(parsed), 2)
+        self.assertIn("Close", parsed.columns)
+
+        store_path = import_csv(csv_path)
+        self.assertTrue(store_path.endswith(".parquet"))
+        loaded = read_bars(store_path)
+        self.assertEqual(loaded["Volume"].dtype, np.int64)
+
+        exported = export_csv(store_path, os.path.join(self.dir, "KO_export.csv"))
+        reparsed = read_csv_bars(exported)
+        pd.testing.assert_frame_equal(reparsed, loaded, check_dtype=False, check_freq=False)
+        print("CSV import and export preserve the bars.")
+
+    def test_migrate_directory_is_idempotent(self) -> None:
+        print("\n--- Testing Directory Migration ---")
+        self.df.to_csv(os.path.join(self.dir, "AAPL_2024-01-01_2024-02-20.csv"))
+
+        first = migrate_directory(self.dir)
+        second = migrate_directory(self.dir)
+        self.assertEqual(len(first), 1)
+        self.assertEqual(second, [])
+        print("Migration writes each file once.")
+
+    def test_parse_timestamps_is_canonical(self) -> None:
+        print("\n--- Testing Canonical Timestamp Parsing ---")
+        local = pd.date_range("2024-03-08 09:30", periods=500, freq="h", tz="America/New_York")
+        raw = pd.Index(local.astype(str), dtype=object)  # '2024-03-08 09:30:00-05:00'
+        reference = pd.to_datetime(raw, utc=True).as_unit("ns").asi8
+        np.testing.assert_array_equal(parse_timestamps(raw), reference)
+
+        # Label rows become NaT; naive values are read in the exchange timezone.
+        mixed = parse_timestamps(["Date", raw[0], "2024-03-08 09:30:00"], tz="America/New_York")
+        self.assertEqual(mixed[0], NAT_NS)
+        self.assertEqual(mixed[1], mixed[2])
+        print("Offset and naive timestamps are converted to one UTC epoch representation.")
+
+    def test_timezone_metadata_round_trip(self) -> None:
+        csv_path = os.path.join(self.dir, "SPY_1hour.csv")
+        with open(csv_path, "w") as f:
+            f.write("date,Open,High,Low,Close,Volume\n")
+            f.write("2024-07-01 09:30:00,1,2,0.5,1.5,100\n")
+
+        store_path = import_csv(csv_path, tz="America/New_York")
+        loaded = read_bars(store_path)
+        self.assertEqual(loaded.attrs["timezone"], "America/New_York")
+        self.assertEqual(loaded.index[0], pd.Timestamp("2024-07-01 13:30"))
+
+        # The timezone travels with the frame when it is written again.
+        copy_path = write_bars(loaded, os.path.join(self.dir, "copy.parquet"))
+        self.assertEqual(read_bars(copy_path).attrs["timezone"], "America/New_York")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.bar_store import read_bars, write_bars
+from src.bar_stream import iter_bars
+from src.feature_engineering import FeatureEngineer
+
+
+def make_intraday_bars(n_rows: int) -> pd.DataFrame:
+    dates = pd.date_range("2024-01-02 14:30", periods=n_rows, freq="min", name="Date")
+    rng = np.random.default_rng(7)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, n_rows)))
+    return pd.DataFrame(
+        {
+            "Open": close,
+            "High": close * 1.001,
+            "Low": close * 0.999,
+            "Close": close,
+            "Volume": rng.integers(100, 1000, n_rows),
+        },
+        index=dates,
+    )
+
+
+class TestBarStream(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.bars = make_intraday_bars(5000)
+        self.store_path = os.path.join(self.tmp.name, "SPY_1min.parquet")
+        write_bars(self.bars, self.store_path, row_group_size=500)
+        self.csv_path = os.path.join(self.tmp.name, "SPY_1min.csv")
+        self.bars.to_csv(self.csv_path)
+
+        self.start = self.bars.index[1234]
+        self.end = self.bars.index[2345]
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_chunks_match_full_read(self) -> None:
+        print("\n--- Testing Streaming Bar Reader ---")
+        expected = read_bars(self.store_path).loc[self.start : self.end].iloc[:-1]
+        for path in [self.store_path, self.csv_path]:
+            chunks = list(iter_bars(path, self.start, self.end, chunk_rows=300))
+            self.assertTrue(all(len(chunk) <= 300 for chunk in chunks))
+            streamed = pd.concat(chunks)
+            pd.testing.assert_frame_equal(streamed, expected, check_freq=False, check_dtype=False)
+        print("Chunked reads match a full read of the same date range.")
+
+    def test_row_groups_outside_range_are_skipped(self) -> None:
+        read_groups = []
+        original = pq.ParquetFile.iter_batches
+
+        def recording_iter_batches(self, *args, **kwargs):  # type: ignore[no-untyped-def]
+            read_groups.extend(kwargs["row_groups"])
+            return original(self, *args, **kwargs)
+
+        with patch.object(pq.ParquetFile, "iter_batches", recording_iter_batches):
+            list(iter_bars(self.store_path, self.start, self.end))
+        # Rows 1234..2344 live in row groups 2..4 of 500 rows each.
+        self.assertEqual(read_groups, [2, 3, 4])
+
+    def test_chunked_features_match_full_computation(self) -> None:
+        fe = FeatureEngineer()
+        lowercase = self.bars.rename(columns=str.lower)
+        full = fe.calculate_features(lowercase)
+
+        chunks = (
+            chunk.rename(columns=str.lower) for chunk in iter_bars(self.store_path, chunk_rows=700)
+        )
+        chunked = pd.concat(fe.calculate_features_chunked(chunks))
+
+        self.assertEqual(len(chunked), len(full))
+        # EMA-based columns restart at each window, so compare on the price scale.
+        pd.testing.assert_frame_equal(
+            chunked, full, check_freq=False, check_dtype=False, rtol=0, atol=1e-6
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+from typing import Any
+
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.market_adapters.ibkr.adapter import IBKRMarketAdapter
+from src.market_adapters.ibkr.contracts import ContractCache
+
+
+class FakeIB:
+    """Qualifies any symbol except 'BAD' and counts gateway round-trips."""
+
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+        self.down = False
+        self.connected = True
+
+    def isConnected(self) -> bool:
+        return self.connected
+
+    def disconnect(self) -> None:
+        self.connected = False
+
+    def placeOrder(self, contract: Any, order: Any) -> str:
+        return f"{order.action} {contract.symbol}"
+
+    def run(self, coroutine: Any) -> pd.DataFrame:
+        coroutine.close()
+        return pd.DataFrame()
+
+    def qualifyContracts(self, *contracts: Any) -> list[Any]:
+        self.calls.append([contract.symbol for contract in contracts])
+        if self.down:
+            raise ConnectionError("gateway unreachable")
+        qualified = []
+        for contract in contracts:
+            if contract.symbol != "BAD":
+                contract.conId = 1000 + len(contract.symbol)
+                qualified.append(contract)
+        return qualified
+
+    async def qualifyContractsAsync(self, *contracts: Any) -> list[Any]:
+        return self.qualifyContracts(*contracts)
+
+
+class TestContractCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "contracts.json")
+        self.ib = FakeIB()
+        self.now = [0.0]
+        self.cache = ContractCache(
+            self.ib, ttl_seconds=60, path=self.path, clock=lambda: self.now[0]
+        )
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_lookups_hit_cache_until_ttl(self) -> None:
+        print("\n--- Testing Contract Cache ---")
+        self.assertEqual(self.cache.get("SPY").conId, 1003)
+        self.cache.get("SPY")
+        self.assertEqual(len(self.ib.calls), 1)
+
+        self.now[0] = 120
+        # The order path never waits on a known symbol, even past its TTL.
+        self.assertIsNotNone(self.cache.get("SPY", allow_stale=True))
+        self.assertEqual(len(self.ib.calls), 1)
+        self.cache.get("SPY")
+        self.assertEqual(len(self.ib.calls), 2)
+        self.assertIsNone(self.cache.get("BAD"))
+        print("Qualified contracts are reused until their TTL expires.")
+
+    def test_prequalify_is_one_round_trip_and_persists(self) -> None:
+        contracts = self.cache.prequalify(["SPY", "QQQ", "BAD", "SPY"])
+        self.assertEqual(self.ib.calls, [["SPY", "QQQ", "BAD"]])
+        self.assertEqual(set(contracts), {"SPY", "QQQ"})
+
+        restarted_ib = FakeIB()
+        restarted = ContractCache(restarted_ib, ttl_seconds=60, path=self.path, clock=lambda: 0.0)
+        self.assertEqual(restarted.get("QQQ").conId, 1003)
+        self.assertEqual(restarted_ib.calls, [])
+
+    def test_adapter_shares_one_cache(self) -> None:
+        adapter = IBKRMarketAdapter()
+        self.assertIs(adapter.data_loader.contracts, adapter.contract_cache)
+        self.assertIs(adapter.execution_handler.contracts, adapter.contract_cache)
+
+        # Data requests and orders for a symbol use the same cache entry.
+        adapter.connection.ib = adapter.data_loader.ib = adapter.execution_handler.ib = self.ib
+        adapter.contract_cache.ib = self.ib
+        adapter.data_loader.get_historical_data("SPY", "1 day", "2024-01-02", "2024-01-31")
+        adapter.execution_handler.place_order({"symbol": "SPY", "quantity": 1})
+        self.assertEqual(self.ib.calls, [["SPY"]])
+
+    def make_adapter(self, **params: Any) -> IBKRMarketAdapter:
+        adapter = IBKRMarketAdapter(**params)
+        adapter.connection.ib = adapter.execution_handler.ib = self.ib
+        adapter.contract_cache = adapter.execution_handler.contracts = self.cache
+        return adapter
+
+    def test_stale_entries_are_refreshed_off_the_order_path(self) -> None:
+        adapter = self.make_adapter(contract_refresh_seconds=None)
+        self.cache.prequalify(["SPY", "QQQ"])
+
+        # Expired while the process was down: refreshed in one request on connect.
+        self.now[0] = 120
+        adapter.connect()
+        self.assertEqual(self.ib.calls[-1], ["SPY", "QQQ"])
+
+        # Orders use the stale contract and never trigger a refresh themselves.
+        self.now[0] = 240
+        trade = adapter.execution_handler.place_order({"symbol": "SPY", "quantity": 1})
+        self.assertEqual(trade, "BUY SPY")
+        self.assertEqual(len(self.ib.calls), 2)
+        self.assertEqual(self.cache.refresh_stale(), 2)
+
+    def test_refresh_timer(self) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self.addCleanup(asyncio.set_event_loop, None)
+        self.addCleanup(loop.close)
+        adapter = self.make_adapter(contract_refresh_seconds=0.01)
+        self.cache.prequalify(["SPY"])
+        adapter.connect()
+        self.assertEqual(len(self.ib.calls), 1)
+
+        self.now[0] = 120
+        loop.run_until_complete(asyncio.sleep(0.05))
+        self.assertEqual(self.ib.calls[1], ["SPY"])
+        self.assertEqual(self.cache.refresh_stale(), 0)
+
+        # Disconnecting stops the timer.
+        adapter.disconnect()
+        self.assertIsNone(adapter._refresh_timer)
+
+    def test_failed_refresh_backs_off(self) -> None:
+        print("\n--- Testing Failed Contract Refresh ---")
+        self.cache.prequalify(["SPY", "QQQ"])
+        self.now[0] = 120
+        self.ib.down = True
+        self.assertEqual(self.cache.refresh_stale(), 0)
+        self.assertEqual(len(self.ib.calls), 2)
+
+        # Within the back-off the failed entries are neither retried nor lost.
+        self.now[0] = 120 + self.cache.retry_seconds / 2
+        self.assertEqual(self.cache.refresh_stale(), 0)
+        self.assertEqual(self.cache.get("SPY").conId, 1003)
+        self.assertEqual(len(self.ib.calls), 2)
+
+        # Once it has passed, they are retried in one request.
+        self.ib.down = False
+        self.now[0] = 120 + self.cache.retry_seconds
+        self.assertEqual(self.cache.refresh_stale(), 2)
+        self.assertEqual(self.ib.calls[-1], ["SPY", "QQQ"])
+        print("Failed refreshes are retried once per back-off interval.")
+
+
+if __name__ == "__main__":
+    unittest.main()
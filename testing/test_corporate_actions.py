@@ -0,0 +1,134 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import corporate_actions
+from src.corporate_actions import (
+    _raw_dividends,
+    adjust_bars,
+    load_actions,
+    load_series,
+    record_actions,
+)
+
+
+def make_bars() -> pd.DataFrame:
+    dates = pd.bdate_range("2024-01-01", periods=10, name="Date")
+    # A 4-for-1 split on day 4 and a 0.275 dividend on day 8.
+    close = np.array([100, 102, 104, 26, 26.5, 27, 27.5, 27, 26, 26.5])
+    return pd.DataFrame(
+        {
+            "Open": close,
+            "High": close + 0.5,
+            "Low": close - 0.5,
+            "Close": close,
+            "Volume": 1000.0,
+        },
+        index=dates,
+    )
+
+
+def make_actions(dates: pd.DatetimeIndex) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "ticker": ["xyz", "XYZ", "ABC"],
+            "date": [dates[3], dates[7], dates[2]],
+            "action": ["split", "dividend", "split"],
+            "value": [4.0, 0.275, 2.0],
+        }
+    )
+
+
+class TestCorporateActions(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        self.actions_path = os.path.join(self.dir, "corporate_actions.csv")
+        self.cache_dir = os.path.join(self.dir, "adjusted")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_back_adjustment(self) -> None:
+        print("\n--- Testing Split/Dividend Back-Adjustment ---")
+        df = make_bars()
+        actions = record_actions(make_actions(df.index), self.actions_path)
+        adjusted = adjust_bars(df, corporate_actions.actions_for("XYZ", actions))
+
+        # Bars on or after the last ex-date are untouched.
+        pd.testing.assert_frame_equal(adjusted.iloc[7:], df.iloc[7:])
+        # Returns across the split are continuous; the dividend scales earlier bars.
+        factor = 1 - 0.275 / 27.5
+        np.testing.assert_allclose(adjusted["Close"].iloc[:3], df["Close"].iloc[:3] / 4 * factor)
+        np.testing.assert_allclose(adjusted["Close"].iloc[3:7], df["Close"].iloc[3:7] * factor)
+        np.testing.assert_allclose(adjusted["Volume"].iloc[:3], 4000.0)
+        np.testing.assert_allclose(adjusted["Volume"].iloc[3:], 1000.0)
+        self.assertAlmostEqual(adjusted["Close"].iloc[3] / adjusted["Close"].iloc[2], 26 / 26)
+        print("Prices and volume are continuous across corporate actions.")
+
+    def test_table_upserts(self) -> None:
+        df = make_bars()
+        record_actions(make_actions(df.index), self.actions_path)
+        update = pd.DataFrame(
+            {"ticker": ["XYZ"], "date": [df.index[3]], "action": ["split"], "value": [2.0]}
+        )
+        actions = record_actions(update, self.actions_path)
+        self.assertEqual(len(actions), 3)
+        xyz = corporate_actions.actions_for("xyz", load_actions(self.actions_path))
+        self.assertEqual(xyz["value"].tolist(), [2.0, 0.275])
+
+        with self.assertRaises(ValueError):
+            record_actions(update.assign(action="merger"), self.actions_path)
+
+    def test_adjusted_series_is_cached(self) -> None:
+        print("\n--- Testing Cached Adjusted Series ---")
+        df = make_bars()
+        path = os.path.join(self.dir, "XYZ_1day.csv")
+        df.to_csv(path)
+        record_actions(make_actions(df.index), self.actions_path)
+        kwargs = {"actions_path": self.actions_path, "cache_dir": self.cache_dir}
+
+        raw = load_series(path, adjusted=False, **kwargs)
+        np.testing.assert_allclose(raw["Close"], df["Close"])
+
+        with patch.object(
+            corporate_actions, "adjust_bars", wraps=corporate_actions.adjust_bars
+        ) as adjust:
+            first = load_series(path, adjusted=True, **kwargs)
+            second = load_series(path, adjusted=True, **kwargs)
+            self.assertEqual(adjust.call_count, 1)
+            pd.testing.assert_frame_equal(first, second)
+            self.assertLess(first["Close"].iloc[0], raw["Close"].iloc[0])
+
+            # A new action for this ticker invalidates the cached series...
+            new = pd.DataFrame(
+                {"ticker": ["XYZ"], "date": [df.index[5]], "action": ["dividend"], "value": [0.1]}
+            )
+            record_actions(new, self.actions_path)
+            load_series(path, adjusted=True, **kwargs)
+            self.assertEqual(adjust.call_count, 2)
+
+            # ...while one for another ticker does not.
+            record_actions(new.assign(ticker="ABC"), self.actions_path)
+            load_series(path, adjusted=True, **kwargs)
+            self.assertEqual(adjust.call_count, 2)
+        print("Adjusted series are rebuilt only when their inputs change.")
+
+    def test_provider_dividends_are_unadjusted(self) -> None:
+        # Yahoo reports a 1.00 dividend paid before a 4:1 split as 0.25.
+        splits = pd.Series([4.0], index=pd.to_datetime(["2024-06-10"]))
+        dividends = pd.Series([0.25, 0.30], index=pd.to_datetime(["2024-03-01", "2024-09-01"]))
+        raw = _raw_dividends(dividends, splits)
+        self.assertEqual(raw.tolist(), [1.0, 0.30])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import data_quality
+from src.data_quality import DataQualityError, clean_bars, ensure_quality, validate_bars
+from src.ingest import load_asset_file
+
+
+def make_bars(n_rows: int = 60) -> pd.DataFrame:
+    dates = pd.bdate_range("2024-01-02", periods=n_rows, name="Date")
+    close = np.linspace(100, 130, n_rows)
+    return pd.DataFrame(
+        {
+            "Open": close - 0.5,
+            "High": close + 1,
+            "Low": close - 1,
+            "Close": close,
+            "Volume": 1000.0,
+        },
+        index=dates,
+    )
+
+
+class TestDataQuality(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        data_quality._loaded_reports.clear()
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def make_dirty_bars(self) -> pd.DataFrame:
+        df = make_bars()
+        df.iloc[10, df.columns.get_loc("Close")] = np.nan  # missing
+        df.iloc[20, df.columns.get_loc("Low")] = 0.0  # non-positive price
+        df.iloc[30, df.columns.get_loc("High")] = df["Close"].iloc[30] - 5  # high below close
+        df.iloc[40, df.columns.get_loc("Volume")] = -1  # negative volume
+        df.iloc[50, df.columns.get_loc("Volume")] = 50_000  # spike (warning only)
+        df = df.drop(df.index[44:49])  # a week-long gap (warning only)
+        df = pd.concat([df, df.iloc[[5]]])  # a duplicated bar, out of order
+        return df
+
+    def test_checks_detect_each_issue(self) -> None:
+        print("\n--- Testing Data Quality Checks ---")
+        report = validate_bars(self.make_dirty_bars())
+        self.assertEqual(report.rows, 56)
+        self.assertEqual(report.unsorted, 1)
+        self.assertEqual(report.duplicates, 1)
+        self.assertEqual(report.missing, 1)
+        self.assertEqual(report.non_positive, 1)
+        self.assertEqual(report.ohlc_inconsistent, 1)
+        self.assertEqual(report.negative_volume, 1)
+        self.assertEqual(report.bad_rows, 4)
+        self.assertEqual(report.volume_spikes, 1)
+        self.assertEqual(report.gaps, 1)
+        self.assertTrue(report.needs_repair)
+        self.assertEqual(validate_bars(make_bars()).summary(), "clean")
+        print("Every check reports its issue count.")
+
+    def test_clean_bars_repairs_errors(self) -> None:
+        cleaned = clean_bars(self.make_dirty_bars())
+        self.assertTrue(cleaned.index.is_monotonic_increasing)
+        self.assertTrue(cleaned.index.is_unique)
+        report = validate_bars(cleaned)
+        self.assertFalse(report.needs_repair)
+        self.assertEqual(report.rows, 51)
+        # Warnings are reported but the bars are kept.
+        self.assertEqual(report.volume_spikes, 1)
+
+    def test_reports_are_cached_per_file_version(self) -> None:
+        print("\n--- Testing Cached Quality Reports ---")
+        path = os.path.join(self.dir, "SPY_2024.csv")
+        cache_dir = os.path.join(self.dir, "quality")
+        make_bars().to_csv(path)
+
+        with patch.object(data_quality, "validate_bars", wraps=data_quality.validate_bars) as check:
+            ensure_quality(path, {"SPY": make_bars()}, cache_dir=cache_dir)
+            ensure_quality(path, {"SPY": make_bars()}, cache_dir=cache_dir)
+            self.assertEqual(check.call_count, 1)
+            self.assertEqual(sorted(os.listdir(self.dir)), ["SPY_2024.csv", "quality"])
+            self.assertTrue(os.path.exists(data_quality.quality_path(path, cache_dir)))
+
+            # A frame preprocessed differently from the same file is checked on its own.
+            ensure_quality(path, {"SPY": make_bars().iloc[5:]}, cache_dir=cache_dir)
+            self.assertEqual(check.call_count, 2)
+            ensure_quality(path, {"SPY": make_bars()}, cache_dir=cache_dir)
+            self.assertEqual(check.call_count, 2)
+
+            # Rewriting the file invalidates its reports.
+            make_bars(30).to_csv(path)
+            os.utime(path, (1, 1))
+            ensure_quality(path, {"SPY": make_bars()}, cache_dir=cache_dir)
+            self.assertEqual(check.call_count, 3)
+        print("Unchanged frames are not re-validated.")
+
+    def test_bad_data_is_blocked(self) -> None:
+        path = os.path.join(self.dir, "BAD_2024.csv")
+        df = make_bars()
+        df.iloc[:10, df.columns.get_loc("Close")] = -1.0
+        df.to_csv(path)
+        cache_dir = os.path.join(self.dir, "quality")
+        with self.assertRaises(DataQualityError):
+            load_asset_file(path, quality_dir=cache_dir)
+
+        # Within the tolerance the bad rows are dropped instead.
+        frames = ensure_quality(path, {"BAD": df}, max_bad_fraction=0.5, cache_dir=cache_dir)
+        self.assertEqual(len(frames["BAD"]), 50)
+        self.assertTrue((frames["BAD"]["Close"] > 0).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import feature_cache
+from src.feature_cache import FeatureCache
+from src.feature_engineering import FeatureEngineer
+from src.panel import Panel
+
+
+def make_bars(n_rows: int = 600, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_rows)))
+    return pd.DataFrame(
+        {
+            "open": close,
+            "high": close * 1.01,
+            "low": close * 0.99,
+            "close": close,
+            "volume": rng.integers(100, 1000, n_rows),
+        },
+        index=pd.date_range("2022-01-03", periods=n_rows, freq="h", name="Date"),
+    )
+
+
+class TestFeatureCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.engineer = FeatureEngineer()
+        self.cache = FeatureCache(self.tmp.name, engineer=self.engineer)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_unchanged_data_is_loaded_from_disk(self) -> None:
+        print("\n--- Testing Feature Cache ---")
+        bars = make_bars()
+        with patch.object(
+            self.engineer, "calculate_features", wraps=self.engineer.calculate_features
+        ) as compute:
+            first = self.cache.calculate_features(bars)
+            # A copy with identical content hits the same entry.
+            second = self.cache.calculate_features(bars.copy())
+            self.assertEqual(compute.call_count, 1)
+            pd.testing.assert_frame_equal(first, second, check_freq=False)
+            pd.testing.assert_frame_equal(
+                second, self.engineer.calculate_features(bars), check_freq=False
+            )
+
+            # Any change to the data, or a new feature version, recomputes.
+            changed = bars.copy()
+            changed.iloc[-1, changed.columns.get_loc("close")] += 0.01
+            self.cache.calculate_features(changed)
+            self.assertEqual(compute.call_count, 3)
+            with patch.object(feature_cache, "FEATURE_VERSION", "test"):
+                self.cache.calculate_features(bars)
+            self.assertEqual(compute.call_count, 4)
+            # A feature subset is a separate entry.
+            subset = self.cache.calculate_features(bars, ["RSI_14"])
+            self.assertEqual(compute.call_count, 5)
+            self.assertEqual(list(subset.columns), ["RSI_14"])
+        print("Features are recomputed only for new data or definitions.")
+
+    def test_panel_features_are_cached(self) -> None:
+        frames = {
+            name: make_bars(300, seed).rename(columns=str.capitalize)
+            for seed, name in enumerate(["AAA", "BBB"])
+        }
+        panel = Panel.from_frames(frames)
+        with patch.object(
+            self.engineer,
+            "calculate_panel_features",
+            wraps=self.engineer.calculate_panel_features,
+        ) as compute:
+            first = self.cache.calculate_panel_features(panel)
+            second = self.cache.calculate_panel_features(panel)
+            self.assertEqual(compute.call_count, 1)
+            pd.testing.assert_frame_equal(first, second)
+
+    def test_cache_is_held_to_its_budget(self) -> None:
+        self.cache.calculate_features(make_bars(seed=1))
+        entry_size = sum(entry["size"] for entry in self.cache.manifest.load().values())
+        self.cache.max_bytes = int(entry_size * 2.5)
+
+        for seed in range(2, 6):
+            self.cache.calculate_features(make_bars(seed=seed))
+        entries = self.cache.manifest.load()
+        self.assertLessEqual(len(entries), 2)
+        # The most recent entry is always kept.
+        latest = self.cache.key_for(feature_cache.frame_fingerprint(make_bars(seed=5)))
+        self.assertIn(latest, entries)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import feature_engineering, kernels
+from src.feature_engineering import (
+    FEATURE_COLUMNS,
+    FEATURE_REGISTRY,
+    FeatureDefinition,
+    FeatureEngineer,
+    feature_plan,
+    register_feature,
+    resolve_features,
+)
+from src.panel import Panel
+
+
+def make_bars(n_rows: int = 500, seed: int = 3) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_rows)))
+    return pd.DataFrame(
+        {
+            "open": close + rng.normal(0, 0.1, n_rows),
+            "high": close * 1.01,
+            "low": close * 0.99,
+            "close": close,
+            "volume": rng.integers(100, 1000, n_rows),
+        },
+        index=pd.date_range("2022-01-03", periods=n_rows, freq="h", name="Date"),
+    )
+
+
+def counting_registry() -> tuple[dict[str, FeatureDefinition], dict[str, int]]:
+    """A copy of the registry whose definitions count their evaluations."""
+    calls: dict[str, int] = {}
+
+    def counted(definition: FeatureDefinition) -> FeatureDefinition:
+        def compute(*inputs, **params):
+            calls[definition.name] = calls.get(definition.name, 0) + 1
+            return definition.compute(*inputs, **params)
+
+        return FeatureDefinition(
+            definition.name, compute, definition.inputs, definition.params, definition.stream
+        )
+
+    return {name: counted(d) for name, d in FEATURE_REGISTRY.items()}, calls
+
+
+class TestFeatureRegistry(unittest.TestCase):
+    def setUp(self) -> None:
+        self.bars = make_bars()
+        self.fe = FeatureEngineer()
+        self.full = self.fe.calculate_features(self.bars)
+
+    def test_subset_computes_only_its_dependencies(self) -> None:
+        print("\n--- Testing Feature Registry ---")
+        registry, calls = counting_registry()
+        with patch.object(feature_engineering, "FEATURE_REGISTRY", registry):
+            subset = self.fe.calculate_features(self.bars, ["RSI_14", "ATR_14"])
+        self.assertEqual(calls, {"RSI_14": 1, "ATR_14": 1})
+        pd.testing.assert_frame_equal(subset, self.full[["RSI_14", "ATR_14"]])
+
+        # The MACD family shares one pair of EMAs.
+        macd = ["MACD_12_26_9", "MACDS_12_26_9", "MACDH_12_26_9"]
+        registry, calls = counting_registry()
+        with patch.object(feature_engineering, "FEATURE_REGISTRY", registry):
+            subset = self.fe.calculate_features(self.bars, macd)
+        self.assertEqual(calls, {"ema_12": 1, "ema_26": 1, **dict.fromkeys(macd, 1)})
+        pd.testing.assert_frame_equal(subset, self.full[macd])
+        print("Subsets compute only the definitions they depend on.")
+
+    def test_presets_and_validation(self) -> None:
+        self.assertEqual(list(self.full.columns), FEATURE_COLUMNS)
+        pd.testing.assert_frame_equal(self.fe.calculate_features(self.bars, "xgboost"), self.full)
+        self.assertEqual(resolve_features("EMA_20"), ["EMA_20"])
+        raw, order = feature_plan(["BBU_20_2.0", "close"])
+        self.assertEqual(raw, ["close"])
+        self.assertEqual([d.name for d in order], ["BBM_20_2.0", "std_20", "BBU_20_2.0"])
+
+        with self.assertRaises(ValueError):
+            self.fe.calculate_features(self.bars, ["RSI_14", "RSI_15"])
+        with self.assertRaises(ValueError):
+            register_feature("SMA_50", kernels.rolling_mean, ["close"], window=50)
+
+        registry = dict(FEATURE_REGISTRY)
+        with patch.object(feature_engineering, "FEATURE_REGISTRY", registry):
+            register_feature("loop_a", np.negative, ["loop_b"], elementwise=True)
+            register_feature("loop_b", np.negative, ["loop_a"], elementwise=True)
+            with self.assertRaises(ValueError):
+                feature_plan(["loop_a"])
+            # Every feature needs a streaming update.
+            with self.assertRaises(ValueError):
+                register_feature("no_stream", np.cumsum, ["close"])
+        self.assertNotIn("loop_a", FEATURE_REGISTRY)
+
+    def test_panel_subset(self) -> None:
+        frames = {
+            "AAA": make_bars(300, 1).rename(columns=str.capitalize),
+            "BBB": make_bars(250, 2).iloc[20:].rename(columns=str.capitalize),
+        }
+        panel = Panel.from_frames(frames)
+        columns = ["STOCHd_14_3_3", "SMA_50"]
+        subset = self.fe.calculate_panel_features(panel, columns)
+        full = self.fe.calculate_panel_features(panel)
+        self.assertEqual(list(subset.columns), columns)
+        pd.testing.assert_frame_equal(subset, full[columns])
+
+        # Only the fields the subset reads must be present.
+        close_only = Panel.from_frames(frames, fields=["Close"])
+        sma = self.fe.calculate_panel_features(close_only, "SMA_50")
+        pd.testing.assert_frame_equal(sma, full[["SMA_50"]])
+        with self.assertRaises(ValueError):
+            self.fe.calculate_panel_features(close_only, "ATR_14")
+
+
+if __name__ == "__main__":
+    unittest.main()
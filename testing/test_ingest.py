@@ -0,0 +1,99 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.ingest import (
+    compact_bars,
+    discover_data_files,
+    frame_nbytes,
+    load_asset_file,
+    load_assets,
+)
+
+
+class TestIngest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        self.quality_tmp = tempfile.TemporaryDirectory()
+        self.quality_dir = self.quality_tmp.name
+        dates = pd.date_range("2024-01-01", periods=30, freq="D", name="Date")
+        close = np.linspace(100, 130, 30)
+        single = pd.DataFrame(
+            {"Close": close, "High": close + 1, "Low": close - 1, "Open": close, "Volume": 1000},
+            index=dates,
+        )
+        single.to_csv(os.path.join(self.dir, "SPY_2024-01-01_2024-01-31.csv"))
+
+        # yfinance multi-asset layout
+        multi = pd.concat({"PEP": single, "KO": single / 2}, axis=1).swaplevel(axis=1)
+        multi.columns.names = ["Price", "Ticker"]
+        multi.to_csv(os.path.join(self.dir, "PEP_KO_2024.csv"))
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+        self.quality_tmp.cleanup()
+
+    def test_layouts_are_normalised(self) -> None:
+        print("\n--- Testing Asset File Normalisation ---")
+        multi = load_asset_file(
+            os.path.join(self.dir, "PEP_KO_2024.csv"), quality_dir=self.quality_dir
+        )
+        self.assertEqual(set(multi), {"PEP", "KO"})
+        for df in multi.values():
+            self.assertEqual(list(df.columns), ["Open", "High", "Low", "Close", "Volume"])
+            self.assertIsInstance(df.index, pd.DatetimeIndex)
+            self.assertIsNone(df.index.tz)
+            self.assertEqual(len(df), 30)
+        print("Multi-asset and single-asset layouts share one normalisation.")
+
+    def test_parallel_matches_serial(self) -> None:
+        print("\n--- Testing Parallel Ingestion ---")
+        files = discover_data_files(self.dir)
+        options = {"verbose": False, "quality_dir": self.quality_dir}
+        serial = load_assets(files, workers=1, **options)
+        threaded = load_assets(files, workers=2, executor="thread", **options)
+        processes = load_assets(files, workers=2, executor="process", **options)
+
+        self.assertEqual(list(serial), ["PEP", "KO", "SPY"])
+        for parallel in (threaded, processes):
+            self.assertEqual(list(parallel), list(serial))
+            for asset, info in serial.items():
+                pd.testing.assert_frame_equal(parallel[asset]["data"], info["data"])
+                self.assertEqual(parallel[asset]["source"], info["source"])
+        print("Thread and process pools return the same assets_map as the serial path.")
+
+    def test_compaction_dtypes_and_memory(self) -> None:
+        print("\n--- Testing Dtype Compaction ---")
+        raw = pd.DataFrame(
+            {
+                "Close": ["100.5", "101.25", "99.75"],  # object dtype, as from a messy CSV
+                "Volume": [1000.0, 2000.0, 1500.0],
+            },
+            index=pd.Index(["2024-01-02", "2024-01-03", "2024-01-04"], name="Date"),
+        )
+        compact = compact_bars(raw, "float32")
+        self.assertEqual(compact["Close"].dtype, np.float32)
+        self.assertEqual(compact["Volume"].dtype, np.int64)
+        self.assertEqual(compact.index.dtype, np.dtype("datetime64[ns]"))
+        self.assertLess(frame_nbytes(compact), frame_nbytes(raw))
+
+        spy_path = os.path.join(self.dir, "SPY_2024-01-01_2024-01-31.csv")
+        spy = load_asset_file(spy_path, "float32", quality_dir=self.quality_dir)
+        self.assertTrue((spy["SPY"][["Open", "High", "Low", "Close"]].dtypes == np.float32).all())
+
+        # The default precision leaves the prices untouched.
+        exact = load_asset_file(spy_path, quality_dir=self.quality_dir)
+        self.assertEqual(exact["SPY"]["Close"].iloc[-1], 130.0)
+        print("Frames are compacted to fixed dtypes with less memory.")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import kernels
+
+
+def make_prices(n_rows: int = 3001, seed: int = 5) -> np.ndarray:
+    """Three price-like series (one with a flat stretch and a NaN) as (time, series)."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_rows)))
+    close[300:340] = close[299]
+    close[1000] = np.nan
+    return np.column_stack([close, close[::-1], rng.normal(0, 1, n_rows)])
+
+
+def windowed(values: np.ndarray, window: int, reducer) -> np.ndarray:
+    """Direct per-window reduction, for reference."""
+    out = np.full(values.shape, np.nan)
+    out[window - 1 :] = reducer(sliding_window_view(values, window, axis=0), axis=-1)
+    return out
+
+
+class TestKernels(unittest.TestCase):
+    def setUp(self) -> None:
+        self.prices = make_prices()
+
+    def test_rolling_windows_match_direct_computation(self) -> None:
+        print("\n--- Testing Rolling Kernels ---")
+        for window in (1, 2, 14, 20, 200):
+            for kernel, reducer in [
+                (kernels.rolling_sum, np.sum),
+                (kernels.rolling_mean, np.mean),
+                (kernels.rolling_min, np.min),
+                (kernels.rolling_max, np.max),
+            ]:
+                result = kernel(self.prices, window)
+                np.testing.assert_allclose(
+                    result, windowed(self.prices, window, reducer), rtol=1e-12, atol=1e-12
+                )
+                # Each column of a 2-D input is computed exactly like a 1-D series.
+                np.testing.assert_array_equal(result[:, 0], kernel(self.prices[:, 0], window))
+
+            for ddof in (0, 1):
+                if window <= ddof:
+                    continue
+                expected = windowed(self.prices, window, lambda a, axis: np.std(a, axis, ddof=ddof))
+                np.testing.assert_allclose(
+                    kernels.rolling_std(self.prices, window, ddof), expected, rtol=1e-8, atol=1e-12
+                )
+        print("Rolling kernels match per-window NumPy reductions.")
+
+    def test_rolling_edge_cases(self) -> None:
+        std = kernels.rolling_std(self.prices[:, 0], 20)
+        # Warm-up rows and windows containing the NaN are NaN; flat windows are exactly 0.
+        self.assertTrue(np.isnan(std[:19]).all())
+        self.assertTrue(np.isnan(std[1000:1020]).all())
+        self.assertFalse(np.isnan(std[1020]))
+        self.assertTrue((std[318:340] == 0.0).all())
+        self.assertTrue(np.isnan(kernels.rolling_mean(np.array([1.0, 2.0]), 5)).all())
+        with self.assertRaises(ValueError):
+            kernels.rolling_mean(self.prices, 0)
+        with self.assertRaises(ValueError):
+            kernels.rolling_var(self.prices, 1, ddof=1)
+
+    def test_snap_ties(self) -> None:
+        # Means of whole-cent prices that are equal in exact arithmetic.
+        rng = np.random.default_rng(2)
+        cents = np.cumsum(rng.choice([-1, 0, 0, 1], 2000)) + 10_000
+        close = cents / 100
+        fast = kernels.rolling_mean(close, 10)
+        slow = kernels.rolling_mean(close, 20)
+        exact_ties = np.zeros(len(close), dtype=bool)
+        sums = np.cumsum(np.r_[0, cents])
+        exact_ties[19:] = (sums[20:] - sums[10:-10]) * 2 == sums[20:] - sums[:-20]
+        self.assertTrue(exact_ties.any())
+        self.assertTrue((fast[exact_ties] != slow[exact_ties]).any())
+
+        snapped = kernels.snap_ties(fast, slow)
+        np.testing.assert_array_equal(snapped[19:] == slow[19:], exact_ties[19:])
+        self.assertTrue(np.isnan(snapped[:9]).all())
+        # Scalar references (thresholds); real differences are kept.
+        np.testing.assert_array_equal(
+            kernels.snap_ties(np.array([30.0 * (1 + 1e-15), 30.01, np.nan]), 30),
+            [30.0, 30.01, np.nan],
+        )
+
+    def test_ema_matches_pandas(self) -> None:
+        frame = pd.DataFrame(self.prices)
+        # Leading NaNs (late listings) and trailing NaNs (delistings).
+        frame.iloc[:25, 1] = np.nan
+        frame.iloc[2500:, 2] = np.nan
+        for span in (2, 9, 26, 200):
+            expected = frame.ewm(span=span, adjust=False).mean().to_numpy()
+            result = kernels.ema(frame.to_numpy(), span)
+            np.testing.assert_allclose(result, expected, rtol=1e-11)
+            np.testing.assert_allclose(
+                kernels.ema(frame[2].to_numpy(), span), expected[:, 2], rtol=1e-11
+            )
+
+    def test_streaming_counterparts(self) -> None:
+        series = self.prices[:, 0].copy()
+        series[2000:2003] = np.nan  # a gap after a full window
+        cases = [(kernels.ema, {"span": 9})] + [
+            (kernel, {"window": window})
+            for kernel in kernels.STREAMING
+            if kernel is not kernels.ema
+            for window in (1, 3, 20)
+            if not (kernel in (kernels.rolling_var, kernels.rolling_std) and window == 1)
+        ]
+        cases.append((kernels.rolling_std, {"window": 1, "ddof": 0}))
+        for kernel, params in cases:
+            with self.subTest(kernel=kernel.__name__, **params):
+                stream = kernels.STREAMING[kernel](**params)
+                streamed = [stream.update(value) for value in series]
+                np.testing.assert_allclose(
+                    streamed, kernel(series, **params), rtol=1e-9, atol=1e-12, equal_nan=True
+                )
+
+    def test_wilder_smoothing(self) -> None:
+        values = np.array([np.nan, 1.0, 2.0, 3.0, 4.0, 5.0])
+        result = kernels.wilder(values, 3)
+        self.assertTrue(np.isnan(result[:3]).all())
+        # Seeded with mean(1, 2, 3), then y += (x - y) / 3.
+        np.testing.assert_allclose(result[3:], [2.0, 2 + 2 / 3, 2 + 2 / 3 + (5 - 2 - 2 / 3) / 3])
+
+        gains = np.abs(np.diff(self.prices[:1000, 0]))
+        expected = np.empty_like(gains)
+        expected[:13] = np.nan
+        expected[13] = gains[:14].mean()
+        for i in range(14, len(gains)):
+            expected[i] = expected[i - 1] + (gains[i] - expected[i - 1]) / 14
+        np.testing.assert_allclose(kernels.wilder(gains, 14), expected, rtol=1e-12)
+
+
+if __name__ == "__main__":
+    unittest.main()
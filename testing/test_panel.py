@@ -0,0 +1,116 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.ingest import load_panel
+from src.panel import Panel
+
+
+def make_bars(dates: pd.DatetimeIndex, start: float) -> pd.DataFrame:
+    close = np.linspace(start, start + len(dates) - 1, len(dates))
+    return pd.DataFrame(
+        {
+            "Open": close - 0.5,
+            "High": close + 1,
+            "Low": close - 1,
+            "Close": close,
+            "Volume": 1000.0,
+        },
+        index=dates.rename("Date"),
+    )
+
+
+class TestPanel(unittest.TestCase):
+    def setUp(self) -> None:
+        days = pd.date_range("2024-01-01", periods=10, freq="D")
+        # KO misses two days; PEP has one day the others lack.
+        self.frames = {
+            "SPY": make_bars(days, 100),
+            "KO": make_bars(days.delete([3, 4]), 50),
+            "PEP": make_bars(days[:5].append(pd.DatetimeIndex(["2024-01-20"])), 150),
+        }
+
+    def test_alignment_and_mask(self) -> None:
+        print("\n--- Testing Panel Alignment ---")
+        panel = Panel.from_frames(self.frames)
+        self.assertEqual(panel.shape, (11, 3, 5))
+        self.assertEqual(panel.mask.sum(axis=0).tolist(), [10, 8, 6])
+        self.assertTrue(np.isnan(panel.values[3, 1]).all())
+
+        ko = panel.asset("KO", observed=True)
+        pd.testing.assert_frame_equal(ko, self.frames["KO"], check_freq=False)
+
+        inner = Panel.from_frames(self.frames, how="inner")
+        self.assertEqual(len(inner), 3)
+        self.assertTrue(inner.mask.all())
+        pd.testing.assert_frame_equal(
+            inner.asset("SPY"), panel.dropna().asset("SPY"), check_freq=False
+        )
+        print("Assets are aligned on one index with an explicit missing-data mask.")
+
+    def test_views_are_zero_copy(self) -> None:
+        panel = Panel.from_frames(self.frames)
+        spy = panel.asset("SPY")
+        closes = panel.field("Close")
+        self.assertTrue(np.shares_memory(spy.to_numpy(), panel.values))
+        self.assertTrue(np.shares_memory(closes.to_numpy(), panel.values))
+        panel.values[0, 0, 3] = -1.0
+        self.assertEqual(spy["Close"].iloc[0], -1.0)
+        self.assertEqual(closes["SPY"].iloc[0], -1.0)
+
+    def test_cross_sectional_operations(self) -> None:
+        panel = Panel.from_frames(self.frames)
+        closes = panel.field("Close").where(panel.mask)
+
+        pd.testing.assert_series_equal(
+            panel.cross_mean(), closes.mean(axis=1), check_names=False, check_freq=False
+        )
+        expected_z = closes.sub(closes.mean(axis=1), axis=0).div(closes.std(axis=1, ddof=0), axis=0)
+        pd.testing.assert_frame_equal(panel.cross_zscore(), expected_z, check_freq=False)
+        pd.testing.assert_frame_equal(
+            panel.cross_rank(), closes.rank(axis=1, pct=True), check_freq=False
+        )
+        # Returns skip the missing bars instead of spanning NaNs.
+        ko_returns = panel.returns()["KO"].dropna()
+        expected = self.frames["KO"]["Close"].pct_change().dropna()
+        np.testing.assert_allclose(ko_returns.to_numpy(), expected.to_numpy())
+
+    def test_pair_frame_matches_merge(self) -> None:
+        print("\n--- Testing Pair Frames ---")
+        panel = Panel.from_frames(self.frames)
+        pair = panel.pair_frame("SPY", "KO")
+
+        merged = pd.merge(
+            self.frames["SPY"].add_suffix("_1"),
+            self.frames["KO"].add_suffix("_2"),
+            left_index=True,
+            right_index=True,
+            how="inner",
+        )
+        for col in ["Open", "High", "Low", "Close", "Volume"]:
+            merged[col] = merged[f"{col}_1"]
+        pd.testing.assert_frame_equal(pair, merged, check_freq=False)
+        print("Pair frames match the former add_suffix/merge construction.")
+
+    def test_load_panel(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = []
+            for name, df in self.frames.items():
+                path = os.path.join(tmp, f"{name}_2024.csv")
+                df.to_csv(path)
+                paths.append(path)
+            quality_dir = os.path.join(tmp, "quality")
+            panel = load_panel(paths, workers=1, verbose=False, quality_dir=quality_dir)
+        self.assertEqual(panel.assets, ["SPY", "KO", "PEP"])
+        self.assertEqual(panel.shape, (11, 3, 5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.feature_engineering import FEATURE_COLUMNS, FeatureEngineer
+from src.panel import Panel
+
+
+def make_frames() -> dict[str, pd.DataFrame]:
+    """Three assets with different listing dates and a few missing bars."""
+    rng = np.random.default_rng(5)
+    dates = pd.bdate_range("2020-01-01", periods=400, name="Date")
+    frames = {}
+    for name, start in (("AAA", 0), ("BBB", 37), ("CCC", 120)):
+        index = dates[start:].delete([50, 51, 90])
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(index))))
+        frames[name] = pd.DataFrame(
+            {
+                "Open": close * (1 + rng.normal(0, 0.002, len(index))),
+                "High": close * 1.01,
+                "Low": close * 0.99,
+                "Close": close,
+                "Volume": rng.integers(1_000, 10_000, len(index)),
+            },
+            index=index,
+        )
+    return frames
+
+
+class TestPanelFeatures(unittest.TestCase):
+    def setUp(self) -> None:
+        self.fe = FeatureEngineer()
+        self.frames = make_frames()
+        self.panel = Panel.from_frames(self.frames, how="outer")
+
+    def test_matches_per_ticker_features(self) -> None:
+        print("\n--- Testing Batched Panel Features ---")
+        features = self.fe.calculate_panel_features(self.panel)
+        self.assertEqual(list(features.columns), FEATURE_COLUMNS)
+        self.assertEqual(features.index.names, ["Date", "Asset"])
+        self.assertEqual(len(features), sum(len(df) for df in self.frames.values()))
+        self.assertTrue(features.index.get_level_values("Date").is_monotonic_increasing)
+
+        for name, df in self.frames.items():
+            expected = self.fe.calculate_features(df.rename(columns=str.lower))
+            result = features.xs(name, level="Asset")
+            pd.testing.assert_frame_equal(
+                result, expected, check_dtype=False, check_freq=False, check_names=False
+            )
+        print("Panel features match calculate_features for every asset.")
+
+    def test_requires_ohlcv_fields(self) -> None:
+        panel = Panel.from_frames(self.frames, fields=["Close", "Volume"])
+        with self.assertRaises(ValueError):
+            self.fe.calculate_panel_features(panel)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import resampling
+from src.bar_store import write_bars
+
+
+def make_session_minutes(days: list[str]) -> pd.DataFrame:
+    """1-minute regular-session bars (09:30-16:00 New York) for the given dates, UTC index."""
+    frames = []
+    rng = np.random.default_rng(3)
+    for day in days:
+        local = pd.date_range(f"{day} 09:30", f"{day} 15:59", freq="min", tz="America/New_York")
+        close = 100 + np.cumsum(rng.normal(0, 0.05, len(local)))
+        frames.append(
+            pd.DataFrame(
+                {
+                    "Open": close + 0.01,
+                    "High": close + 0.05,
+                    "Low": close - 0.05,
+                    "Close": close,
+                    "Volume": rng.integers(100, 1000, len(local)).astype(float),
+                },
+                index=local.tz_convert("UTC").tz_localize(None).rename("Date"),
+            )
+        )
+    return pd.concat(frames)
+
+
+def pandas_reference(df: pd.DataFrame, rule: str) -> pd.DataFrame:
+    """Reference aggregation: pandas resample in local time, one session at a time."""
+    local = df.tz_localize("UTC").tz_convert("America/New_York")
+    agg = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+    parts = [
+        session.resample(rule).agg(agg).dropna() for _, session in local.groupby(local.index.date)
+    ]
+    result = pd.concat(parts)
+    result.index = result.index.tz_convert("UTC").tz_localize(None).rename("Date")
+    return result
+
+
+class TestResampling(unittest.TestCase):
+    def setUp(self) -> None:
+        # Spans the March DST change so session handling is exercised.
+        self.bars = make_session_minutes(["2024-03-08", "2024-03-11", "2024-03-12"])
+
+    def test_matches_pandas_per_session(self) -> None:
+        print("\n--- Testing Vectorized Resampling ---")
+        for rule in ["5min", "7min", "1h", "4h"]:
+            result = resampling.resample_bars(self.bars, rule)
+            pd.testing.assert_frame_equal(
+                result, pandas_reference(self.bars, rule), check_freq=False
+            )
+        print("Resampled bars match pandas for standard and custom bar sizes.")
+
+    def test_bins_never_cross_sessions(self) -> None:
+        # A 12h bin from each session's open would reach into the next
+        # session's pre-market, but is cut at the session boundary.
+        half_day = resampling.resample_bars(self.bars, "12h", anchor="session")
+        self.assertEqual(len(half_day), 3)
+
+        daily = resampling.resample_bars(self.bars, "1D")
+        self.assertEqual(
+            list(daily.index), list(pd.to_datetime(["2024-03-08", "2024-03-11", "2024-03-12"]))
+        )
+        first_day = self.bars.iloc[:390]
+        self.assertEqual(daily["Open"].iloc[0], first_day["Open"].iloc[0])
+        self.assertEqual(daily["High"].iloc[0], first_day["High"].max())
+        self.assertEqual(daily["Volume"].iloc[0], first_day["Volume"].sum())
+
+        two_day = resampling.resample_bars(self.bars, "2D")
+        self.assertEqual(len(two_day), 2)
+
+    def test_session_anchor_starts_at_first_bar(self) -> None:
+        result = resampling.resample_bars(self.bars, "1h", anchor="session")
+        local = result.index.tz_localize("UTC").tz_convert("America/New_York")
+        self.assertTrue((local.minute == 30).all())
+
+    def test_regular_hours_drops_extended_session_bars(self) -> None:
+        pre_market = self.bars.iloc[:30].copy()
+        pre_market.index = pre_market.index - pd.Timedelta(hours=1)
+        bars = pd.concat([pre_market, self.bars])
+        expected = resampling.resample_bars(self.bars, "1h")
+        result = resampling.resample_bars(bars, "1h", regular_hours=True)
+        pd.testing.assert_frame_equal(result, expected, check_freq=False)
+        self.assertGreater(len(resampling.resample_bars(bars, "1h")), len(expected))
+
+    def test_derived_timeframe_is_cached_by_source_and_rule(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "SPY_1min.parquet")
+            cache_dir = os.path.join(tmp, "derived")
+            write_bars(self.bars, source)
+
+            with patch.object(
+                resampling, "resample_bars", wraps=resampling.resample_bars
+            ) as compute:
+                first = resampling.resample_file(source, "5min", cache_dir=cache_dir)
+                second = resampling.resample_file(source, "5min", cache_dir=cache_dir)
+                self.assertEqual(compute.call_count, 1)
+                pd.testing.assert_frame_equal(first, second, check_freq=False, check_dtype=False)
+
+                resampling.resample_file(source, "15min", cache_dir=cache_dir)
+                self.assertEqual(compute.call_count, 2)
+
+                # Rewriting the source invalidates its derived files.
+                write_bars(self.bars.iloc[:-1], source)
+                resampling.resample_file(source, "5min", cache_dir=cache_dir)
+                self.assertEqual(compute.call_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
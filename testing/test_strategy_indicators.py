@@ -0,0 +1,185 @@
+import glob
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from run_backtesting.benchmark import SignalExecutor
+from src import kernels
+from src.interfaces import IMarketAdapter
+from strategies.base_strategy import BaseStrategy
+from strategies.bollinger_bands import BollingerBandsStrategy
+from strategies.rsi_2_period import RSI2PeriodStrategy, compute_rsi
+from strategies.simple_ma_crossover import SimpleMACrossover
+from testing.debug_scripts.benchmark_strategy_indicators import (
+    STRATEGY_PAIRS,
+    LegacyRSI2PeriodStrategy,
+    make_bars,
+    run,
+)
+
+BENCHMARK_DIR = os.path.join(os.path.dirname(__file__), "..", "data", "benchmark")
+
+
+def make_tick_bars(n_bars: int = 5000) -> pd.DataFrame:
+    """Minute bars moving in whole cents and mostly flat, so indicators tie exactly."""
+    rng = np.random.default_rng(7)
+    close = np.round(100 + np.cumsum(rng.choice([-0.01, 0, 0, 0, 0.01], n_bars)), 2)
+    return pd.DataFrame(
+        {"Open": close, "High": close + 0.01, "Low": close - 0.01, "Close": close, "Volume": 100},
+        index=pd.date_range("2024-01-02 14:30", periods=n_bars, freq="min", name="Date"),
+    )
+
+
+def window_sums(values: np.ndarray, window: int) -> np.ndarray:
+    """Exact sums of each trailing window of integers (0 before the first full one)."""
+    sums = np.zeros(len(values), dtype=np.int64)
+    cumulative = np.cumsum(np.r_[0, values])
+    sums[window - 1 :] = cumulative[window:] - cumulative[:-window]
+    return sums
+
+
+class ExactSimpleMACrossover(SimpleMACrossover):
+    """
+    `SimpleMACrossover` on whole-cent sums scaled to a common denominator:
+    the crossovers of exact arithmetic, ties included.
+    """
+
+    def init(self, market_adapter: IMarketAdapter | None = None) -> None:
+        super().init(market_adapter=market_adapter)
+        cents = np.round(np.asarray(self.data.Close) * 100).astype(np.int64)
+        self.fast_ma = window_sums(cents, self.fast_ma_period) * self.slow_ma_period
+        self.slow_ma = window_sums(cents, self.slow_ma_period) * self.fast_ma_period
+
+
+class ExactBollingerBandsStrategy(BollingerBandsStrategy):
+    """`BollingerBandsStrategy` with band crosses decided on whole-cent integers."""
+
+    def init(self, market_adapter: IMarketAdapter | None = None) -> None:
+        BaseStrategy.init(self, market_adapter=market_adapter)
+        n, k_squared = self.bb_period, round(self.bb_std_dev**2)
+        cents = np.round(np.asarray(self.data.Close) * 100).astype(np.int64)
+        sums, squares = window_sums(cents, n), window_sums(cents * cents, n)
+        # close < mean - k * std  <=>  n * (mean - close) > 0 and its square > k^2 * n^2 * var
+        deviation = sums - n * cents
+        self.below_lower = (deviation > 0) & (deviation**2 > k_squared * (n * squares - sums**2))
+        self.above_middle = n * cents > sums
+
+    def next(self) -> None:
+        i = len(self.data.Close) - 1
+        if i < self.bb_period:
+            return
+        if not self.below_lower[i - 1] and self.below_lower[i]:
+            if not self.position:
+                self._default_buy()
+        elif not self.above_middle[i - 1] and self.above_middle[i]:
+            if self.position:
+                self.position.close()
+        BaseStrategy.next(self)
+
+
+def load_benchmark_data() -> dict[str, pd.DataFrame]:
+    frames = {}
+    for path in sorted(glob.glob(os.path.join(BENCHMARK_DIR, "*.csv"))):
+        df = pd.read_csv(path, index_col="Date", parse_dates=True)
+        frames[os.path.basename(path)] = df[["Open", "High", "Low", "Close", "Volume"]]
+    return frames
+
+
+class TestStrategyIndicators(unittest.TestCase):
+    """
+    Strategies with precomputed indicators trade exactly like the per-bar
+    originals, and resolve exact ties as exact arithmetic does.
+    """
+
+    def test_same_trades_on_benchmark_data(self) -> None:
+        print("\n--- Testing Precomputed Strategy Indicators ---")
+        datasets = load_benchmark_data()
+        self.assertTrue(datasets)
+        datasets["synthetic"] = make_bars(3000)
+        for legacy, current in STRATEGY_PAIRS:
+            total = 0
+            for name, data in datasets.items():
+                with self.subTest(strategy=current.__name__, data=name):
+                    expected, _ = run(legacy, data)
+                    trades, _ = run(current, data)
+                    pd.testing.assert_frame_equal(trades, expected)
+                    total += len(trades)
+            print(f"{current.__name__}: {total} identical trades")
+
+    def test_tick_ties_trade_like_exact_arithmetic(self) -> None:
+        # On whole-cent prices indicators tie exactly, and the last bit of a
+        # per-slice np.mean is as arbitrary as that of the O(n) kernels. With
+        # ties snapped, the strategies trade as exact arithmetic decides.
+        data = make_tick_bars()
+        for exact, current in [
+            (ExactSimpleMACrossover, SimpleMACrossover),
+            (ExactBollingerBandsStrategy, BollingerBandsStrategy),
+        ]:
+            with self.subTest(strategy=current.__name__):
+                expected, _ = run(exact, data)
+                pd.testing.assert_frame_equal(run(current, data)[0], expected)
+                self.assertGreater(len(expected), 0)
+
+        fast, slow = SimpleMACrossover._moving_averages(data["Close"])
+        unsnapped = kernels.rolling_mean(data["Close"].to_numpy(), SimpleMACrossover.fast_ma_period)
+        self.assertTrue(((fast == slow) & (unsnapped != slow)).any())
+
+        # Thresholds are compared tie-aware too: RSI trades as the per-bar original.
+        expected, _ = run(LegacyRSI2PeriodStrategy, data)
+        pd.testing.assert_frame_equal(run(RSI2PeriodStrategy, data)[0], expected)
+
+    def test_same_trades_when_wrapped(self) -> None:
+        # The benchmark runs some strategies inside SignalExecutor.
+        data = make_bars(1500, seed=1)
+        for legacy, current in STRATEGY_PAIRS:
+            results = []
+            for strategy in (legacy, current):
+                wrapper = type("Wrapped", (SignalExecutor,), {"underlying_strategy": strategy})
+                results.append(run(wrapper, data)[0])
+            pd.testing.assert_frame_equal(results[1], results[0])
+            self.assertGreater(len(results[0]), 0)
+
+    def test_rsi_periods_and_smoothing(self) -> None:
+        # Longer periods trade like the per-bar original too.
+        data = make_tick_bars(3000)
+        for period in (5, 14):
+            params = {"rsi_period": period, "oversold_threshold": 30, "overbought_threshold": 70}
+            legacy = type("Legacy", (LegacyRSI2PeriodStrategy,), params)
+            current = type("Current", (RSI2PeriodStrategy,), params)
+            expected, _ = run(legacy, data)
+            pd.testing.assert_frame_equal(run(current, data)[0], expected)
+            self.assertGreater(len(expected), 0)
+
+        # No losses in the window: RS is taken as 100, not a division by zero.
+        close = np.array([1.0, 2.0, 3.0, 3.0, 2.0, 4.0])
+        rsi = compute_rsi(close, 2)
+        self.assertTrue(np.isnan(rsi[:2]).all())
+        self.assertEqual(rsi[2], 100 - 100 / 101)
+        self.assertEqual(rsi[3], 100 - 100 / 101)
+        self.assertEqual(rsi[4], 0.0)
+        self.assertEqual(rsi[5], 100 - 100 / (1 + 2 / 1))
+
+        # Wilder: seeded with the simple mean, then avg += (x - avg) / period.
+        prices = make_bars(300)["Close"].to_numpy()
+        delta = np.diff(prices)
+        gain, loss = np.mean(np.maximum(delta[:14], 0)), np.mean(np.maximum(-delta[:14], 0))
+        expected = [100 - 100 / (1 + gain / loss)]
+        for change in delta[14:]:
+            gain += (max(change, 0) - gain) / 14
+            loss += (max(-change, 0) - loss) / 14
+            expected.append(100 - 100 / (1 + gain / loss))
+        wilder = compute_rsi(prices, 14, "wilder")
+        self.assertTrue(np.isnan(wilder[:14]).all())
+        np.testing.assert_allclose(wilder[14:], expected, rtol=1e-10)
+        with self.assertRaises(ValueError):
+            compute_rsi(close, 2, "exponential")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,253 @@
+import os
+import sys
+import tempfile
+import unittest
+import warnings
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+from backtesting import Backtest
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from run_backtesting.benchmark import SignalExecutor
+from src.strategy_state import (
+    SnapshotStore,
+    StrategySnapshot,
+    restore_state,
+    resume_bars,
+    with_snapshots,
+)
+from strategies.bollinger_bands import BollingerBandsStrategy
+from strategies.rsi_2_period import RSI2PeriodStrategy
+from strategies.simple_ma_crossover import SimpleMACrossover
+from testing.debug_scripts.benchmark_strategy_indicators import make_bars
+
+WilderRSI = type(
+    "WilderRSI",
+    (RSI2PeriodStrategy,),
+    {
+        "rsi_smoothing": "wilder",
+        "rsi_period": 14,
+        "oversold_threshold": 30,
+        "overbought_threshold": 70,
+    },
+)
+
+# Strategy -> its precomputed indicator arrays.
+INDICATORS = {
+    SimpleMACrossover: ["fast_ma", "slow_ma"],
+    BollingerBandsStrategy: ["middle_band", "lower_band"],
+    RSI2PeriodStrategy: ["rsi"],
+    WilderRSI: ["rsi"],
+}
+
+
+def strategy_on(strategy: type, data: pd.DataFrame):
+    """The strategy instance after backtesting it over `data` (its last bar is current)."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return Backtest(data, strategy, cash=10_000).run()._strategy
+
+
+def recording(strategy: type) -> type:
+    """`strategy`, keeping `{bar: [(entry bar, stop) of each open trade]}` in `stops`."""
+
+    def init(self) -> None:
+        strategy.init(self)
+        self.stops = {}
+
+    def next(self) -> None:
+        strategy.next(self)
+        self.stops[len(self.data) - 1] = [(trade.entry_bar, trade.sl) for trade in self.trades]
+
+    return type(strategy.__name__, (strategy,), {"init": init, "next": next})
+
+
+def resumed(strategy: type, snapshot: StrategySnapshot) -> type:
+    """
+    `strategy` as restarted from `snapshot`: the warm-up bars were traded
+    before the restart, so it only restores the snapshot's state on the last
+    of them and trades the bars after.
+    """
+
+    def next(self) -> None:
+        if len(self.data) < len(snapshot.bars):
+            return
+        if len(self.data) == len(snapshot.bars):
+            restore_state(self, snapshot)
+            return
+        strategy.next(self)
+
+    return type(strategy.__name__, (strategy,), {"next": next})
+
+
+def trade_rows(strategy, offset: int = 0) -> list[tuple]:
+    """(entry bar, exit bar, entry price, exit price) of every trade, bars shifted by `offset`."""
+    rows = []
+    for trade in strategy.closed_trades + strategy.trades:
+        exit_bar = None if trade.exit_bar is None else trade.exit_bar + offset
+        exit_price = np.nan if trade.exit_price is None else trade.exit_price
+        rows.append((trade.entry_bar + offset, exit_bar, trade.entry_price, exit_price))
+    return rows
+
+
+class TestStrategyState(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data = make_bars(3000)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_resume_matches_full_history(self) -> None:
+        print("\n--- Testing Strategy Snapshot Resume ---")
+        crash = 2000
+        for strategy, attributes in INDICATORS.items():
+            full = strategy_on(strategy, self.data)
+            store = SnapshotStore(self.tmp.name, strategy.__name__)
+            store.save(StrategySnapshot.capture(strategy_on(strategy, self.data.iloc[:crash])))
+
+            # Restart: the snapshot plus the bars since (the fetch may overlap it).
+            snapshot = store.latest()
+            self.assertEqual(len(snapshot.bars), strategy.warmup_bars())
+            history = resume_bars(snapshot, self.data.iloc[crash - 10 :])
+            self.assertEqual(len(history), strategy.warmup_bars() + len(self.data) - crash)
+            resumed = strategy_on(strategy, history)
+            restore_state(resumed, snapshot)
+
+            missed = len(self.data) - crash
+            for attribute in attributes:
+                expected = getattr(full, attribute)[-missed:]
+                result = getattr(resumed, attribute)[-missed:]
+                # Same to rounding: the rolling kernels' blocks start where the
+                # history does, and Wilder's seed weight decays below eps.
+                np.testing.assert_allclose(result, expected, rtol=1e-13)
+            print(f"{strategy.__name__}: resumed from {len(snapshot.bars)} bars")
+
+    def test_resumed_trades_match_full_history(self) -> None:
+        # After a restart the strategy trades, and trails its stops by the
+        # ATR, as if it had never stopped.
+        for strategy in INDICATORS:
+            full = strategy_on(recording(strategy), self.data)
+            # Crash on a bar where the full run is flat: a backtest cannot
+            # start with an open position.
+            crash = next(
+                end
+                for end in range(2000, len(self.data))
+                if all(
+                    (exit_bar is not None and exit_bar < end - 1) or entry_bar > end
+                    for entry_bar, exit_bar, _, _ in trade_rows(full)
+                )
+            )
+            snapshot = StrategySnapshot.capture(strategy_on(strategy, self.data.iloc[:crash]))
+            history = resume_bars(snapshot, self.data.iloc[crash - 10 :])
+            offset = crash - len(snapshot.bars)
+            restarted = strategy_on(resumed(recording(strategy), snapshot), history)
+
+            expected = [row for row in trade_rows(full) if row[0] > crash]
+            result = trade_rows(restarted, offset)
+            self.assertGreater(len(expected), 0)
+            self.assertEqual([row[:2] for row in result], [row[:2] for row in expected])
+            np.testing.assert_allclose([row[2:] for row in result], [row[2:] for row in expected])
+
+            # The trailing stops agree on every bar after the restart.
+            for bar, stops in restarted.stops.items():
+                expected_stops = full.stops[bar + offset]
+                self.assertEqual(
+                    [entry_bar + offset for entry_bar, _ in stops],
+                    [entry_bar for entry_bar, _ in expected_stops],
+                )
+                np.testing.assert_allclose(
+                    [np.nan if sl is None else sl for _, sl in stops],
+                    [np.nan if sl is None else sl for _, sl in expected_stops],
+                    rtol=1e-12,
+                )
+
+    def test_state_round_trip(self) -> None:
+        # Stop at a bar with an open trade, whose trailing stop is part of the state.
+        for end in range(1000, 1200):
+            strategy = strategy_on(BollingerBandsStrategy, self.data.iloc[:end])
+            if strategy.trades and strategy.trades[-1].sl is not None:
+                break
+        else:
+            self.fail("No bar with an open trade")
+        strategy.size_factor = 0.5
+        state = strategy.get_state()
+        self.assertEqual(state["trailing_stop"], strategy.trades[-1].sl)
+        self.assertEqual(state["entry_price"], strategy.entry_price)
+
+        store = SnapshotStore(self.tmp.name, "bb")
+        store.save(StrategySnapshot.capture(strategy))
+        snapshot = store.latest()
+        self.assertEqual(snapshot.state, {**state, "size_factor": 0.5})
+        pd.testing.assert_frame_equal(
+            snapshot.bars, self.data.iloc[end - snapshot.bars.shape[0] : end], check_freq=False
+        )
+
+        # After a restart the open trade's stop starts again from stop_loss_pct.
+        # Restoring puts it back to the level it had trailed to, never looser.
+        restarted = strategy_on(BollingerBandsStrategy, self.data.iloc[:end])
+        trade = restarted.trades[-1]
+        trade.sl = state["trailing_stop"] - 5
+        restore_state(restarted, snapshot)
+        self.assertEqual(trade.sl, state["trailing_stop"])
+        self.assertEqual(restarted.size_factor, 0.5)
+        restarted.set_state({"trailing_stop": state["trailing_stop"] - 1})
+        self.assertEqual(trade.sl, state["trailing_stop"])
+
+        # Snapshots of another strategy or other parameters are rejected.
+        with self.assertRaises(ValueError):
+            restore_state(strategy_on(SimpleMACrossover, self.data.iloc[:300]), snapshot)
+        wider = type("BollingerBandsStrategy", (BollingerBandsStrategy,), {"bb_period": 30})
+        with self.assertRaises(ValueError):
+            restore_state(strategy_on(wider, self.data.iloc[:300]), snapshot)
+
+    def test_backtest_driver_writes_snapshots(self) -> None:
+        store = SnapshotStore(self.tmp.name, "bb", every_bars=100, keep=2)
+        strategy = strategy_on(with_snapshots(BollingerBandsStrategy, store), self.data.iloc[:1000])
+        self.assertEqual(len(store.paths()), 2)
+        snapshot = store.latest()
+        self.assertGreater(snapshot.last_bar, self.data.index[1000 - 100 - 1])
+        self.assertEqual(snapshot.params, strategy.get_params())
+        restore_state(strategy_on(BollingerBandsStrategy, self.data.iloc[:300]), snapshot)
+
+        # A wrapped strategy is snapshotted, not its wrapper.
+        wrapper = type("Wrapped", (SignalExecutor,), {"underlying_strategy": SimpleMACrossover})
+        store = SnapshotStore(self.tmp.name, "sma", every_bars=100)
+        strategy_on(with_snapshots(wrapper, store), self.data.iloc[:300])
+        self.assertEqual(store.latest().strategy, "SimpleMACrossover")
+
+    def test_periodic_atomic_writes(self) -> None:
+        bars = make_bars(20)
+        fake = SimpleNamespace(
+            data=SimpleNamespace(df=bars.iloc[:0]),
+            warmup_bars=lambda: 5,
+            get_params=lambda: {"period": 4},
+            get_state=lambda: {"entry_price": None},
+        )
+        store = SnapshotStore(self.tmp.name, "fake", every_bars=3, keep=2)
+        written = []
+        for end in range(1, 11):
+            fake.data.df = bars.iloc[:end]
+            written.append(store.update(fake))
+        self.assertEqual([path is not None for path in written], [False, False, True] * 3 + [False])
+        # Only the newest two are kept, and no temporary file is left behind.
+        self.assertEqual(store.paths(), written[5:9:3])
+        self.assertEqual(
+            sorted(os.listdir(self.tmp.name)), sorted(map(os.path.basename, written[5:9:3]))
+        )
+        self.assertEqual(store.latest().last_bar, bars.index[8])
+        self.assertEqual(len(store.latest().bars), 5)
+
+        # A corrupt newest snapshot falls back to the previous one.
+        with open(written[8], "w") as f:
+            f.write("{")
+        self.assertEqual(store.latest().last_bar, bars.index[5])
+        self.assertIsNone(SnapshotStore(self.tmp.name, "other").latest())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.feature_engineering import (
+    FEATURE_COLUMNS,
+    FEATURE_PRESETS,
+    FEATURE_REGISTRY,
+    FeatureEngineer,
+    StreamingFeatureEngineer,
+)
+
+
+def make_bars(n_rows: int = 1500) -> pd.DataFrame:
+    rng = np.random.default_rng(11)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_rows)))
+    # A flat stretch exercises the zero-loss RSI and zero-range stochastic cases.
+    close[400:430] = close[399]
+    spread = np.where(np.arange(n_rows) // 30 == 400 // 30, 0.0, 0.5)
+    return pd.DataFrame(
+        {
+            "open": close + rng.normal(0, 0.1, n_rows),
+            "high": close + spread,
+            "low": close - spread,
+            "close": close,
+            "volume": rng.integers(100, 10_000, n_rows),
+        },
+        index=pd.date_range("2022-01-03", periods=n_rows, freq="h", name="Date"),
+    )
+
+
+class TestStreamingFeatures(unittest.TestCase):
+    def setUp(self) -> None:
+        self.bars = make_bars()
+        self.batch = FeatureEngineer().calculate_features(self.bars)
+
+    def test_streaming_matches_batch(self) -> None:
+        print("\n--- Testing Streaming Feature Parity ---")
+        streamed = StreamingFeatureEngineer().update_frame(self.bars)
+        self.assertEqual(list(streamed.columns), FEATURE_COLUMNS)
+        # Same warm-up NaNs, and values equal up to float rounding.
+        pd.testing.assert_frame_equal(
+            streamed, self.batch, check_dtype=False, check_freq=False, rtol=1e-9, atol=1e-9
+        )
+        print("Streaming features match calculate_features.")
+
+    def test_every_registered_feature(self) -> None:
+        print("\n--- Testing Streaming Parity Over The Feature Registry ---")
+        bars = self.bars.copy()
+        # A gap of missing bars exercises the NaN handling of every update.
+        bars.iloc[700:705, :4] = np.nan
+        names = list(FEATURE_REGISTRY)
+        streamed = StreamingFeatureEngineer(names).update_frame(bars)
+        batch = FeatureEngineer().calculate_features(bars, names)
+        for name in names:
+            with self.subTest(feature=name):
+                np.testing.assert_allclose(
+                    streamed[name], batch[name], rtol=1e-9, atol=1e-9, equal_nan=True
+                )
+        for preset, columns in FEATURE_PRESETS.items():
+            with self.subTest(preset=preset):
+                self.assertEqual(list(StreamingFeatureEngineer(preset).features), columns)
+        print(f"All {len(names)} registered features stream like calculate_features.")
+
+    def test_bar_by_bar_after_warm_up(self) -> None:
+        streamer = StreamingFeatureEngineer()
+        streamer.update_frame(self.bars.iloc[:1000])
+        for timestamp, bar in self.bars.iloc[1000:].iterrows():
+            features = streamer.update(bar)
+            expected = self.batch.loc[timestamp]
+            np.testing.assert_allclose(
+                [features[col] for col in FEATURE_COLUMNS], expected.to_numpy(), rtol=1e-9
+            )
+        self.assertEqual(streamer.bars, len(self.bars))
+
+        streamer.reset()
+        first = streamer.update(self.bars.iloc[0])
+        self.assertTrue(np.isnan(first["SMA_50"]))
+        self.assertEqual(first["EMA_20"], self.bars["close"].iloc[0])
+
+        # A subset keeps state for its own dependencies only.
+        subset = StreamingFeatureEngineer(["RSI_14", "ATR_14"])
+        self.assertEqual([name for name, _, _ in subset.streams], ["RSI_14", "ATR_14"])
+        self.assertEqual(list(subset.update(self.bars.iloc[0])), ["RSI_14", "ATR_14"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import datetime
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.trading_calendar import (
+    nyse_calendar,
+    nyse_early_closes,
+    nyse_holidays,
+    slice_dates,
+    slice_range,
+)
+
+
+class TestTradingCalendar(unittest.TestCase):
+    def setUp(self) -> None:
+        self.calendar = nyse_calendar()
+
+    def test_nyse_holidays_and_sessions(self) -> None:
+        print("\n--- Testing NYSE Calendar ---")
+        expected = [
+            "2024-01-01",
+            "2024-01-15",
+            "2024-02-19",
+            "2024-03-29",  # Good Friday
+            "2024-05-27",
+            "2024-06-19",
+            "2024-07-04",
+            "2024-09-02",
+            "2024-11-28",
+            "2024-12-25",
+        ]
+        self.assertEqual([str(day) for day in nyse_holidays(2024)], expected)
+        self.assertEqual(
+            nyse_early_closes(2024),
+            [datetime.date(2024, 7, 3), datetime.date(2024, 11, 29), datetime.date(2024, 12, 24)],
+        )
+        # Saturday July 4th (2026) is observed on Friday; Saturday New Year's Day is not.
+        self.assertIn(datetime.date(2026, 7, 3), nyse_holidays(2026))
+        self.assertNotIn(datetime.date(2021, 12, 31), nyse_holidays(2022))
+
+        self.assertEqual(len(self.calendar.sessions_in_range("2024-01-01", "2024-12-31")), 252)
+        self.assertEqual(len(self.calendar.sessions_in_range("2023-01-01", "2023-12-31")), 250)
+        self.assertEqual(
+            self.calendar.is_session(["2024-03-28", "2024-03-29", "2012-10-29"]).tolist(),
+            [True, False, False],
+        )
+        # Sessions strictly between Thursday and the Tuesday after Easter: only Monday.
+        self.assertEqual(self.calendar.count_sessions(["2024-03-29"], ["2024-04-02"]).tolist(), [1])
+        print(self.calendar)
+
+    def test_intraday_session_lookup(self) -> None:
+        # UTC stamps: open in winter (14:30) and summer (13:30), an early close (17:00).
+        stamps = pd.DatetimeIndex(
+            [
+                "2024-01-02 14:29",
+                "2024-01-02 14:30",
+                "2024-07-01 13:30",
+                "2024-07-03 16:59",
+                "2024-07-03 17:00",
+                "2024-07-04 15:00",
+            ]
+        )
+        inside = self.calendar.in_session(stamps)
+        self.assertEqual(inside.tolist(), [False, True, True, True, False, False])
+
+        opens, closes = self.calendar.session_bounds(stamps)
+        self.assertEqual(pd.Timestamp(closes[3]), pd.Timestamp("2024-07-03 17:00"))
+        self.assertEqual(pd.Timestamp(opens[1]), pd.Timestamp("2024-01-02 14:30"))
+
+    def test_slicing_matches_boolean_masks(self) -> None:
+        index = pd.date_range("2024-01-01", periods=5000, freq="37min", name="Date")
+        df = pd.DataFrame({"Close": np.arange(len(index), dtype=float)}, index=index)
+
+        start, end = pd.Timestamp("2024-01-10 10:00"), pd.Timestamp("2024-02-03")
+        expected = df.loc[(df.index >= start) & (df.index < end)]
+        pd.testing.assert_frame_equal(slice_range(df, start, end), expected)
+
+        expected = df.loc[
+            (df.index >= pd.Timestamp("2024-01-10")) & (df.index < pd.Timestamp("2024-02-04"))
+        ]
+        result = slice_dates(df, datetime.date(2024, 1, 10), datetime.date(2024, 2, 3))
+        pd.testing.assert_frame_equal(result, expected)
+        self.assertEqual(len(slice_range(df, None, None)), len(df))
+        self.assertTrue(slice_range(df, end, start).empty)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import os
+import sys
+import unittest
+import warnings
+
+import numpy as np
+import pandas as pd
+from backtesting import Backtest, Strategy
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from run_backtesting.benchmark import SignalExecutor
+from src.commission_models import ibkr_tiered_commission
+from src.vector_backtest import run_signals, signals_from_events, simulate, target_positions
+from strategies.bollinger_bands import BollingerBandsStrategy
+from strategies.rsi_2_period import RSI2PeriodStrategy
+from strategies.simple_ma_crossover import SimpleMACrossover
+from testing.debug_scripts.benchmark_strategy_indicators import make_bars
+from testing.test_strategy_indicators import load_benchmark_data, make_tick_bars
+
+COMPARED = ["Size", "EntryBar", "ExitBar", "EntryPrice", "ExitPrice", "PnL", "Commission"]
+
+
+class FollowSignals(Strategy):
+    """Event-driven reference: trades towards the target position every bar."""
+
+    signals = None
+
+    def init(self) -> None:
+        self.target = target_positions(self.signals)
+
+    def next(self) -> None:
+        want = self.target[len(self.data.Close) - 1]
+        have = np.sign(self.position.size)
+        if want == have:
+            return
+        if have:
+            self.position.close()
+        if want > 0:
+            self.buy()
+        elif want < 0:
+            self.sell()
+
+
+def event_driven(data: pd.DataFrame, strategy: type, commission, finalize: bool) -> pd.Series:
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        bt = Backtest(data, strategy, cash=10_000, commission=commission, finalize_trades=finalize)
+        return bt.run()
+
+
+class TestVectorBacktest(unittest.TestCase):
+    def assert_same_run(self, expected: pd.Series, result: pd.Series) -> None:
+        pd.testing.assert_frame_equal(
+            result._trades[COMPARED],
+            expected._trades[COMPARED].reset_index(drop=True),
+            check_dtype=False,
+        )
+        np.testing.assert_array_equal(
+            result._equity_curve["Equity"].to_numpy(), expected._equity_curve["Equity"].to_numpy()
+        )
+        for key in ["Return [%]", "Sharpe Ratio", "Max. Drawdown [%]", "Win Rate [%]", "# Trades"]:
+            self.assertTrue(np.array_equal(result[key], expected[key], equal_nan=True), key)
+
+    def test_parity_on_benchmark_data(self) -> None:
+        print("\n--- Testing Vectorised Backtest Parity ---")
+        datasets = load_benchmark_data()
+        self.assertTrue(datasets)
+        datasets["tick-rounded"] = make_tick_bars()
+        for strategy in (SimpleMACrossover, RSI2PeriodStrategy):
+            # The benchmark's event-driven path for these strategies.
+            wrapped = type("Wrapped", (SignalExecutor,), {"underlying_strategy": strategy})
+            total = 0
+            for name, data in datasets.items():
+                signals = strategy.generate_signals(data)
+                for finalize in (False, True):
+                    with self.subTest(strategy=strategy.__name__, data=name, finalize=finalize):
+                        expected = event_driven(data, wrapped, ibkr_tiered_commission, finalize)
+                        result = run_signals(
+                            data, signals, 10_000, ibkr_tiered_commission, finalize
+                        )
+                        self.assert_same_run(expected, result)
+                        total += len(result._trades)
+            print(f"{strategy.__name__}: {total} identical trades")
+
+    def test_short_and_reversals(self) -> None:
+        data = make_bars(1500, seed=4)
+        rng = np.random.default_rng(4)
+        signals = rng.choice([-1.0, 0.0, 1.0, np.nan, np.nan, np.nan], len(data))
+        for commission in (0.0, 0.002, (1.0, 0.001), ibkr_tiered_commission):
+            strategy = type("Follow", (FollowSignals,), {"signals": signals})
+            expected = event_driven(data, strategy, commission, finalize=True)
+            result = run_signals(data, signals, 10_000, commission, finalize_trades=True)
+            self.assert_same_run(expected, result)
+            self.assertTrue((result._trades["Size"] < 0).any())
+
+    def test_signal_validation(self) -> None:
+        np.testing.assert_array_equal(
+            target_positions([1.0, np.nan, -1.0, np.nan, 0.0]), [0.0, 0.0, -1.0, -1.0, 0.0]
+        )
+        np.testing.assert_array_equal(
+            signals_from_events([False, True, True], [True, True, False]), [0.0, 1.0, 1.0]
+        )
+        data = make_bars(10)
+        with self.assertRaises(ValueError):
+            simulate(data, np.full(10, 0.5))
+        with self.assertRaises(ValueError):
+            simulate(data, np.zeros(9))
+        # Strategies that rely on stops have no vectorised form.
+        self.assertIsNone(BollingerBandsStrategy.generate_signals(data))
+
+
+if __name__ == "__main__":
+    unittest.main()